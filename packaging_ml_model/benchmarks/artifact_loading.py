@@ -0,0 +1,81 @@
+"""
+Load time and memory benchmark of the joblib model against the model artifact.
+
+Each variant runs in a fresh interpreter, which imports what it needs, loads the model
+and scores one record. Reported per variant:
+1. the wall time of imports + load, and of the load alone,
+2. the resident set size (RSS) after the first prediction,
+3. the part of it that is private to the process (USS, from /proc/self/smaps_rollup), i.e.
+   what every additional worker process costs.
+
+Run from the 'packaging_ml_model' directory:
+    python -m benchmarks.artifact_loading --repeat 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+from prediction_model.config import config
+
+# Imports, then load, of each variant
+VARIANTS: dict[str, tuple[str, str]] = {
+    "joblib pipeline": (
+        "from prediction_model.processing.data_handling import load_pipeline",
+        "model = load_pipeline(pipeline_to_load=config.MODEL_NAME)",
+    ),
+    "artifact pipeline": (
+        "from prediction_model.artifact import artifact_step_types, load_artifact; import sklearn.pipeline; artifact_step_types()",
+        "model = load_artifact().to_pipeline()",
+    ),
+    "artifact compiled scorer": (
+        "from prediction_model.artifact import load_artifact; import prediction_model.compiled_pipeline",
+        "model = load_artifact().to_compiled()",
+    ),
+}
+
+SCRIPT: str = """
+import time
+start = time.perf_counter()
+from prediction_model.config import config
+{imports}
+loaded = time.perf_counter()
+{load}
+end = time.perf_counter()
+import pandas as pd
+record = pd.DataFrame({{col: [float("nan")] for col in config.FEATURES}})
+model.predict(record) if hasattr(model, "steps") else model.predict(data=record)
+memory = {{}}
+with open("/proc/self/smaps_rollup") as f:
+    for line in f:
+        name, _, value = line.partition(":")
+        memory[name] = int(value.split()[0]) if value.strip().endswith("kB") else 0
+print(end - start, end - loaded, memory["Rss"], memory["Private_Clean"] + memory["Private_Dirty"])
+"""
+
+def run_variant(imports: str, load: str) -> tuple[float, float, int, int]:
+    """Seconds of imports + load, seconds of load, RSS and USS in kB, measured in a fresh interpreter."""
+    result = subprocess.run([sys.executable, "-W", "ignore", "-c", SCRIPT.format(imports=imports, load=load)],
+                            capture_output=True, text=True, check=True)
+    total, load_s, rss, uss = result.stdout.splitlines()[-1].split()
+    return float(total), float(load_s), int(rss), int(uss)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for name in (config.MODEL_NAME, config.ARTIFACT_NAME):
+        size = os.path.getsize(os.path.join(config.SAVE_MODEL_PATH, name))
+        print(f"{name:<28} {size:>8,} bytes")
+    print(f"\n{'variant':<28} {'import+load':>12} {'load':>10} {'RSS':>10} {'USS':>10}")
+    for variant, (imports, load) in VARIANTS.items():
+        runs = [run_variant(imports=imports, load=load) for _ in range(args.repeat)]
+        print(f"{variant:<28} {statistics.median(r[0] for r in runs) * 1e3:>9.1f} ms"
+              f" {statistics.median(r[1] for r in runs) * 1e3:>7.2f} ms"
+              f" {statistics.median(r[2] for r in runs) / 1024:>7.1f} MB"
+              f" {statistics.median(r[3] for r in runs) / 1024:>7.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark of categorical encoding in 'CustomLabelEncoder'.
+
+Compares the previous 'Series.map(label_dict)' encoding with the 'pandas.Categorical'
+code table encoding, on object and on category dtype columns of the training data
+repeated to '--rows' rows.
+
+Run from the 'packaging_ml_model' directory:
+    python -m benchmarks.categorical_encoding --rows 10000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from prediction_model.config import config
+from prediction_model.processing.data_handling import load_dataset
+from prediction_model.processing.data_preprocessing import CustomLabelEncoder, ModeImputer
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    train_data = load_dataset(filename=config.TRAIN_FILE)[config.FEATURES_TO_ENCODE]
+    train_data = ModeImputer(categorical_features=config.FEATURES_TO_ENCODE).fit(train_data).transform(train_data)
+    encoder = CustomLabelEncoder(categorical_features=config.FEATURES_TO_ENCODE).fit(train_data)
+
+    index = np.random.default_rng(seed=0).integers(0, len(train_data), size=args.rows)
+    object_data = train_data.iloc[index].reset_index(drop=True)
+    category_data = object_data.astype("category")
+
+    def map_encoding() -> None:
+        for col in config.FEATURES_TO_ENCODE:
+            object_data[col].map(encoder.label_dict_[col])
+
+    def categorical_encoding(data: pd.DataFrame) -> None:
+        for col in config.FEATURES_TO_ENCODE:
+            encoder.encode(col=col, values=data[col])
+
+    results = {
+        "Series.map (object dtype)": best_of(map_encoding, args.repeat),
+        "Categorical codes (object dtype)": best_of(lambda: categorical_encoding(object_data), args.repeat),
+        "Categorical codes (category dtype)": best_of(lambda: categorical_encoding(category_data), args.repeat),
+    }
+    baseline = results["Series.map (object dtype)"]
+    print(f"{args.rows:,} rows x {len(config.FEATURES_TO_ENCODE)} columns")
+    print(f"{'encoding':<36} {'seconds':>9} {'Mrows/s':>9} {'speedup':>8}")
+    for name, seconds in results.items():
+        print(f"{name:<36} {seconds:>9.3f} {args.rows / seconds / 1e6:>9.1f} {baseline / seconds:>8.1f}")
+
+if __name__ == "__main__":
+    main()
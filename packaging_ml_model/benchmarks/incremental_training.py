@@ -0,0 +1,60 @@
+"""
+Memory benchmark of out-of-core training against the batch fit.
+
+For synthetic training files of growing size, reports the time and the peak memory
+allocated (tracemalloc) by:
+1. 'partial_fit_pipeline' streaming the file in chunks,
+2. 'load_dataset' followed by 'fit_pipeline'.
+The peak memory of the incremental fit stays flat with the file size.
+
+Run from the 'packaging_ml_model' directory:
+    python -m benchmarks.incremental_training --rows 10000 100000 1000000 --chunksize 50000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from sklearn.base import clone
+
+from prediction_model import pipeline
+from prediction_model.config import config
+from prediction_model.processing.data_handling import iter_dataset_chunks, load_dataset
+from prediction_model.training_pipeline import fit_pipeline, partial_fit_pipeline
+
+from benchmarks.synthetic_data import make_synthetic_dataset
+
+def measure(func) -> tuple[float, float]:
+    """Seconds and peak MB allocated by 'func()'."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    parser.add_argument("--epochs", type=int, default=config.INCREMENTAL_EPOCHS)
+    args = parser.parse_args()
+
+    columns = config.FEATURES + [config.TARGET_FEATURE]
+    print(f"{'rows':>10} {'incremental s':>14} {'peak MB':>9} {'batch s':>9} {'peak MB':>9}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n_rows in args.rows:
+            filepath = os.path.join(tmp_dir, f"train_{n_rows}.csv")
+            make_synthetic_dataset(n_rows=n_rows).to_csv(filepath, index=False)
+            incremental = measure(lambda: partial_fit_pipeline(
+                chunks=lambda: iter_dataset_chunks(filepath=filepath, chunksize=args.chunksize, columns=columns),
+                n_epochs=args.epochs,
+            ))
+            batch = measure(lambda: fit_pipeline(train_data=load_dataset(filename=filepath, columns=columns),
+                                                 pipeline_to_fit=clone(pipeline.classification_pipeline)))
+            print(f"{n_rows:>10,} {incremental[0]:>14.2f} {incremental[1]:>9.1f} {batch[0]:>9.2f} {batch[1]:>9.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+I/O benchmark of CSV vs Parquet vs Feather/Arrow IPC ingestion.
+
+Scales the training and test datasets up '--scale' times, writes them in each format and
+loads them back with 'load_dataset', projected to 'config.FEATURES' and the target, each
+in a fresh interpreter so that the peak RSS increase is measured independently (Linux only).
+
+Run from the 'packaging_ml_model' directory:
+    python -m benchmarks.io_formats --scale 1000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+from prediction_model.config import config
+from prediction_model.processing.data_handling import load_dataset, write_dataset
+
+LOAD: str = """
+import json, os, resource, time
+import pyarrow.parquet
+from prediction_model.config import config
+from prediction_model.processing.data_handling import load_dataset
+with open("/proc/self/statm") as f:  # current RSS, in pages
+    before = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024
+start = time.perf_counter()
+data = load_dataset(filename={filepath!r}, columns=config.FEATURES + [config.TARGET_FEATURE])
+seconds = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"seconds": seconds, "rss_mb": (peak - before) / 1024, "rows": len(data)}}))
+"""
+
+def measure_load(filepath: str) -> dict:
+    """Load 'filepath' in a fresh interpreter and return its load time and peak RSS increase."""
+    result = subprocess.run([sys.executable, "-W", "ignore", "-c", LOAD.format(filepath=filepath)],
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.splitlines()[-1])
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'file':<22} {'format':<8} {'rows':>10} {'MB on disk':>11} {'load s':>8} {'RSS MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for filename in (config.TRAIN_FILE, config.TEST_FILE):
+            scaled = pd.concat([load_dataset(filename=filename)] * args.scale, ignore_index=True)
+            stem = os.path.splitext(filename)[0]
+            for extension in ("csv", "parquet", "feather"):
+                filepath = os.path.join(tmp_dir, f"{stem}.{extension}")
+                write_dataset(data=scaled, filepath=filepath)
+                stats = measure_load(filepath=filepath)
+                print(f"{filename:<22} {extension:<8} {stats['rows']:>10,} {os.path.getsize(filepath) / 1e6:>11.1f} "
+                      f"{stats['seconds']:>8.3f} {stats['rss_mb']:>8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Scaling benchmark for parallel batch prediction.
+
+Scores a synthetic file resampled from 'loan-test.csv' with 1, 2, 4 and all CPU
+cores and reports throughput and speedup, to size batch scoring nodes.
+
+Run from the 'packaging_ml_model' directory:
+    python -m benchmarks.parallel_scaling --rows 1000000 --chunksize 50000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from prediction_model.config import config
+from prediction_model.batch_predict import run_batch_prediction
+
+from benchmarks.synthetic_data import make_synthetic_dataset
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    parser.add_argument("--compiled", action="store_true")
+    args = parser.parse_args()
+
+    n_cores: int = os.cpu_count() or 1
+    core_counts: list[int] = sorted({n for n in (1, 2, 4, n_cores)})
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_path: str = os.path.join(tmp_dir, "input.csv")
+        output_path: str = os.path.join(tmp_dir, "output.csv")
+        make_synthetic_dataset(n_rows=args.rows, filename=config.TEST_FILE).to_csv(input_path, index=False)
+
+        print(f"{'n_jobs':>6} {'seconds':>9} {'rows/s':>12} {'speedup':>8}   ({n_cores} CPU cores available)")
+        baseline: float | None = None
+        for n_jobs in core_counts:
+            start = time.perf_counter()
+            run_batch_prediction(input_path=input_path, output_path=output_path, chunksize=args.chunksize,
+                                 compiled=args.compiled, n_jobs=n_jobs, verbose=False)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{n_jobs:>6} {elapsed:>9.2f} {args.rows / elapsed:>12,.0f} {baseline / elapsed:>8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Benchmark suite for the training, preprocessing and inference hot paths.
+
+For each dataset size, times on synthetic data (see 'benchmarks.synthetic_data'):
+- 'fit/<step>' and 'transform/<step>': every step of 'classification_pipeline', on the
+  input that step receives inside the pipeline,
+- 'training/fit_pipeline': the full fit done by 'training_pipeline.perform_training',
+- 'inference/pipeline_predict' and 'inference/compiled_predict': batch prediction,
+- 'inference/compiled_contributions': per-feature contributions behind the reason codes,
+- 'inference/validate_batch': schema validation and coercion of the scoring input,
+- 'inference/shadow_3_models': a champion and two challengers sharing their preprocessing,
+and, once, the single-record latency of 'predict_one' and 'generate_prediction'.
+
+Results are written as JSON together with the package versions and git commit, and can be
+compared with a previous run to catch regressions between commits.
+
+Run from the 'packaging_ml_model' directory:
+    python -m benchmarks.run_benchmarks --sizes 1000 100000 1000000 --output bench.json
+    python -m benchmarks.run_benchmarks --sizes 1000 100000 1000000 --compare bench.json
+"""
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.base import clone
+from sklearn.pipeline import Pipeline
+
+from prediction_model import __version__, pipeline, predict
+from prediction_model.compiled_pipeline import CompiledPipeline
+from prediction_model.config import config
+from prediction_model.processing.validation import validate_batch
+from prediction_model.shadow import ShadowScorer
+from prediction_model.training_pipeline import fit_pipeline, split_features_target
+
+from benchmarks.synthetic_data import make_synthetic_dataset
+
+def time_call(func, repeat: int) -> dict:
+    """Best and mean wall time of 'repeat' calls of 'func'."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {"best_s": min(timings), "mean_s": float(np.mean(timings)), "repeat": repeat}
+
+def bench_size(n_rows: int, repeat: int) -> list[dict]:
+    """Benchmark every step, the full fit and batch prediction on 'n_rows' rows."""
+    results = []
+
+    def record(name: str, func) -> None:
+        timing = time_call(func=func, repeat=repeat)
+        results.append({"name": name, "n_rows": n_rows, **timing, "rows_per_s": n_rows / timing["best_s"]})
+        print(f"{name:<40} {n_rows:>10,} {timing['best_s']:>10.4f}s {n_rows / timing['best_s']:>14,.0f} rows/s", flush=True)
+
+    train_data = make_synthetic_dataset(n_rows=n_rows, filename=config.TRAIN_FILE)
+    test_data = make_synthetic_dataset(n_rows=n_rows, filename=config.TEST_FILE)[config.FEATURES]
+    train_X, train_y = split_features_target(data=train_data)
+
+    record("training/fit_pipeline", lambda: fit_pipeline(train_data=train_data, pipeline_to_fit=clone(pipeline.classification_pipeline)))
+
+    fitted = fit_pipeline(train_data=train_data, pipeline_to_fit=clone(pipeline.classification_pipeline))
+    step_input = train_X
+    for name, step in fitted.steps[:-1]:
+        # Steps after the first one transform in place (see 'pipeline.set_single_copy'),
+        # so each timed call gets its own copy of the input
+        in_place = getattr(step, "copy", True) is False
+        record(f"fit/{name}", lambda: clone(step).fit(step_input, train_y))
+        record(f"transform/{name}", lambda: step.transform(step_input.copy() if in_place else step_input))
+        step_input = step.transform(step_input.copy() if in_place else step_input)
+    final_name, final_step = fitted.steps[-1]
+    record(f"fit/{final_name}", lambda: clone(final_step).fit(step_input, train_y))
+    record(f"predict/{final_name}", lambda: final_step.predict(step_input))
+
+    compiled = CompiledPipeline.from_pipeline(pipeline=fitted)
+    record("inference/pipeline_predict", lambda: fitted.predict(test_data))
+    record("inference/compiled_predict", lambda: compiled.predict(data=test_data))
+    record("inference/compiled_contributions", lambda: compiled.contributions(data=test_data))
+    record("inference/validate_batch", lambda: validate_batch(data_input=test_data))
+    # Challengers retrained on the estimator only share the fitted preprocessing of the champion
+    challengers = {f"C={C}": CompiledPipeline.from_pipeline(pipeline=Pipeline(fitted.steps[:-1] + [
+        (final_name, clone(final_step).set_params(C=C).fit(step_input, train_y))])) for C in (0.1, 10.0)}
+    shadow_scorer = ShadowScorer(models={"champion": compiled, **challengers})
+    record("inference/shadow_3_models", lambda: shadow_scorer.score(data=test_data))
+    return results
+
+def bench_single_record(calls: int) -> list[dict]:
+    """p50/p99 latency of the single-record prediction paths."""
+    test_data = make_synthetic_dataset(n_rows=1000, filename=config.TEST_FILE)[config.FEATURES]
+    records = test_data.to_dict(orient="records")
+    predict.warmup()
+    results = []
+    for name, func, n_calls in [
+        ("latency/predict_one", lambda i: predict.predict_one(record=records[i % len(records)]), calls),
+        ("latency/generate_prediction", lambda i: predict.generate_prediction(data_input=test_data[i % 1000:i % 1000 + 1]), max(calls // 100, 50)),
+    ]:
+        timings = np.empty(n_calls)
+        for i in range(n_calls):
+            start = time.perf_counter()
+            func(i)
+            timings[i] = time.perf_counter() - start
+        result = {"name": name, "n_rows": 1, "p50_us": float(np.percentile(timings, 50) * 1e6),
+                  "p99_us": float(np.percentile(timings, 99) * 1e6), "calls": n_calls}
+        results.append(result)
+        print(f"{name:<40} {'1':>10} p50 {result['p50_us']:>10.1f}us p99 {result['p99_us']:>10.1f}us", flush=True)
+    return results
+
+def environment() -> dict:
+    """Versions and commit the results were measured with."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "git_commit": commit,
+        "prediction_model": __version__,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "scikit-learn": sklearn.__version__,
+        "machine": platform.machine(),
+    }
+
+def compare(results: list[dict], baseline_path: str, threshold: float) -> int:
+    """Print the change of every result against a previous run and count regressions beyond 'threshold'."""
+    with open(baseline_path) as f:
+        baseline = {(r["name"], r["n_rows"]): r for r in json.load(f)["results"]}
+    regressions = 0
+    print(f"\n{'benchmark':<40} {'rows':>10} {'baseline':>12} {'current':>12} {'change':>8}")
+    for result in results:
+        previous = baseline.get((result["name"], result["n_rows"]))
+        if previous is None:
+            continue
+        metric = "best_s" if "best_s" in result else "p50_us"
+        change = result[metric] / previous[metric] - 1
+        flag = "  REGRESSION" if change > threshold else ""
+        regressions += bool(flag)
+        print(f"{result['name']:<40} {result['n_rows']:>10,} {previous[metric]:>12.5g} {result[metric]:>12.5g} {change:>+8.1%}{flag}")
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency-calls", type=int, default=10_000)
+    parser.add_argument("--output", help="JSON file to write the results to")
+    parser.add_argument("--compare", help="JSON file of a previous run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative slowdown reported as a regression")
+    args = parser.parse_args()
+
+    results = []
+    for n_rows in args.sizes:
+        results.extend(bench_size(n_rows=n_rows, repeat=args.repeat))
+    results.extend(bench_single_record(calls=args.latency_calls))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2)
+    if args.compare and compare(results=results, baseline_path=args.compare, threshold=args.threshold):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
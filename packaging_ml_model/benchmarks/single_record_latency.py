@@ -0,0 +1,50 @@
+"""
+Latency benchmark for scoring one application at a time.
+
+Compares 'predict_one' (compiled, no DataFrame) with 'generate_prediction' on a one-row
+DataFrame, and reports p50/p99 latencies in microseconds.
+
+Run from the 'packaging_ml_model' directory:
+    python -m benchmarks.single_record_latency --calls 20000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from prediction_model import predict
+from prediction_model.config import config
+from prediction_model.processing.data_handling import load_dataset
+
+def latencies_us(func, args_list: list, calls: int) -> np.ndarray:
+    """Time 'calls' calls of 'func', cycling through 'args_list'."""
+    timings = np.empty(calls)
+    for i in range(calls):
+        args = args_list[i % len(args_list)]
+        start = time.perf_counter()
+        func(args)
+        timings[i] = time.perf_counter() - start
+    return timings * 1e6
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20_000)
+    args = parser.parse_args()
+
+    test_data = load_dataset(filename=config.TEST_FILE)[config.FEATURES]
+    records = test_data.to_dict(orient="records")
+    rows = [test_data[i:i + 1] for i in range(len(test_data))]
+    predict.warmup()
+
+    results = {
+        "predict_one": latencies_us(predict.predict_one, records, args.calls),
+        "generate_prediction": latencies_us(predict.generate_prediction, rows, max(args.calls // 100, 100)),
+        "generate_prediction(compiled=True)": latencies_us(
+            lambda row: predict.generate_prediction(row, compiled=True), rows, max(args.calls // 10, 100)),
+    }
+    print(f"{'path':<36} {'p50 us':>10} {'p99 us':>10}")
+    for name, timings in results.items():
+        print(f"{name:<36} {np.percentile(timings, 50):>10.1f} {np.percentile(timings, 99):>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Startup benchmark for 'prediction_model.predict'.
+
+Measures, each in a fresh interpreter:
+1. the cumulative import time of 'prediction_model.predict' reported by 'python -X importtime',
+2. the latency from the start of the import to the first prediction,
+3. the same latency when 'warmup()' is called right after the import.
+
+Run from the 'packaging_ml_model' directory:
+    python -m benchmarks.startup_latency --repeat 5
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+FIRST_PREDICTION: str = """
+import time
+start = time.perf_counter()
+from prediction_model import predict
+{warmup}
+record = {{'Gender': ['Male'], 'Married': ['Yes'], 'Dependents': ['0'], 'Education': ['Graduate'],
+          'Self_Employed': ['No'], 'ApplicantIncome': [5720], 'CoapplicantIncome': [0], 'LoanAmount': [110.0],
+          'Loan_Amount_Term': [360.0], 'Credit_History': [1.0], 'Property_Area': ['Urban']}}
+first = time.perf_counter()
+predict.generate_prediction(data_input=record)
+end = time.perf_counter()
+print(end - start, end - first)
+"""
+
+def import_time_us() -> int:
+    """Cumulative import time of 'prediction_model.predict', in microseconds."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import prediction_model.predict"],
+                            capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+        if line.rstrip().endswith("| prediction_model.predict"):
+            return int(line.split("|")[1])
+    raise RuntimeError("'prediction_model.predict' not found in the importtime report")
+
+def first_prediction_s(warmup: bool) -> tuple[float, float]:
+    """Seconds from the start of the import to the first prediction, and of the prediction call alone."""
+    code = FIRST_PREDICTION.format(warmup="predict.warmup()" if warmup else "")
+    result = subprocess.run([sys.executable, "-W", "ignore", "-c", code], capture_output=True, text=True, check=True)
+    total, call = result.stdout.splitlines()[-1].split()
+    return float(total), float(call)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    imports = [import_time_us() / 1e6 for _ in range(args.repeat)]
+    lazy = [first_prediction_s(warmup=False) for _ in range(args.repeat)]
+    warm = [first_prediction_s(warmup=True) for _ in range(args.repeat)]
+    print(f"import prediction_model.predict          : {statistics.median(imports) * 1e3:8.1f} ms")
+    print(f"import -> first prediction (lazy)         : {statistics.median(t for t, _ in lazy) * 1e3:8.1f} ms"
+          f"  (first call {statistics.median(c for _, c in lazy) * 1e3:.1f} ms)")
+    print(f"import -> first prediction (warmup first) : {statistics.median(t for t, _ in warm) * 1e3:8.1f} ms"
+          f"  (first call {statistics.median(c for _, c in warm) * 1e3:.1f} ms)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Synthetic loan datasets of any size, for benchmarks.
+
+Rows are resampled with replacement from 'loan-train.csv' or 'loan-test.csv', so the
+category frequencies and missing value patterns of the real data are preserved. Numerical
+columns get a small multiplicative jitter so that rows are not all exact duplicates, and
+'Loan_ID' stays unique.
+"""
+import numpy as np
+import pandas as pd
+
+from prediction_model.config import config
+from prediction_model.processing.data_handling import load_dataset
+
+def make_synthetic_dataset(n_rows: int, filename: str = config.TRAIN_FILE, seed: int = 0) -> pd.DataFrame:
+    """
+    Resample 'filename' to 'n_rows' rows.
+
+    Parameters
+    ----------
+    n_rows : int
+        Number of rows to generate.
+
+    filename : str, default=config.TRAIN_FILE
+        The dataset to resample, 'config.TRAIN_FILE' or 'config.TEST_FILE'.
+
+    seed : int, default=0
+        Seed of the random generator, for reproducible datasets.
+
+    Returns
+    -------
+    pd.DataFrame
+        The synthetic dataset, with the columns of 'filename'.
+    """
+    rng = np.random.default_rng(seed=seed)
+    source = load_dataset(filename=filename)
+    data = source.iloc[rng.integers(0, len(source), size=n_rows)].reset_index(drop=True)
+    for col in ["ApplicantIncome", "CoapplicantIncome", "LoanAmount"]:
+        data[col] = (data[col] * rng.uniform(0.9, 1.1, size=n_rows)).round()
+    data[config.ID_FEATURE] = [f"SYN{index:09d}" for index in range(n_rows)]
+    return data
@@ -0,0 +1,262 @@
+import json
+import mmap
+import os
+import struct
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from prediction_model import __version__
+from prediction_model.config import config
+
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
+
+    from prediction_model.compiled_pipeline import CompiledPipeline
+
+ARTIFACT_MAGIC:bytes = b"PMARTIF\x00"  # First bytes of every model artifact file
+ARTIFACT_FORMAT_VERSION:int = 1  # Version of the layout below, bumped on incompatible changes
+_PREFIX = struct.Struct("<8sQ")  # Magic, then the length of the JSON header
+_ALIGNMENT:int = 64  # Arrays start at multiples of 64 bytes, so that mapped arrays are aligned
+
+# Layout of a model artifact file:
+#
+#     magic (8 bytes) | header length (uint64, little-endian) | JSON header | padding | arrays
+#
+# The JSON header holds the format version, the package and sklearn versions the model was
+# fitted with, and for each pipeline step its name, class name, parameters and fitted
+# attributes. Numeric arrays are stored as raw little-endian bytes after the header and
+# referenced from it by dtype, shape and offset; strings, dicts and scalars stay in the header.
+#
+# Loading maps the file read-only: nothing is unpickled, the arrays are views on the page
+# cache, and every process that loads the same file shares one copy of it.
+
+def _encode(value, arrays: list[np.ndarray]):
+    """Convert a parameter or fitted attribute to JSON, moving numeric arrays to 'arrays'."""
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind in "biuf":
+            arrays.append(value)
+            return {"__array__": len(arrays) - 1}
+        return {"__objects__": [_encode(item, arrays) for item in value.tolist()]}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, tuple):
+        return {"__tuple__": [_encode(item, arrays) for item in value]}
+    if isinstance(value, list):
+        return [_encode(item, arrays) for item in value]
+    if isinstance(value, dict):
+        # Keys are kept as pairs, because category keys may be floats, e.g. in 'Credit_History'
+        return {"__dict__": [[_encode(key, arrays), _encode(item, arrays)] for key, item in value.items()]}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise TypeError(f"Cannot store a value of type {type(value).__name__} in a model artifact")
+
+def _decode(value, arrays: list[np.ndarray]):
+    """Inverse of '_encode'."""
+    if isinstance(value, list):
+        return [_decode(item, arrays) for item in value]
+    if isinstance(value, dict):
+        if "__array__" in value:
+            return arrays[value["__array__"]]
+        if "__objects__" in value:
+            return np.array([_decode(item, arrays) for item in value["__objects__"]], dtype=object)
+        if "__tuple__" in value:
+            return tuple(_decode(item, arrays) for item in value["__tuple__"])
+        return {_decode(key, arrays): _decode(item, arrays) for key, item in value["__dict__"]}
+    return value
+
+def save_artifact(pipeline_to_save: 'Pipeline', artifact_name: str = config.ARTIFACT_NAME) -> str:
+    """
+    Export the fitted parameters of a pipeline as a model artifact.
+
+    Only the parameters and fitted attributes of each step are written, not the Python
+    objects: see the layout above. The file is written next to the joblib model and
+    replaced atomically, so processes that have mapped the previous version keep it.
+
+    Parameters
+    ----------
+    pipeline_to_save : Pipeline
+        A fitted pipeline whose steps are listed in 'artifact_step_types'.
+
+    artifact_name : str, default=config.ARTIFACT_NAME
+        Name of the artifact file in 'config.SAVE_MODEL_PATH'.
+
+    Returns
+    -------
+    str
+        Path of the saved artifact.
+    """
+    import sklearn
+
+    step_types = artifact_step_types()
+    arrays: list[np.ndarray] = []
+    steps = []
+    for name, step in pipeline_to_save.steps:
+        if step_types.get(type(step).__name__) is not type(step):
+            raise TypeError(f"Step '{name}' of type {type(step).__name__} cannot be stored in a model artifact")
+        fitted = {key: value for key, value in vars(step).items() if key.endswith("_") and not key.startswith("_")}
+        steps.append({"name": name, "type": type(step).__name__,
+                      "params": _encode(step.get_params(deep=False), arrays), "fitted": _encode(fitted, arrays)})
+
+    offset = 0
+    array_specs = []
+    for array in arrays:
+        array_specs.append({"dtype": array.dtype.newbyteorder("<").str, "shape": list(array.shape), "offset": offset})
+        offset += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+    header = json.dumps({
+        "format_version": ARTIFACT_FORMAT_VERSION,
+        "package_version": __version__,
+        "sklearn_version": sklearn.__version__,
+        "steps": steps,
+        "arrays": array_specs,
+    }).encode()
+    data_start = -(-(_PREFIX.size + len(header)) // _ALIGNMENT) * _ALIGNMENT
+
+    savepath: str = os.path.join(config.SAVE_MODEL_PATH, artifact_name)
+    with open(savepath + ".tmp", "wb") as f:
+        f.write(_PREFIX.pack(ARTIFACT_MAGIC, len(header)) + header)
+        for array, spec in zip(arrays, array_specs):
+            f.seek(data_start + spec["offset"])
+            f.write(np.ascontiguousarray(array, dtype=spec["dtype"]).tobytes())
+        f.truncate(data_start + offset)
+    os.replace(savepath + ".tmp", savepath)
+    print(f"Model artifact has been saved: {artifact_name}")
+    return savepath
+
+def artifact_step_types() -> dict[str, type]:
+    """Step classes that model artifacts can hold, by class name."""
+    from sklearn.linear_model import LogisticRegression, SGDClassifier
+    from sklearn.preprocessing import MinMaxScaler
+
+    from prediction_model.processing import data_preprocessing as data_pp
+
+    return {cls.__name__: cls for cls in (
+        data_pp.MeanImputer, data_pp.ModeImputer, data_pp.CombineColumns, data_pp.DropColumns,
+        data_pp.CustomLabelEncoder, data_pp.LogTransform, MinMaxScaler, LogisticRegression, SGDClassifier,
+    )}
+
+class ModelArtifact:
+    """
+    A model artifact mapped in memory, see 'load_artifact'.
+
+    Attributes
+    ----------
+    header : dict
+        The JSON header: format and library versions, and the steps with their parameters.
+
+    steps : list of (str, str, dict, dict)
+        Name, class name, parameters and fitted attributes of each step, with arrays
+        as read-only views on the mapped file.
+    """
+    def __init__(self, header: dict, buffer) -> None:
+        self.header: dict = header
+        arrays = [
+            np.frombuffer(buffer, dtype=np.dtype(spec["dtype"]), count=int(np.prod(spec["shape"])),
+                          offset=spec["offset"]).reshape(spec["shape"])
+            for spec in header["arrays"]
+        ]
+        self.steps: list[tuple[str, str, dict, dict]] = [
+            (step["name"], step["type"], _decode(step["params"], arrays), _decode(step["fitted"], arrays))
+            for step in header["steps"]
+        ]
+
+    def to_pipeline(self) -> 'Pipeline':
+        """
+        Rebuild the fitted scikit-learn Pipeline.
+
+        Returns
+        -------
+        Pipeline
+            A pipeline equal to the exported one, whose arrays are views on the mapped file.
+        """
+        from sklearn.pipeline import Pipeline
+
+        step_types = artifact_step_types()
+        steps = []
+        for name, type_name, params, fitted in self.steps:
+            if type_name not in step_types:
+                raise ValueError(f"Unknown step type in model artifact: {type_name}")
+            step = step_types[type_name](**params)
+            for key, value in fitted.items():
+                setattr(step, key, value)
+            steps.append((name, step))
+        return Pipeline(steps=steps)
+
+    def to_compiled(self) -> 'CompiledPipeline':
+        """
+        Build the compiled NumPy scorer directly from the stored parameters, without
+        importing scikit-learn.
+
+        Returns
+        -------
+        CompiledPipeline
+            The scorer, equal to 'CompiledPipeline.from_pipeline(self.to_pipeline())'.
+        """
+        from prediction_model.compiled_pipeline import CompiledPipeline
+
+        states = {type_name: {**params, **fitted} for _, type_name, params, fitted in self.steps}
+        if len(states) != len(self.steps):
+            raise ValueError("Model artifacts with repeated step types cannot be compiled")
+        mean, mode, combine, encoder, log, scaler = (
+            states[type_name] for type_name in ("MeanImputer", "ModeImputer", "CombineColumns", "CustomLabelEncoder",
+                                                "LogTransform", "MinMaxScaler")
+        )
+        _, estimator_type, params, fitted = self.steps[-1]
+        estimator = {**params, **fitted}
+        if estimator_type not in ("LogisticRegression", "SGDClassifier") or estimator.get("loss", "log_loss") != "log_loss":
+            raise TypeError(f"Only logistic estimators can be compiled, got: {estimator_type}")
+        return CompiledPipeline(
+            columns=list(scaler["feature_names_in_"]),
+            fill_values=mean["mean_dict_"],
+            category_tables=encoder["label_dict_"],
+            missing_values={col: value for col, value in mode["mode_dict_"].items() if col in encoder["label_dict_"]},
+            combine_columns=combine["columnA"],
+            log_columns=log["numerical_features"],
+            scale=scaler["scale_"],
+            offset=scaler["min_"],
+            coef=estimator["coef_"],
+            intercept=estimator["intercept_"],
+            classes=estimator["classes_"],
+            clip=scaler["clip"],
+            unknown_value=encoder.get("unknown_value", np.nan),
+        )
+
+def is_artifact(artifact_name: str) -> bool:
+    """Whether the file 'artifact_name' in 'config.SAVE_MODEL_PATH' is a model artifact, rather than a joblib model."""
+    with open(os.path.join(config.SAVE_MODEL_PATH, artifact_name), "rb") as f:
+        return f.read(len(ARTIFACT_MAGIC)) == ARTIFACT_MAGIC
+
+def load_artifact(artifact_name: str = config.ARTIFACT_NAME) -> ModelArtifact:
+    """
+    Map a model artifact saved by 'save_artifact'.
+
+    Parameters
+    ----------
+    artifact_name : str, default=config.ARTIFACT_NAME
+        Name of the artifact file in 'config.SAVE_MODEL_PATH'.
+
+    Returns
+    -------
+    ModelArtifact
+        The mapped artifact, to rebuild the Pipeline or the compiled scorer from.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a model artifact, or was written by a newer format version.
+    """
+    savepath: str = os.path.join(config.SAVE_MODEL_PATH, artifact_name)
+    with open(savepath, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(buffer) < _PREFIX.size:
+        raise ValueError(f"Not a model artifact: {artifact_name}")
+    magic, header_length = _PREFIX.unpack_from(buffer)
+    if magic != ARTIFACT_MAGIC:
+        raise ValueError(f"Not a model artifact: {artifact_name}")
+    header = json.loads(buffer[_PREFIX.size:_PREFIX.size + header_length])
+    if header["format_version"] > ARTIFACT_FORMAT_VERSION:
+        raise ValueError(f"Model artifact format version {header['format_version']} is newer than the supported "
+                         f"version {ARTIFACT_FORMAT_VERSION}, upgrade the package to load {artifact_name}")
+    data_start = -(-(_PREFIX.size + header_length) // _ALIGNMENT) * _ALIGNMENT
+    print(f"Model artifact has been loaded: {artifact_name}")
+    return ModelArtifact(header=header, buffer=memoryview(buffer)[data_start:])
@@ -0,0 +1,249 @@
+import argparse
+import json
+import os
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from prediction_model.batch_predict import read_chunks, score_chunk, write_chunks
+from prediction_model.config import config
+from prediction_model.predict import model, warmup
+from prediction_model.processing.data_handling import COLUMNAR_FORMATS, get_file_fingerprint, load_dataset, write_dataset
+
+MANIFEST_FILE:str = "manifest.json"
+
+# Settings a job is resumed with only if they are unchanged
+JOB_SETTINGS:tuple[str, ...] = ("input_path", "input_fingerprint", "chunksize", "compiled", "n_reasons", "output_format", "model_fingerprint")
+
+def partition_name(index: int, output_format: str) -> str:
+    """File name of the predictions of partition 'index'."""
+    return f"part-{index:05d}.{output_format}"
+
+def _replace_atomic(write: Callable[[str], None], path: str) -> None:
+    """Call 'write' on a temporary file next to 'path', and rename it to 'path' once it is on disk."""
+    directory, name = os.path.split(path)
+    # The extension is kept, so that the format of the temporary file is the same
+    tmp_path = os.path.join(directory, f".tmp{os.getpid()}-{name}")
+    write(tmp_path)
+    with open(tmp_path, "rb") as f:
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def read_manifest(job_dir: str) -> dict | None:
+    """The manifest of the job in 'job_dir', or None for a new job."""
+    manifest_path = os.path.join(job_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path) as f:
+        return json.load(f)
+
+def write_manifest(job_dir: str, manifest: dict) -> None:
+    """Atomically replace the manifest of the job in 'job_dir'."""
+    def write(path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(manifest, f, indent=2)
+    _replace_atomic(write=write, path=os.path.join(job_dir, MANIFEST_FILE))
+
+def score_partition(chunk: pd.DataFrame, partition_path: str, model_fingerprint: str, compiled: bool = False,
+                    n_reasons: int = 0) -> int:
+    """
+    Score one partition with the model loaded in the current process, and write it atomically.
+
+    Parameters
+    ----------
+    chunk : pd.DataFrame
+        The applications of the partition, as produced by 'batch_predict.read_chunks'.
+
+    partition_path : str
+        Path to the file to write the predictions to.
+
+    model_fingerprint : str
+        Fingerprint of the model the job scores with; a worker that loaded another one raises.
+
+    compiled : bool, default=False
+        Score with the compiled NumPy engine instead of 'classification_pipeline'.
+
+    n_reasons : int, default=0
+        Number of reason codes written per application, see 'batch_predict.score_chunk'.
+
+    Returns
+    -------
+    int
+        The number of rows scored.
+    """
+    if model.fingerprint != model_fingerprint:
+        raise RuntimeError(f"The job scores with model {model_fingerprint}, but {model.fingerprint} is loaded: "
+                           f"{config.MODEL_NAME} changed while the job was running")
+    scored = score_chunk(chunk=chunk, compiled=compiled, n_reasons=n_reasons)
+    _replace_atomic(write=lambda path: write_dataset(data=scored, filepath=path), path=partition_path)
+    return len(scored)
+
+def run_batch_job(input_path: str, job_dir: str, chunksize: int = config.BATCH_CHUNK_SIZE, compiled: bool = False,
+                  n_jobs: int = 1, n_reasons: int = 0, output_format: str = "csv", verbose: bool = True) -> dict:
+    """
+    Score a file partition by partition, resuming the job in 'job_dir' if it was started before.
+
+    Completed partitions are recorded in the manifest as soon as they are written, so a
+    rerun after a failure only scores the missing ones. The input is still read from the
+    start, but completed partitions are skipped without being scored.
+
+    Parameters
+    ----------
+    input_path : str
+        Path to the CSV, Parquet or Feather/Arrow IPC file with the applications to score.
+
+    job_dir : str
+        Directory of the partitions and manifest, created when missing.
+
+    chunksize : int, default=config.BATCH_CHUNK_SIZE
+        Number of rows per partition.
+
+    compiled : bool, default=False
+        Score with the compiled NumPy engine instead of 'classification_pipeline'.
+
+    n_jobs : int, default=1
+        Number of worker processes scoring partitions in parallel. -1 uses all CPU cores.
+
+    n_reasons : int, default=0
+        Number of reason codes written per application, see 'batch_predict.score_chunk'.
+
+    output_format : str, default="csv"
+        Format of the partitions, as a file extension: "csv", or e.g. "parquet" or "feather".
+
+    verbose : bool, default=True
+        Print progress after every partition.
+
+    Returns
+    -------
+    dict
+        The manifest of the completed job: its settings, the "n_rows" of each of its
+        "partitions" by index, and its "n_partitions".
+
+    Raises
+    ------
+    ValueError
+        If the job in 'job_dir' was started with other 'JOB_SETTINGS', e.g. another model or
+        an input file with another content fingerprint.
+    """
+    if output_format != "csv" and f".{output_format}" not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unsupported output format: {output_format}, expected 'csv' or one of {sorted(COLUMNAR_FORMATS)}")
+    settings = {
+        "input_path": os.path.abspath(input_path),
+        "input_fingerprint": get_file_fingerprint(filepath=input_path),
+        "chunksize": chunksize,
+        "compiled": compiled,
+        "n_reasons": n_reasons,
+        "output_format": output_format,
+        "model_fingerprint": model.fingerprint,
+    }
+    os.makedirs(job_dir, exist_ok=True)
+    manifest = read_manifest(job_dir=job_dir)
+    if manifest is None:
+        manifest = {**settings, "partitions": {}, "n_partitions": None}
+        write_manifest(job_dir=job_dir, manifest=manifest)
+    else:
+        changed = {key: (manifest.get(key), settings[key]) for key in JOB_SETTINGS if manifest.get(key) != settings[key]}
+        if changed:
+            raise ValueError(f"Job {job_dir} was started with other settings, (started with, now): {changed}")
+    # Leftovers of partitions being written when the job was killed
+    for name in os.listdir(job_dir):
+        if name.startswith(".tmp"):
+            os.remove(os.path.join(job_dir, name))
+
+    partitions: dict = manifest["partitions"]
+    n_resumed, n_rows_scored = len(partitions), 0
+    start = time.perf_counter()
+
+    def record(index: int, n_rows: int) -> None:
+        nonlocal n_rows_scored
+        partitions[str(index)] = n_rows
+        write_manifest(job_dir=job_dir, manifest=manifest)
+        n_rows_scored += n_rows
+        if verbose:
+            elapsed = time.perf_counter() - start
+            print(f"Partition {index} has been scored: {len(partitions) - n_resumed} scored, {n_resumed} resumed "
+                  f"({n_rows_scored / max(elapsed, np.finfo(float).eps):,.0f} rows/s)", flush=True)
+
+    n_partitions = 0
+
+    def pending_partitions():
+        nonlocal n_partitions
+        for index, chunk in enumerate(read_chunks(input_path=input_path, chunksize=chunksize)):
+            n_partitions = index + 1
+            if str(index) not in partitions:
+                yield index, chunk, os.path.join(job_dir, partition_name(index=index, output_format=output_format))
+
+    if n_jobs == 1:
+        for index, chunk, partition_path in pending_partitions():
+            record(index=index, n_rows=score_partition(chunk=chunk, partition_path=partition_path,
+                                                       model_fingerprint=settings["model_fingerprint"],
+                                                       compiled=compiled, n_reasons=n_reasons))
+    else:
+        n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+        pending: deque[tuple[int, Future]] = deque()
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=warmup) as executor:
+            for index, chunk, partition_path in pending_partitions():
+                pending.append((index, executor.submit(score_partition, chunk, partition_path,
+                                                       settings["model_fingerprint"], compiled, n_reasons)))
+                if len(pending) >= 2 * n_jobs:
+                    index, future = pending.popleft()
+                    record(index=index, n_rows=future.result())
+            while pending:
+                index, future = pending.popleft()
+                record(index=index, n_rows=future.result())
+
+    manifest["n_partitions"] = n_partitions
+    write_manifest(job_dir=job_dir, manifest=manifest)
+    return manifest
+
+def merge_job_output(job_dir: str, output_path: str) -> int:
+    """
+    Concatenate the partitions of a completed job into one file, in input order.
+
+    Parameters
+    ----------
+    job_dir : str
+        Directory of the job, see 'run_batch_job'.
+
+    output_path : str
+        Path to the CSV, Parquet or Feather/Arrow IPC file to write.
+
+    Returns
+    -------
+    int
+        The number of rows written.
+    """
+    manifest = read_manifest(job_dir=job_dir)
+    if manifest is None or manifest["n_partitions"] is None or len(manifest["partitions"]) < manifest["n_partitions"]:
+        raise ValueError(f"Job {job_dir} is not complete, run it again to score the missing partitions")
+    paths = [os.path.abspath(os.path.join(job_dir, partition_name(index=index, output_format=manifest["output_format"])))
+             for index in range(manifest["n_partitions"])]
+    return sum(len(scored) for scored in write_chunks(scored_chunks=(load_dataset(filename=path) for path in paths),
+                                                      output_path=output_path))
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Score a file of loan applications as a resumable job of partitions.")
+    parser.add_argument("input_path", help="CSV, Parquet or Feather/Arrow IPC file with the applications to score")
+    parser.add_argument("job_dir", help="directory of the partitions and manifest; rerun with it to resume the job")
+    parser.add_argument("--chunksize", type=int, default=config.BATCH_CHUNK_SIZE, help="rows per partition")
+    parser.add_argument("--compiled", action="store_true", help="score with the compiled NumPy engine")
+    parser.add_argument("--n-jobs", type=int, default=1, help="worker processes, -1 for all CPU cores")
+    parser.add_argument("--reasons", type=int, default=0, metavar="N",
+                        help="also write the approval probability and N reason codes per application")
+    parser.add_argument("--format", default="csv", help="format of the partitions, e.g. csv, parquet or feather")
+    parser.add_argument("--merge", metavar="OUTPUT_PATH", help="concatenate the partitions into one file once the job is complete")
+    parser.add_argument("--quiet", action="store_true", help="do not report progress")
+    args = parser.parse_args(argv)
+
+    run_batch_job(input_path=args.input_path, job_dir=args.job_dir, chunksize=args.chunksize, compiled=args.compiled,
+                  n_jobs=args.n_jobs, n_reasons=args.reasons, output_format=args.format, verbose=not args.quiet)
+    if args.merge:
+        n_rows = merge_job_output(job_dir=args.job_dir, output_path=args.merge)
+        print(f"Predictions have been merged: {n_rows:,} rows in {args.merge}")
+
+if __name__ == "__main__":
+    main()
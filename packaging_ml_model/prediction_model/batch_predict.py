@@ -0,0 +1,279 @@
+import argparse
+import os
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from prediction_model.config import config
+from prediction_model.predict import explain_predictions, generate_prediction, warmup
+from prediction_model.processing.data_handling import get_file_format, import_pyarrow, iter_dataset_chunks
+
+def read_chunks(input_path: str, chunksize: int = config.BATCH_CHUNK_SIZE, compact: bool = False) -> Iterator[pd.DataFrame]:
+    """
+    Stream the scoring input in chunks, keeping only 'config.FEATURES' and 'config.ID_FEATURE'.
+
+    Parameters
+    ----------
+    input_path : str
+        Path to the CSV, Parquet or Feather/Arrow IPC file with the applications to score.
+        Columnar files are memory-mapped and only the needed columns are read.
+
+    chunksize : int, default=config.BATCH_CHUNK_SIZE
+        Maximum number of rows per chunk.
+
+    compact : bool, default=False
+        Read the features with the memory-lean dtypes of 'config.COMPACT_DTYPES'.
+
+    Yields
+    ------
+    pd.DataFrame
+        The next chunk of applications.
+    """
+    for chunk in iter_dataset_chunks(filepath=input_path, chunksize=chunksize, columns=[config.ID_FEATURE] + config.FEATURES,
+                                     compact=compact):
+        missing = [col for col in config.FEATURES if col not in chunk.columns]
+        if missing:
+            raise KeyError(f"Input file {input_path} is missing the feature columns: {missing}")
+        yield chunk
+
+def score_chunk(chunk: pd.DataFrame, compiled: bool = False, n_reasons: int = 0) -> pd.DataFrame:
+    """
+    Score one chunk with the model loaded in the current process.
+
+    Parameters
+    ----------
+    chunk : pd.DataFrame
+        Applications to score, as produced by 'read_chunks'.
+
+    compiled : bool, default=False
+        Score with the compiled NumPy engine instead of 'classification_pipeline'.
+
+    n_reasons : int, default=0
+        When positive, also return the approval probability and this many reason codes,
+        see 'predict.explain_predictions'. Always uses the compiled NumPy engine.
+
+    Returns
+    -------
+    pd.DataFrame
+        'config.ID_FEATURE' (when present in the input) and the 'Y'/'N' prediction in 'config.TARGET_FEATURE',
+        followed, when 'n_reasons' is positive, by 'Probability' and 'Reason_1' to 'Reason_<n_reasons>'.
+    """
+    scored = pd.DataFrame(index=chunk.index)
+    if config.ID_FEATURE in chunk.columns:
+        scored[config.ID_FEATURE] = chunk[config.ID_FEATURE]
+    if n_reasons <= 0:
+        scored[config.TARGET_FEATURE] = generate_prediction(data_input=chunk[config.FEATURES], compiled=compiled)["prediction"]
+        return scored
+    explained = explain_predictions(data_input=chunk[config.FEATURES], n_reasons=n_reasons)
+    scored[config.TARGET_FEATURE] = explained["prediction"]
+    scored["Probability"] = explained["probability"]
+    for i in range(n_reasons):
+        scored[f"Reason_{i + 1}"] = explained["reasons"][:, i]
+    return scored
+
+def score_chunks(chunks: Iterable[pd.DataFrame], compiled: bool = False, n_reasons: int = 0) -> Iterator[pd.DataFrame]:
+    """
+    Score each chunk with the loaded model.
+
+    Parameters
+    ----------
+    chunks : iterable of pd.DataFrame
+        Chunks of applications, as produced by 'read_chunks'.
+
+    compiled : bool, default=False
+        Score with the compiled NumPy engine instead of 'classification_pipeline'.
+
+    n_reasons : int, default=0
+        Number of reason codes returned per application, see 'score_chunk'.
+
+    Yields
+    ------
+    pd.DataFrame
+        Each scored chunk, see 'score_chunk'.
+    """
+    for chunk in chunks:
+        yield score_chunk(chunk=chunk, compiled=compiled, n_reasons=n_reasons)
+
+def score_chunks_parallel(chunks: Iterable[pd.DataFrame], n_jobs: int, compiled: bool = False,
+                          max_pending: int | None = None, n_reasons: int = 0) -> Iterator[pd.DataFrame]:
+    """
+    Score chunks as shards in a pool of worker processes, yielding them in input order.
+
+    Only the shards travel between processes: each worker loads 'Classification.pkl' once,
+    when it starts, and reuses it for every shard it scores. At most
+    'max_pending' shards are in flight, so memory stays bounded like in 'score_chunks'.
+
+    Parameters
+    ----------
+    chunks : iterable of pd.DataFrame
+        Chunks of applications, as produced by 'read_chunks'.
+
+    n_jobs : int
+        Number of worker processes. -1 uses all CPU cores.
+
+    compiled : bool, default=False
+        Score with the compiled NumPy engine instead of 'classification_pipeline'.
+
+    max_pending : int, optional
+        Maximum number of shards submitted but not yet yielded. Defaults to twice 'n_jobs'.
+
+    n_reasons : int, default=0
+        Number of reason codes returned per application, see 'score_chunk'.
+
+    Yields
+    ------
+    pd.DataFrame
+        Each scored chunk, in the same order as 'chunks'.
+    """
+    n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+    max_pending = max_pending or 2 * n_jobs
+    pending: deque[Future] = deque()
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=warmup) as executor:
+        for chunk in chunks:
+            pending.append(executor.submit(score_chunk, chunk, compiled, n_reasons))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def _output_schema(scored: pd.DataFrame):
+    """
+    Arrow schema of the scored chunks written by 'write_chunks'.
+
+    Reason codes are strings and 'Probability' is float64 whatever the first chunk holds: a
+    reason column without any reason in the first chunk would otherwise be typed as null,
+    and no later chunk could be cast to it. Other columns keep the types of the input.
+    """
+    pa = import_pyarrow()
+    inferred = pa.Schema.from_pandas(scored, preserve_index=False)
+    fields = []
+    for field in inferred:
+        if field.name.startswith("Reason_"):
+            field = field.with_type(pa.string())
+        elif field.name == "Probability":
+            field = field.with_type(pa.float64())
+        fields.append(field)
+    return pa.schema(fields, metadata=inferred.metadata)
+
+def write_chunks(scored_chunks: Iterable[pd.DataFrame], output_path: str) -> Iterator[pd.DataFrame]:
+    """
+    Append each scored chunk to the output file as soon as it is available.
+
+    The output format follows the extension of 'output_path': CSV, Parquet (one row
+    group per chunk) or Feather/Arrow IPC (one record batch per chunk).
+
+    Parameters
+    ----------
+    scored_chunks : iterable of pd.DataFrame
+        Scored chunks, as produced by 'score_chunks'.
+
+    output_path : str
+        Path to the file to write.
+
+    Yields
+    ------
+    pd.DataFrame
+        Each chunk once it has been written.
+    """
+    file_format: str = get_file_format(filepath=output_path)
+    if file_format == "csv":
+        with open(output_path, mode="w", newline="") as f:
+            header = True
+            for scored in scored_chunks:
+                scored.to_csv(path_or_buf=f, header=header, index=False)
+                header = False
+                yield scored
+        return
+
+    pa = import_pyarrow()
+    writer, schema = None, None
+    try:
+        for scored in scored_chunks:
+            if writer is None:
+                schema = _output_schema(scored=scored)
+                if file_format == "parquet":
+                    writer = pa.parquet.ParquetWriter(output_path, schema)
+                else:
+                    writer = pa.ipc.new_file(output_path, schema)
+            writer.write_table(pa.Table.from_pandas(scored, schema=schema, preserve_index=False))
+            yield scored
+    finally:
+        if writer is not None:
+            writer.close()
+
+def run_batch_prediction(input_path: str, output_path: str, chunksize: int = config.BATCH_CHUNK_SIZE,
+                         compiled: bool = False, n_jobs: int = 1, verbose: bool = True, n_reasons: int = 0,
+                         compact: bool = False) -> int:
+    """
+    Score a file of any size chunk by chunk and stream the predictions to 'output_path'.
+
+    Peak memory is bounded by 'chunksize', not by the size of the input file.
+
+    Parameters
+    ----------
+    input_path : str
+        Path to the CSV, Parquet or Feather/Arrow IPC file with the applications to score.
+
+    output_path : str
+        Path to the CSV, Parquet or Feather/Arrow IPC file to write the predictions to.
+
+    chunksize : int, default=config.BATCH_CHUNK_SIZE
+        Maximum number of rows scored at once.
+
+    compiled : bool, default=False
+        Score with the compiled NumPy engine instead of 'classification_pipeline'.
+
+    n_jobs : int, default=1
+        Number of worker processes scoring chunks in parallel. -1 uses all CPU cores.
+
+    verbose : bool, default=True
+        Print progress and throughput after every chunk.
+
+    n_reasons : int, default=0
+        Number of reason codes written per application, next to its approval probability.
+        See 'score_chunk'.
+
+    compact : bool, default=False
+        Read the input with the memory-lean dtypes of 'config.COMPACT_DTYPES'.
+
+    Returns
+    -------
+    int
+        The number of rows scored.
+    """
+    n_rows: int = 0
+    start: float = time.perf_counter()
+    chunks = read_chunks(input_path=input_path, chunksize=chunksize, compact=compact)
+    if n_jobs == 1:
+        scored_chunks = score_chunks(chunks=chunks, compiled=compiled, n_reasons=n_reasons)
+    else:
+        scored_chunks = score_chunks_parallel(chunks=chunks, n_jobs=n_jobs, compiled=compiled, n_reasons=n_reasons)
+    for scored in write_chunks(scored_chunks=scored_chunks, output_path=output_path):
+        n_rows += len(scored)
+        if verbose:
+            elapsed = time.perf_counter() - start
+            print(f"Scored {n_rows:,} rows in {elapsed:.2f}s ({n_rows / max(elapsed, np.finfo(float).eps):,.0f} rows/s)", flush=True)
+    return n_rows
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Score a file of loan applications in chunks.")
+    parser.add_argument("input_path", help="CSV, Parquet or Feather/Arrow IPC file with the applications to score")
+    parser.add_argument("output_path", help="CSV, Parquet or Feather/Arrow IPC file to write the predictions to")
+    parser.add_argument("--chunksize", type=int, default=config.BATCH_CHUNK_SIZE, help="rows scored at once")
+    parser.add_argument("--compiled", action="store_true", help="score with the compiled NumPy engine")
+    parser.add_argument("--n-jobs", type=int, default=1, help="worker processes, -1 for all CPU cores")
+    parser.add_argument("--reasons", type=int, default=0, metavar="N",
+                        help="also write the approval probability and N reason codes per application")
+    parser.add_argument("--compact", action="store_true", help="read the input with the dtypes of 'config.COMPACT_DTYPES'")
+    parser.add_argument("--quiet", action="store_true", help="do not report progress")
+    args = parser.parse_args(argv)
+    run_batch_prediction(input_path=args.input_path, output_path=args.output_path, chunksize=args.chunksize,
+                         compiled=args.compiled, n_jobs=args.n_jobs, verbose=not args.quiet,
+                         n_reasons=args.reasons, compact=args.compact)
+
+if __name__ == "__main__":
+    main()
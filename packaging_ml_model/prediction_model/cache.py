@@ -0,0 +1,175 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable, Mapping
+from typing import TYPE_CHECKING
+
+from prediction_model.config import config
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+def _normalize(value):
+    """Map every kind of missing value to None, so that missing values compare equal."""
+    # 'pd.NA' has no truth value; it can only exist once pandas is imported, which this module avoids
+    pandas = sys.modules.get("pandas")
+    if value is None or (pandas is not None and value is pandas.NA) or value != value:
+        return None
+    return value
+
+def record_key(record: Mapping) -> tuple:
+    """
+    Cache key of one record: its 'config.FEATURES' values, with missing values normalized.
+
+    Records that the pipeline cannot tell apart get equal keys: 1 and 1.0 compare and
+    hash equal, and None, NaN and absent keys all become None.
+
+    Parameters
+    ----------
+    record : mapping of str: Any
+        Feature values of one application.
+
+    Returns
+    -------
+    tuple
+        The hashable key.
+    """
+    return tuple(_normalize(record.get(col)) for col in config.FEATURES)
+
+def frame_keys(data: 'pd.DataFrame') -> list[tuple]:
+    """
+    Cache keys of each row of a DataFrame, equal to 'record_key' of the same rows.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        Input data containing at least 'config.FEATURES'.
+
+    Returns
+    -------
+    list of tuple
+        The hashable key of each row.
+    """
+    features = data[config.FEATURES].astype(object)
+    features = features.where(features.notna(), None)
+    return list(features.itertuples(index=False, name=None))
+
+class PredictionCache:
+    """
+    Thread-safe in-memory cache of predictions, with LRU and optional TTL eviction.
+
+    Entries are keyed by the feature values of a record (see 'record_key') within the
+    namespace of one model fingerprint: when a different model is loaded, the next lookup
+    with its fingerprint drops every entry scored by the previous one.
+
+    Parameters
+    ----------
+    max_size : int, default=config.PREDICTION_CACHE_SIZE
+        Maximum number of entries; the least recently used entry is evicted beyond it.
+
+    ttl : float, optional
+        Time to live of an entry, in seconds. Entries never expire when None.
+    """
+    def __init__(self, max_size: int = config.PREDICTION_CACHE_SIZE, ttl: float | None = None) -> None:
+        self.max_size: int = max_size
+        self.ttl: float | None = ttl
+        self.fingerprint: str | None = None
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+        self.invalidations: int = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _check_fingerprint(self, fingerprint: str) -> None:
+        """Drop every entry if 'fingerprint' is not the one the entries were scored with."""
+        if fingerprint != self.fingerprint:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self.fingerprint = fingerprint
+
+    def get_many(self, keys: Iterable[Hashable], fingerprint: str) -> list:
+        """
+        Look up several keys at once.
+
+        Parameters
+        ----------
+        keys : iterable of hashable
+            Keys built by 'record_key' or 'frame_keys'.
+
+        fingerprint : str
+            Fingerprint of the model that would score the misses.
+
+        Returns
+        -------
+        list
+            The cached value of each key, or None for misses.
+        """
+        now = time.monotonic()
+        results = []
+        with self._lock:
+            self._check_fingerprint(fingerprint=fingerprint)
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and self.ttl is not None and entry[1] < now:
+                    del self._entries[key]
+                    self.expirations += 1
+                    entry = None
+                if entry is None:
+                    self.misses += 1
+                    results.append(None)
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    results.append(entry[0])
+        return results
+
+    def put_many(self, items: Iterable[tuple[Hashable, object]], fingerprint: str) -> None:
+        """
+        Store several values at once, evicting the least recently used entries beyond 'max_size'.
+
+        Parameters
+        ----------
+        items : iterable of (key, value)
+            Keys built by 'record_key' or 'frame_keys' and their predictions.
+
+        fingerprint : str
+            Fingerprint of the model that scored the values. Values scored by another model
+            than the one of the last 'get_many' are not stored.
+        """
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if fingerprint != self.fingerprint:
+                return  # Scored by a model replaced in the meantime
+            for key, value in items:
+                self._entries[key] = (value, expires_at)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters, eviction counters and the current size."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "fingerprint": self.fingerprint,
+        }
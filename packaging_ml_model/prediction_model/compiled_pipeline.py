@@ -0,0 +1,496 @@
+import threading
+from collections.abc import Mapping, Sequence
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+from scipy.special import expit
+
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
+
+def _pipeline_step_types() -> tuple[type | tuple[type, ...], ...]:
+    """
+    Step types of `pipeline.classification_pipeline`, in the order the compiled kernel replays them.
+
+    The final step may be any linear classifier with a logistic link: `LogisticRegression`
+    or `SGDClassifier(loss="log_loss")`, as selected by 'training_pipeline.search_pipeline'.
+    """
+    from sklearn.linear_model import LogisticRegression, SGDClassifier
+    from sklearn.preprocessing import MinMaxScaler
+
+    from prediction_model.processing import data_preprocessing as data_pp
+
+    return (
+        data_pp.MeanImputer,
+        data_pp.ModeImputer,
+        data_pp.CombineColumns,
+        data_pp.DropColumns,
+        data_pp.CustomLabelEncoder,
+        data_pp.LogTransform,
+        MinMaxScaler,
+        (LogisticRegression, SGDClassifier),
+    )
+
+def __getattr__(name: str):
+    # sklearn is only imported to compile a Pipeline, so that scorers loaded from a model
+    # artifact (see 'artifact.load_artifact') never import it
+    if name == "PIPELINE_STEP_TYPES":
+        return _pipeline_step_types()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class CompiledPipeline:
+    """
+    Fused NumPy scoring engine for a fitted `classification_pipeline`.
+
+    The fitted state of every pipeline step (imputation values, label maps, scaler
+    parameters and logistic regression weights) is read once and replayed as a single
+    vectorized kernel over a float64 matrix, without building any intermediate DataFrames.
+    Categorical columns are imputed and encoded while the matrix is assembled; every
+    following step is an in-place array operation.
+
+    Parameters
+    ----------
+    columns : list of str
+        Model input columns, in the order expected by the scaler and estimator.
+
+    fill_values : dict of str: float
+        Mean imputation value for each numerical column.
+
+    category_tables : dict of str: dict
+        Label mapping for each categorical column, as fitted by `CustomLabelEncoder`.
+
+    missing_values : dict of str: Any
+        Mode imputation value for each categorical column.
+
+    combine_columns : list of str
+        Columns transformed by `CombineColumns`.
+
+    log_columns : list of str
+        Columns transformed by `LogTransform`.
+
+    scale : numpy.ndarray of shape (n_columns,)
+        `MinMaxScaler.scale_`.
+
+    offset : numpy.ndarray of shape (n_columns,)
+        `MinMaxScaler.min_`.
+
+    coef : numpy.ndarray of shape (1, n_columns)
+        `coef_` of the `LogisticRegression` (or logistic `SGDClassifier`) estimator.
+
+    intercept : numpy.ndarray of shape (1,)
+        `intercept_` of the estimator.
+
+    classes : numpy.ndarray of shape (2,)
+        `classes_` of the estimator.
+
+    clip : bool, default=False
+        `MinMaxScaler.clip`.
+
+    unknown_value : float, default=np.nan
+        `CustomLabelEncoder.unknown_value`, the code of unseen categories.
+    """
+    def __init__(self, columns: list[str], fill_values: dict, category_tables: dict, missing_values: dict,
+                 combine_columns: list[str], log_columns: list[str], scale: np.ndarray, offset: np.ndarray,
+                 coef: np.ndarray, intercept: np.ndarray, classes: np.ndarray, clip: bool = False,
+                 unknown_value: float = np.nan) -> None:
+        self.columns: list[str] = list(columns)
+        self.fill_values: dict = dict(fill_values)
+        self.category_tables: dict = {col: dict(table) for col, table in category_tables.items()}
+        self.missing_values: dict = dict(missing_values)
+        self.combine_columns: list[str] = list(combine_columns)
+        self.log_columns: list[str] = list(log_columns)
+        self.scale: np.ndarray = np.asarray(scale, dtype=np.float64)
+        self.offset: np.ndarray = np.asarray(offset, dtype=np.float64)
+        self.coef: np.ndarray = np.asarray(coef, dtype=np.float64).reshape(1, -1)
+        self.intercept: np.ndarray = np.asarray(intercept, dtype=np.float64).reshape(1)
+        self.classes: np.ndarray = np.asarray(classes)
+        self.clip: bool = clip
+        self.unknown_value: float = float(unknown_value)
+        self._build_index()
+
+    @classmethod
+    def from_pipeline(cls, pipeline: 'Pipeline') -> 'CompiledPipeline':
+        """
+        Read the fitted state of a `classification_pipeline` into a compiled scorer.
+
+        Parameters
+        ----------
+        pipeline : Pipeline
+            A fitted pipeline with the same steps as `pipeline.classification_pipeline`.
+
+        Returns
+        -------
+        CompiledPipeline
+            The compiled scorer.
+        """
+        step_types = _pipeline_step_types()
+        steps = [step for _, step in pipeline.steps]
+        if len(steps) != len(step_types) or not all(
+            isinstance(step, step_type) for step, step_type in zip(steps, step_types)
+        ):
+            raise TypeError(
+                "Only pipelines with the steps of 'classification_pipeline' can be compiled, "
+                f"got: {[type(step).__name__ for step in steps]}"
+            )
+        mean_imputer, mode_imputer, combiner, _, encoder, log_transform, scaler, estimator = steps
+        if getattr(estimator, "loss", "log_loss") != "log_loss":
+            raise TypeError(f"Only estimators with a logistic loss can be compiled, got loss: {estimator.loss}")
+        if len(estimator.classes_) != 2:
+            raise ValueError(f"Expected a binary classifier, got classes: {estimator.classes_}")
+
+        return cls(
+            columns=list(scaler.feature_names_in_),
+            fill_values=mean_imputer.mean_dict_,
+            category_tables=encoder.label_dict_,
+            missing_values={col: value for col, value in mode_imputer.mode_dict_.items() if col in encoder.label_dict_},
+            combine_columns=combiner.columnA,
+            log_columns=log_transform.numerical_features,
+            scale=scaler.scale_,
+            offset=scaler.min_,
+            coef=estimator.coef_,
+            intercept=estimator.intercept_,
+            classes=estimator.classes_,
+            clip=scaler.clip,
+            unknown_value=encoder.unknown_value,
+        )
+
+    def _build_index(self) -> None:
+        """Precompute the column positions and lookup tables used by the kernel."""
+        position = {col: index for index, col in enumerate(self.columns)}
+        self._fill_index = np.array([position[col] for col in self.fill_values if col in position], dtype=np.intp)
+        self._fill_array = np.array([self.fill_values[col] for col in self.fill_values if col in position], dtype=np.float64)
+        self._combine_index = np.array([position[col] for col in self.combine_columns if col in position], dtype=np.intp)
+        self._log_index = np.array([position[col] for col in self.log_columns if col in position], dtype=np.intp)
+
+        self._categories: dict = {}
+        for col, table in self.category_tables.items():
+            codes = np.array(list(table.values()), dtype=np.float64)
+            missing_code = table.get(self.missing_values.get(col), np.nan)
+            self._categories[col] = (pd.Index(list(table), dtype=object), codes, float(missing_code))
+
+        # Plain dict lookups for single records: (column, {category: code} or None, code of missing values)
+        self._record_plan: list[tuple] = [
+            (col, {value: float(code) for value, code in self.category_tables[col].items()}, self._categories[col][2])
+            if col in self._categories else (col, None, np.nan)
+            for col in self.columns
+        ]
+        self._local = threading.local()
+
+    def __getstate__(self) -> dict:
+        return {key: value for key, value in self.__dict__.items() if not key.startswith("_")}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._build_index()
+
+    @property
+    def n_features(self) -> int:
+        """Number of model input columns."""
+        return len(self.columns)
+
+    def shares_preprocessing(self, other: 'CompiledPipeline') -> bool:
+        """
+        Whether 'other' transforms any input into the same matrix, so that only the final
+        estimators of the two scorers differ.
+
+        Parameters
+        ----------
+        other : CompiledPipeline
+            Another compiled scorer.
+
+        Returns
+        -------
+        bool
+            True if every fitted preprocessing state is identical, column order included.
+        """
+        return (
+            self.columns == other.columns
+            and self.fill_values == other.fill_values
+            and self.category_tables == other.category_tables
+            and self.missing_values == other.missing_values
+            and self.combine_columns == other.combine_columns
+            and self.log_columns == other.log_columns
+            and np.array_equal(self.scale, other.scale)
+            and np.array_equal(self.offset, other.offset)
+            and self.clip == other.clip
+            and np.array_equal(self.unknown_value, other.unknown_value, equal_nan=True)
+        )
+
+    def encode_column(self, col: str, values) -> np.ndarray:
+        """
+        Impute and encode one categorical column into float64 codes.
+
+        Unseen categories are encoded as `unknown_value`, exactly like `CustomLabelEncoder`.
+        Category dtype columns are encoded through their categories only.
+
+        Parameters
+        ----------
+        col : str
+            Name of the categorical column.
+
+        values : array-like of shape (n_samples,)
+            Raw values of the column.
+
+        Returns
+        -------
+        numpy.ndarray of shape (n_samples,)
+            Encoded values.
+        """
+        categories, codes, missing_code = self._categories[col]
+        if isinstance(getattr(values, "dtype", None), pd.CategoricalDtype):
+            category_codes = self.encode_column(col=col, values=np.asarray(values.cat.categories, dtype=object))
+            value_codes = np.asarray(values.cat.codes)
+            return np.where(value_codes >= 0, category_codes[value_codes], missing_code)
+        values = np.asarray(values, dtype=object)
+        indexer = categories.get_indexer(values)
+        encoded = np.where(indexer >= 0, codes[indexer], self.unknown_value)
+        encoded[pd.isna(values)] = missing_code
+        return encoded
+
+    def record_to_matrix(self, record: Mapping, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Encode a single record into a one-row input matrix with plain Python lookups.
+
+        Parameters
+        ----------
+        record : mapping of str: Any
+            Feature values of one application. Missing keys, None, NaN and 'pd.NA' are imputed.
+
+        out : numpy.ndarray of shape (1, n_features), optional
+            Preallocated float64 buffer to fill instead of allocating a new matrix.
+
+        Returns
+        -------
+        numpy.ndarray of shape (1, n_features)
+            The float64 input matrix.
+        """
+        matrix = out if out is not None else np.empty((1, self.n_features), dtype=np.float64, order="F")
+        row = matrix[0]
+        for index, (col, code_map, missing_code) in enumerate(self._record_plan):
+            value = record.get(col)
+            # 'pd.NA', from nullable-dtype frames, has no truth value, so it is checked before comparing
+            if value is None or value is pd.NA or value != value:
+                row[index] = missing_code
+            elif code_map is not None:
+                row[index] = code_map.get(value, self.unknown_value)
+            else:
+                row[index] = value
+        return matrix
+
+    def to_matrix(self, data, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Assemble the raw model input matrix, with categorical columns already encoded.
+
+        Parameters
+        ----------
+        data : pandas.DataFrame or dict of str: array-like
+            Input data containing at least `columns`.
+
+        out : numpy.ndarray of shape (n_samples, n_features), optional
+            Preallocated float64 buffer to fill instead of allocating a new matrix.
+
+        Returns
+        -------
+        numpy.ndarray of shape (n_samples, n_features)
+            The float64 input matrix. Column-major, like the array sklearn builds from a
+            DataFrame, so the final dot product rounds exactly like the pipeline.
+        """
+        matrix = None
+        for index, col in enumerate(self.columns):
+            if col in self._categories:
+                values = self.encode_column(col=col, values=data[col])
+            else:
+                values = np.asarray(data[col], dtype=np.float64)
+            if matrix is None:
+                matrix = out if out is not None else np.empty((len(values), self.n_features), dtype=np.float64, order="F")
+            matrix[:, index] = values
+        return matrix
+
+    def transform_matrix(self, matrix: np.ndarray) -> np.ndarray:
+        """
+        Apply the numerical preprocessing steps in place on an input matrix.
+
+        Mean imputation, column combination, log transformation and min-max scaling are
+        replayed with the same floating point operations as the pipeline steps.
+
+        Parameters
+        ----------
+        matrix : numpy.ndarray of shape (n_samples, n_features)
+            Output of `to_matrix`. Modified in place.
+
+        Returns
+        -------
+        numpy.ndarray of shape (n_samples, n_features)
+            The scaled matrix fed to the estimator.
+        """
+        block = matrix[:, self._fill_index]
+        np.copyto(block, self._fill_array, where=np.isnan(block))
+        matrix[:, self._fill_index] = block
+
+        matrix[:, self._combine_index] += matrix[:, self._combine_index]
+
+        block = matrix[:, self._log_index]
+        block[(block == 0) | np.isinf(block)] = np.finfo(dtype=float).eps
+        matrix[:, self._log_index] = np.log(block)
+
+        matrix *= self.scale
+        matrix += self.offset
+        if self.clip:
+            np.clip(matrix, 0, 1, out=matrix)
+
+        if np.isnan(matrix).any():
+            raise ValueError(
+                "Input X contains NaN: unseen categories or invalid numerical values "
+                f"in columns {[col for col, bad in zip(self.columns, np.isnan(matrix).any(axis=0)) if bad]}"
+            )
+        return matrix
+
+    def predict_record(self, record: Mapping) -> tuple:
+        """
+        Score a single record on a preallocated per-thread buffer, without any DataFrame.
+
+        Parameters
+        ----------
+        record : mapping of str: Any
+            Feature values of one application.
+
+        Returns
+        -------
+        label : Any
+            Predicted label, taken from `classes`.
+
+        probability : float
+            Probability of the positive class `classes[1]`.
+        """
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._local.buffer = np.empty((1, self.n_features), dtype=np.float64, order="F")
+        matrix = self.transform_matrix(matrix=self.record_to_matrix(record=record, out=buffer))
+        score = matrix @ self.coef.T + self.intercept
+        return self.classes[int(score[0, 0] > 0)], float(expit(score[0, 0]))
+
+    def predict_records(self, records: Sequence[Mapping]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Score a list of records in one vectorized pass, without any DataFrame.
+
+        Parameters
+        ----------
+        records : sequence of mapping of str: Any
+            Feature values of each application.
+
+        Returns
+        -------
+        labels : numpy.ndarray of shape (n_records,)
+            Predicted labels, taken from `classes`.
+
+        probabilities : numpy.ndarray of shape (n_records,)
+            Probability of the positive class `classes[1]`.
+        """
+        data = {col: [None if (value := record.get(col)) is pd.NA else value for record in records] for col in self.columns}
+        matrix = self.transform_matrix(matrix=self.to_matrix(data=data))
+        scores = (matrix @ self.coef.T + self.intercept).reshape(-1)
+        return self.classes[(scores > 0).astype(int)], expit(scores)
+
+    def decision_function(self, data) -> np.ndarray:
+        """
+        Compute the logistic regression decision scores.
+
+        Parameters
+        ----------
+        data : pandas.DataFrame or dict of str: array-like
+            Input data containing at least `columns`.
+
+        Returns
+        -------
+        numpy.ndarray of shape (n_samples,)
+            Decision scores.
+        """
+        matrix = self.transform_matrix(matrix=self.to_matrix(data=data))
+        return (matrix @ self.coef.T + self.intercept).reshape(-1)
+
+    def contributions(self, data) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the contribution of each feature to the decision score, in one vectorized pass.
+
+        The contribution of a feature is its coefficient times its scaled value, so that the
+        decision score of a row is the sum of its contributions plus the intercept.
+
+        Parameters
+        ----------
+        data : pandas.DataFrame or dict of str: array-like
+            Input data containing at least `columns`.
+
+        Returns
+        -------
+        contributions : numpy.ndarray of shape (n_samples, n_features)
+            Contribution of each of `columns`; negative values push towards `classes[0]`.
+
+        scores : numpy.ndarray of shape (n_samples,)
+            Decision scores, identical to `decision_function`.
+        """
+        matrix = self.transform_matrix(matrix=self.to_matrix(data=data))
+        return matrix * self.coef, (matrix @ self.coef.T + self.intercept).reshape(-1)
+
+    def column_terms(self, col: str, values) -> np.ndarray:
+        """
+        Compute the term of one numerical column in the decision score, for each of 'values'.
+
+        Every preprocessing step transforms each column on its own, so the decision score of
+        a row is the intercept plus the sum of the terms of its columns, i.e. of its
+        'contributions'. Scores of rows that only differ in 'col' thus differ by its term.
+
+        Parameters
+        ----------
+        col : str
+            Name of a numerical column of `columns`.
+
+        values : array-like of shape (n_values,)
+            Raw values of the column; NaN values are imputed.
+
+        Returns
+        -------
+        numpy.ndarray of shape (n_values,)
+            Coefficient times the transformed value.
+        """
+        if col in self._categories:
+            raise ValueError(f"Terms are computed for numerical columns only, got: {col}")
+        index = self.columns.index(col)
+        values = np.asarray(values, dtype=np.float64).reshape(-1)
+        # The other columns are set to a value every step accepts, and ignored
+        matrix = np.ones((len(values), self.n_features), dtype=np.float64, order="F")
+        matrix[:, index] = values
+        return self.transform_matrix(matrix=matrix)[:, index] * self.coef[0, index]
+
+    def predict_proba(self, data) -> np.ndarray:
+        """
+        Compute class probabilities.
+
+        Parameters
+        ----------
+        data : pandas.DataFrame or dict of str: array-like
+            Input data containing at least `columns`.
+
+        Returns
+        -------
+        numpy.ndarray of shape (n_samples, 2)
+            Probability of each class in `classes`.
+        """
+        prob = expit(self.decision_function(data=data))
+        return np.vstack([1 - prob, prob]).T
+
+    def predict(self, data) -> np.ndarray:
+        """
+        Predict class labels.
+
+        Parameters
+        ----------
+        data : pandas.DataFrame or dict of str: array-like
+            Input data containing at least `columns`.
+
+        Returns
+        -------
+        numpy.ndarray of shape (n_samples,)
+            Predicted labels, taken from `classes`.
+        """
+        return self.classes[(self.decision_function(data=data) > 0).astype(int)]
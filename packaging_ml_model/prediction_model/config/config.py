@@ -13,6 +13,7 @@ TRAIN_FILE:str = "loan-train.csv"  # Name of the training dataset file
 TEST_FILE:str = "loan-test.csv"  # Name of the testing dataset file
 
 MODEL_NAME:str = "Classification.pkl"  # Name of the saved model file
+ARTIFACT_NAME:str = "Classification.artifact"  # Name of the saved model artifact, see 'artifact.save_artifact'
 SAVE_MODEL_PATH:str= os.path.join(PACKAGE_ROOT_PATH, "trained_models")  # Path to the directory where the trained model will be saved
 
 # Final features used in the Model
@@ -26,6 +27,70 @@ CAT_FEATURES:list[str] = ['Gender', 'Married', 'Dependents', 'Education', 'Self_
 
 TARGET_FEATURE:str = "Loan_Status"  # Target variable to predict
 
+ID_FEATURE:str = "Loan_ID"  # Unique identifier of each loan application
+
+# Explicit column dtypes, so that chunked reads never infer e.g. 'Dependents' as numbers
+FEATURE_DTYPES:dict[str, str] = {
+    'ApplicantIncome': 'float64', 'CoapplicantIncome': 'float64', 'LoanAmount': 'float64', 'Loan_Amount_Term': 'float64',
+    'Credit_History': 'float64', 'Gender': 'object', 'Married': 'object', 'Dependents': 'object', 'Education': 'object',
+    'Self_Employed': 'object', 'Property_Area': 'object', 'Loan_ID': 'object', 'Loan_Status': 'object'
+}
+
+# Memory-lean dtypes of the features, see 'processing.data_handling.compact_dtypes'. The pipeline keeps them up to
+# the estimator: categories are encoded to int8 codes, and float32 columns stay float32 through the log and scaling steps.
+COMPACT_DTYPES:dict[str, str] = {
+    'ApplicantIncome': 'float32', 'CoapplicantIncome': 'float32', 'LoanAmount': 'float32', 'Loan_Amount_Term': 'float32',
+    'Credit_History': 'category', 'Gender': 'category', 'Married': 'category', 'Dependents': 'category', 'Education': 'category',
+    'Self_Employed': 'category', 'Property_Area': 'category'
+}
+
+# Input schema of scoring requests, see 'processing.validation.validate_batch'. Missing values are allowed: the pipeline imputes them.
+NUMERIC_RANGES:dict[str, tuple[float, float]] = {
+    'ApplicantIncome': (0, 1e7), 'CoapplicantIncome': (0, 1e7), 'LoanAmount': (0, 1e5), 'Loan_Amount_Term': (1, 600)
+}
+ALLOWED_CATEGORIES:dict[str, list] = {
+    'Gender': ['Female', 'Male'], 'Married': ['No', 'Yes'], 'Dependents': ['0', '1', '2', '3+'],
+    'Education': ['Graduate', 'Not Graduate'], 'Self_Employed': ['No', 'Yes'], 'Credit_History': [0.0, 1.0],
+    'Property_Area': ['Rural', 'Semiurban', 'Urban']
+}
+
+BATCH_CHUNK_SIZE:int = 100_000  # Number of rows scored at once by batch prediction
+
+N_REASON_CODES:int = 4  # Number of adverse-action reasons returned for each application
+
+PREDICTION_CACHE_SIZE:int = 100_000  # Maximum number of predictions kept by the prediction cache
+
+# Scoring against a database, see 'sql_scoring.score_table'
+APPLICATIONS_TABLE:str = "loan_applications"  # Table the applications to score are read from
+PREDICTIONS_TABLE:str = "loan_predictions"  # Table the predictions are written to, created when missing
+SQL_POOL_SIZE:int = 2  # Connections kept open by 'sql_scoring.ConnectionPool': one to read, one to write
+
+# Model registry, see 'registry.ModelRegistry'
+REGISTRY_PATH:str = os.path.join(PACKAGE_ROOT_PATH, "registry")  # Directory of the versioned models and of the "current" pointer
+REGISTRY_POLL_SECONDS:float = 5.0  # How often long-running scorers check the "current" pointer for a new version
+REGISTRY_MAX_RETRY_SECONDS:float = 300.0  # Longest wait before retrying a version that failed to load; waits double from the poll interval
+
+# Experiment tracking, see 'tracking.ExperimentTracker'
+TRACKING_PATH:str = os.path.join(PACKAGE_ROOT_PATH.parent, "mlruns")  # Local store of the training runs, in the layout of MLflow's file store
+EXPERIMENT_NAME:str = "Loan Eligibility"  # Experiment the training runs are recorded in
+TRACK_TRAINING_RUNS:bool = True  # Whether 'training_pipeline' records every training run, see its '--no-track' flag
+TRACKING_REPEAT:int = 1  # Timed repetitions of the test set scoring, the best one is recorded; 0 skips the scoring
+
+# Hyperparameter search, see 'training_pipeline.search_pipeline'
+CV_FOLDS:int = 5  # Number of cross-validation folds per candidate
+SEARCH_SCORING:str = "roc_auc"  # Metric the candidates are ranked by
+SEARCH_N_JOBS:int = -1  # Number of candidates and folds fitted in parallel, -1 for all cores
+
+INCREMENTAL_EPOCHS:int = 5  # Passes of the final estimator over the data in out-of-core training
+DRIFT_TOLERANCE:float = 0.05  # Relative change of a fitted mean or range reported as drift by incremental retraining
+
+# Scoring server
+SERVER_HOST:str = "127.0.0.1"  # Interface the scoring server listens on
+SERVER_PORT:int = 8000  # Port the scoring server listens on
+BATCH_WINDOW_MS:float = 2.0  # How long single-record requests are gathered before scoring them together
+MAX_BATCH_SIZE:int = 256  # Maximum number of single-record requests scored together
+MAX_QUEUE_DEPTH:int = 4096  # Maximum number of queued single-record requests before rejecting new ones
+
 # Features that we need to Encode
 FEATURES_TO_ENCODE:list[str] = ['Gender', 'Married', 'Dependents', 'Education', 'Self_Employed', 'Credit_History', 'Property_Area']
 
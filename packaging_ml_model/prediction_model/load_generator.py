@@ -0,0 +1,104 @@
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from prediction_model.config import config
+from prediction_model.processing.data_handling import load_dataset
+
+def load_records(filename: str = config.TEST_FILE) -> list[dict]:
+    """Load a dataset as JSON-serializable records of 'config.FEATURES', with None for missing values."""
+    data = load_dataset(filename=filename)[config.FEATURES]
+    data = data.astype(object).where(data.notna(), None)
+    return data.to_dict(orient="records")
+
+async def _client(host: str, port: int, path: str, bodies: list[bytes], n_requests: int,
+                  counter: list[int], latencies: list[float], errors: list[int]) -> None:
+    reader, writer = await asyncio.open_connection(host=host, port=port)
+    try:
+        while counter[0] < n_requests:
+            index = counter[0]
+            counter[0] += 1
+            body = bodies[index % len(bodies)]
+            start = time.perf_counter()
+            writer.write(f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            await reader.readexactly(int(headers["content-length"]))
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+async def run_load(host: str = config.SERVER_HOST, port: int = config.SERVER_PORT, n_requests: int = 10_000,
+                   concurrency: int = 64, batch_size: int = 1) -> dict:
+    """
+    Send requests to a running scoring server from 'concurrency' keep-alive connections.
+
+    Parameters
+    ----------
+    host, port : str, int
+        Address of the scoring server.
+
+    n_requests : int, default=10_000
+        Total number of requests to send.
+
+    concurrency : int, default=64
+        Number of concurrent connections, each with one request in flight.
+
+    batch_size : int, default=1
+        1 sends single records to '/predict'; larger values send lists of records to '/predict/batch'.
+
+    Returns
+    -------
+    dict
+        Requests, records and errors counts, throughput and p50/p99/max latencies in milliseconds.
+    """
+    records = load_records()
+    if batch_size == 1:
+        path, bodies = "/predict", [json.dumps(record).encode() for record in records]
+    else:
+        path = "/predict/batch"
+        bodies = [json.dumps([records[(i + j) % len(records)] for j in range(batch_size)]).encode()
+                  for i in range(0, len(records), batch_size)]
+
+    counter, latencies, errors = [0], [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, path, bodies, n_requests, counter, latencies, errors)
+                           for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies_ms = np.array(latencies) * 1e3
+    return {
+        "requests": len(latencies),
+        "records": len(latencies) * batch_size,
+        "errors": len(errors),
+        "seconds": elapsed,
+        "requests_per_s": len(latencies) / elapsed,
+        "records_per_s": len(latencies) * batch_size / elapsed,
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p99_ms": float(np.percentile(latencies_ms, 99)),
+        "max_ms": float(latencies_ms.max()),
+    }
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure throughput and latency of a running scoring server.")
+    parser.add_argument("--host", default=config.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=config.SERVER_PORT)
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=1, help="records per request, >1 uses /predict/batch")
+    args = parser.parse_args(argv)
+    stats = asyncio.run(run_load(host=args.host, port=args.port, n_requests=args.requests,
+                                 concurrency=args.concurrency, batch_size=args.batch_size))
+    print(json.dumps(stats, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import threading
+from collections.abc import Callable
+from typing import TYPE_CHECKING, NamedTuple
+
+from prediction_model.config import config
+
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
+
+    from prediction_model.compiled_pipeline import CompiledPipeline
+
+class LoadedModel(NamedTuple):
+    """
+    One loaded model. It is published and replaced as a whole, so a request that holds it
+    always scores with a pipeline, compiled scorer and fingerprint that belong together.
+    """
+    pipeline: 'Pipeline'
+    compiled: 'CompiledPipeline'
+    fingerprint: str
+    source: str
+
+def read_model(pipeline_to_load: str) -> LoadedModel:
+    """
+    Load a saved pipeline or model artifact and compile it.
+
+    Parameters
+    ----------
+    pipeline_to_load : str
+        The name of the saved model in 'config.SAVE_MODEL_PATH', or an absolute path.
+        Model artifacts saved by 'artifact.save_artifact' are mapped instead of unpickled.
+
+    Returns
+    -------
+    LoadedModel
+        The loaded model.
+    """
+    from prediction_model.artifact import is_artifact, load_artifact
+    from prediction_model.compiled_pipeline import CompiledPipeline
+    from prediction_model.pipeline import set_single_copy
+    from prediction_model.processing.data_handling import get_pipeline_fingerprint, load_pipeline
+
+    fingerprint = get_pipeline_fingerprint(pipeline_to_load=pipeline_to_load)
+    if is_artifact(artifact_name=pipeline_to_load):
+        artifact = load_artifact(artifact_name=pipeline_to_load)
+        pipeline = set_single_copy(pipeline=artifact.to_pipeline())
+        compiled = artifact.to_compiled()
+    else:
+        pipeline = set_single_copy(pipeline=load_pipeline(pipeline_to_load=pipeline_to_load))
+        compiled = CompiledPipeline.from_pipeline(pipeline=pipeline)
+    return LoadedModel(pipeline=pipeline, compiled=compiled, fingerprint=fingerprint, source=pipeline_to_load)
+
+def warm_model(loaded: LoadedModel) -> None:
+    """Score one record through both scoring paths of 'loaded', to pay first-call overheads."""
+    import pandas as pd
+
+    # An all-missing record goes through every imputation and encoding branch
+    record = pd.DataFrame({col: [float("nan")] for col in config.FEATURES})
+    loaded.pipeline.predict(X=record)
+    loaded.compiled.predict(data=record)
+
+class ModelLoader:
+    """
+    Thread-safe, lazily loaded singleton holder for a saved pipeline.
+
+    Nothing is unpickled, and neither sklearn nor pandas is imported, until the pipeline
+    is first requested. Concurrent first requests load the model exactly once.
+
+    The loaded model can be replaced while requests are being scored, see 'swap': callers
+    that need several parts of the model read the 'current' snapshot once.
+
+    Parameters
+    ----------
+    pipeline_to_load : str, default=config.MODEL_NAME
+        The name of the saved Pipeline object to load from 'config.SAVE_MODEL_PATH', or an absolute path.
+        Model artifacts saved by 'artifact.save_artifact' are mapped instead of unpickled.
+
+    Attributes
+    ----------
+    load_hooks : list of callable
+        Called with each newly loaded model before it is served, e.g. to profile its steps.
+    """
+    def __init__(self, pipeline_to_load: str = config.MODEL_NAME) -> None:
+        self.pipeline_to_load: str = pipeline_to_load
+        self.load_hooks: list[Callable[[LoadedModel], None]] = []
+        self._lock = threading.Lock()
+        self._model: LoadedModel | None = None
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the pipeline has been loaded."""
+        return self._model is not None
+
+    def _load(self) -> None:
+        """Load the pipeline and compile it. Must be called with the lock held."""
+        loaded = read_model(pipeline_to_load=self.pipeline_to_load)
+        for hook in self.load_hooks:
+            hook(loaded)
+        self._model = loaded
+
+    def _ensure_loaded(self) -> None:
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._load()
+
+    @property
+    def current(self) -> LoadedModel:
+        """The loaded model, loaded on first access. Unaffected by later swaps."""
+        self._ensure_loaded()
+        return self._model
+
+    @property
+    def pipeline(self) -> 'Pipeline':
+        """The loaded scikit-learn Pipeline, loaded on first access."""
+        return self.current.pipeline
+
+    @property
+    def compiled(self) -> 'CompiledPipeline':
+        """The compiled NumPy scorer of the loaded pipeline, loaded on first access."""
+        return self.current.compiled
+
+    @property
+    def fingerprint(self) -> str:
+        """SHA-256 digest of the loaded model file, loaded on first access."""
+        return self.current.fingerprint
+
+    def warmup(self) -> None:
+        """
+        Load the pipeline now and score one record through both scoring paths, so that the
+        first real request does not pay for unpickling, imports or first-call overheads.
+        """
+        warm_model(loaded=self.current)
+
+    def reload(self) -> None:
+        """Load the pipeline again from disk, e.g. after it has been retrained."""
+        with self._lock:
+            self._load()
+
+    def swap(self, pipeline_to_load: str, warm: bool = True) -> LoadedModel:
+        """
+        Load another model and atomically replace the served one with it.
+
+        The new model is loaded and warmed before it is published, while requests keep being
+        scored with the current one. Requests in flight finish with the model they started with.
+        If loading fails, the exception is raised and the current model stays in place.
+
+        Parameters
+        ----------
+        pipeline_to_load : str
+            The name of the saved model in 'config.SAVE_MODEL_PATH', or an absolute path.
+
+        warm : bool, default=True
+            Score one record with the new model before publishing it.
+
+        Returns
+        -------
+        LoadedModel
+            The newly served model.
+        """
+        loaded = read_model(pipeline_to_load=pipeline_to_load)
+        if warm:
+            warm_model(loaded=loaded)
+        for hook in self.load_hooks:
+            hook(loaded)
+        with self._lock:
+            self.pipeline_to_load, self._model = pipeline_to_load, loaded
+        return loaded
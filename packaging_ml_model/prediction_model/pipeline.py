@@ -5,7 +5,32 @@ from sklearn.linear_model import LogisticRegression
 from prediction_model.config import config
 from prediction_model.processing import data_preprocessing as data_pp
 
-classification_pipeline = Pipeline(
+def set_single_copy(pipeline: Pipeline) -> Pipeline:
+    """
+    Let only the first preprocessing step copy its input.
+
+    Every later step with a 'copy' parameter then works in place on that private copy, so
+    the caller's DataFrame is never modified but each batch is copied once instead of once
+    per step.
+
+    Parameters
+    ----------
+    pipeline : Pipeline
+        The pipeline to configure, modified in place.
+
+    Returns
+    -------
+    Pipeline
+        The configured pipeline.
+    """
+    first_copy: bool = True
+    for _, step in pipeline.steps[:-1]:
+        if "copy" in step.get_params(deep=False):
+            step.set_params(copy=first_copy)
+            first_copy = False
+    return pipeline
+
+classification_pipeline = set_single_copy(Pipeline(
     steps= [
         ("MeanImputation", data_pp.MeanImputer(numerical_features=config.NUM_FEATURES)),
         ("ModeImputation", data_pp.ModeImputer(categorical_features=config.CAT_FEATURES)),
@@ -16,7 +41,7 @@ classification_pipeline = Pipeline(
         ("MinMaxScaling", MinMaxScaler()),
         ("LogisticRegression", LogisticRegression(random_state=0))
     ]
-)
+))
 
 """
 A machine learning pipeline for classification tasks.
@@ -30,4 +55,6 @@ The pipeline performs the following steps:
 6. Applies logarithmic transformations to numerical features with a positively skewed distribution.
 7. Scales numerical features to a fixed range using Min-Max scaling.
 8. Trains a logistic regression model on the preprocessed data.
+
+Only the first step copies the input; the following steps transform that copy in place.
 """
\ No newline at end of file
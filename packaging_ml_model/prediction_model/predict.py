@@ -1,22 +1,280 @@
-import os
-import pdb
-import numpy as np
-import pandas as pd
-from sklearn.pipeline import Pipeline
-
+from .cache import PredictionCache, frame_keys, record_key
 from .config import config
-from .processing.data_handling import load_pipeline, load_dataset
+from .model_loader import ModelLoader
+
+# The model is loaded lazily, on first use, so importing this module stays cheap.
+# numpy, pandas and sklearn are likewise imported only when a prediction is made.
+model:ModelLoader = ModelLoader(pipeline_to_load=config.MODEL_NAME)
+
+# Optional cache in front of every prediction function, see 'enable_cache'
+prediction_cache:PredictionCache | None = None
+
+def __getattr__(name: str):
+    # Lazy module attributes: 'classification_pipeline' and 'compiled_pipeline'
+    if name == "classification_pipeline":
+        return model.pipeline
+    if name == "compiled_pipeline":
+        return model.compiled
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def warmup() -> None:
+    """Load the model and run one prediction ahead of the first request."""
+    model.warmup()
+
+def reload() -> None:
+    """Load the model again from 'config.SAVE_MODEL_PATH'."""
+    model.reload()
+
+def follow_registry(registry_path:str=config.REGISTRY_PATH, poll_interval:float=config.REGISTRY_POLL_SECONDS):
+    """
+    Serve the current version of a model registry, and hot-swap to each newly promoted one.
+
+    Parameters
+    ----------
+    registry_path : str, default=config.REGISTRY_PATH
+        Directory of the registry, see 'registry.ModelRegistry'.
+
+    poll_interval : float, default=config.REGISTRY_POLL_SECONDS
+        Seconds between two checks of the "current" pointer.
+
+    Returns
+    -------
+    registry.RegistryWatcher
+        The started watcher; call its 'stop' to keep the served model from then on.
+    """
+    from .registry import ModelRegistry, RegistryWatcher
+
+    return RegistryWatcher(loader=model, registry=ModelRegistry(root=registry_path), poll_interval=poll_interval).start()
+
+def enable_cache(max_size:int=config.PREDICTION_CACHE_SIZE, ttl:float|None=None) -> PredictionCache:
+    """
+    Cache predictions by feature values, so that re-scored applications skip the model.
+
+    Entries are tied to the fingerprint of the loaded model file and dropped as soon as a
+    different model is loaded.
 
-classification_pipeline:Pipeline = load_pipeline(pipeline_to_load=config.MODEL_NAME)
+    Parameters
+    ----------
+    max_size : int, default=config.PREDICTION_CACHE_SIZE
+        Maximum number of cached predictions, evicted least recently used first.
+
+    ttl : float, optional
+        Time to live of a cached prediction, in seconds.
+
+    Returns
+    -------
+    PredictionCache
+        The new cache, e.g. to read its 'stats()'.
+    """
+    global prediction_cache
+    prediction_cache = PredictionCache(max_size=max_size, ttl=ttl)
+    return prediction_cache
+
+def disable_cache() -> None:
+    """Stop caching predictions and drop the cache."""
+    global prediction_cache
+    prediction_cache = None
+
+def _cached_frame_predictions(data, compiled:bool) -> tuple:
+    """Labels and probabilities of each row of 'data', scoring only the cache misses.
+
+    Cached values are (label, probability) pairs, shared with 'predict_one' and 'predict_many'.
+    """
+    import numpy as np
+    from scipy.special import expit
+
+    # One snapshot of the model, so that a concurrent swap cannot mix two models in one call
+    current = model.current
+    cache, fingerprint = prediction_cache, current.fingerprint
+    keys = frame_keys(data=data)
+    results = cache.get_many(keys=keys, fingerprint=fingerprint)
+    misses = [index for index, result in enumerate(results) if result is None]
+    if misses:
+        rows = data.iloc[misses]
+        if compiled:
+            scores = current.compiled.decision_function(data=rows)
+        else:
+            scores = current.pipeline.decision_function(X=rows[config.FEATURES])
+        labels = current.compiled.classes[(scores > 0).astype(int)]
+        scored = list(zip(labels.tolist(), expit(scores).tolist()))
+        cache.put_many(items=zip([keys[index] for index in misses], scored), fingerprint=fingerprint)
+        for index, result in zip(misses, scored):
+            results[index] = result
+    return np.array([label for label, _ in results]), np.array([p for _, p in results], dtype=float)
+
+def generate_prediction(data_input, compiled:bool=False) -> dict:
+    import numpy as np
+    import pandas as pd
 
-def generate_prediction(data_input) -> dict:
     data = pd.DataFrame(data_input)
-    y_pred = classification_pipeline.predict(X=data[config.FEATURES])
+    if prediction_cache is not None:
+        y_pred, _ = _cached_frame_predictions(data=data, compiled=compiled)
+    elif compiled:
+        y_pred = model.compiled.predict(data=data)
+    else:
+        y_pred = model.pipeline.predict(X=data[config.FEATURES])
     output = np.where(y_pred==1, "Y", "N")
     return {
         "prediction": output
     }
 
+def predict_one(record:dict) -> dict:
+    """
+    Low-latency prediction for a single application, without building a DataFrame.
+
+    Parameters
+    ----------
+    record : dict
+        Feature values of one application, keyed by the names in 'config.FEATURES'.
+        Missing keys, None and NaN values are imputed like in the pipeline.
+
+    Returns
+    -------
+    dict
+        The 'Y'/'N' "prediction" and the approval "probability".
+    """
+    if prediction_cache is not None:
+        current = model.current
+        key, fingerprint = record_key(record=record), current.fingerprint
+        (result,) = prediction_cache.get_many(keys=[key], fingerprint=fingerprint)
+        if result is None:
+            result = current.compiled.predict_record(record=record)
+            prediction_cache.put_many(items=[(key, result)], fingerprint=fingerprint)
+        label, probability = result
+    else:
+        label, probability = model.compiled.predict_record(record=record)
+    return {
+        "prediction": "Y" if label == 1 else "N",
+        "probability": probability
+    }
+
+def predict_many(records:list[dict]) -> dict:
+    """
+    Predict a list of applications in one vectorized pass, without building a DataFrame.
+
+    Parameters
+    ----------
+    records : list of dict
+        Feature values of each application, see 'predict_one'.
+
+    Returns
+    -------
+    dict
+        Arrays of 'Y'/'N' "prediction" and approval "probability", in the order of 'records'.
+    """
+    import numpy as np
+
+    if prediction_cache is not None:
+        current = model.current
+        fingerprint = current.fingerprint
+        keys = [record_key(record=record) for record in records]
+        results = prediction_cache.get_many(keys=keys, fingerprint=fingerprint)
+        misses = [index for index, result in enumerate(results) if result is None]
+        if misses:
+            labels, probabilities = current.compiled.predict_records(records=[records[index] for index in misses])
+            scored = list(zip(labels.tolist(), probabilities.tolist()))
+            prediction_cache.put_many(items=zip([keys[index] for index in misses], scored), fingerprint=fingerprint)
+            for index, result in zip(misses, scored):
+                results[index] = result
+        labels = np.array([label for label, _ in results])
+        probabilities = np.array([p for _, p in results], dtype=float)
+    else:
+        labels, probabilities = model.compiled.predict_records(records=records)
+    return {
+        "prediction": np.where(labels==1, "Y", "N"),
+        "probability": probabilities
+    }
+
+def explain_predictions(data_input, n_reasons:int=config.N_REASON_CODES) -> dict:
+    """
+    Probabilities, per-feature contributions and adverse-action reasons, for a batch of applications.
+
+    Everything is computed in one vectorized pass over the transformed matrix of the
+    compiled scorer: the contribution of a feature is its coefficient times its scaled value,
+    and the reasons of an application are its features with the most negative contributions,
+    i.e. those that lowered its approval probability the most.
+
+    Parameters
+    ----------
+    data_input : pandas.DataFrame or dict of str: array-like
+        Input data containing at least 'config.FEATURES'.
+
+    n_reasons : int, default=config.N_REASON_CODES
+        Number of reasons returned per application.
+
+    Returns
+    -------
+    dict
+        "prediction": 'Y'/'N' array, "probability": approval probability array,
+        "contributions": DataFrame of the contribution of each model column, and
+        "reasons": array of shape (n_samples, n_reasons) with the names of the most adverse
+        features, worst first, or None where fewer features had a negative contribution.
+    """
+    import numpy as np
+    import pandas as pd
+    from scipy.special import expit
+
+    compiled = model.compiled
+    contributions, scores = compiled.contributions(data=data_input)
+    order = np.argsort(contributions, axis=1, kind="stable")[:, :n_reasons]
+    reasons = np.asarray(compiled.columns, dtype=object)[order]
+    reasons[np.take_along_axis(contributions, order, axis=1) >= 0] = None
+    index = data_input.index if isinstance(data_input, pd.DataFrame) else None
+    return {
+        "prediction": np.where(compiled.classes[(scores > 0).astype(int)]==1, "Y", "N"),
+        "probability": expit(scores),
+        "contributions": pd.DataFrame(contributions, columns=compiled.columns, index=index),
+        "reasons": reasons
+    }
+
+def shadow_predictions(data_input, challengers:dict):
+    """
+    Score applications with the served model and its challengers, sharing their preprocessing.
+
+    Parameters
+    ----------
+    data_input : pandas.DataFrame or dict of str: array-like
+        Input data containing at least 'config.FEATURES'.
+
+    challengers : dict of str: CompiledPipeline
+        Compiled scorers of the challengers, by name, e.g. from 'model_loader.read_model'.
+
+    Returns
+    -------
+    shadow.ShadowResult
+        Probabilities and predictions of the "champion", the served model, and of each
+        challenger; its 'disagreement()' compares them.
+    """
+    from .shadow import ShadowScorer
+
+    scorer = ShadowScorer(models={"champion": model.compiled, **challengers}, champion="champion")
+    return scorer.score(data=data_input)
+
+def what_if_offers(data_input, amounts, terms):
+    """
+    Approval probability of each application for a grid of loan amounts and terms.
+
+    Parameters
+    ----------
+    data_input : pandas.DataFrame or dict of str: array-like
+        Input data containing at least 'config.FEATURES'.
+
+    amounts : array-like
+        Candidate 'LoanAmount' values.
+
+    terms : array-like
+        Candidate 'Loan_Amount_Term' values.
+
+    Returns
+    -------
+    scenarios.OfferSurface
+        The approval surface; its 'max_approvable_amount()' gives the largest approved
+        amount of the grid per application and term.
+    """
+    from .scenarios import score_offer_grid
+
+    return score_offer_grid(compiled=model.compiled, data_input=data_input, amounts=amounts, terms=terms)
+
 # def generate_prediction() -> None:
 #     test_data:pd.DataFrame = load_dataset(filename=config.TEST_FILE)
 #     y_pred = classification_pipeline.predict(X=test_data[config.FEATURES])
@@ -24,5 +282,7 @@ def generate_prediction(data_input) -> dict:
 #     print(output)
 
 if __name__ == "__main__":
-    data_csv_path:str=os.path.join(config.DATA_PATH,config.TEST_FILE)
-    generate_prediction(data_input=data_csv_path)
+    from .processing.data_handling import load_dataset
+
+    test_data = load_dataset(filename=config.TEST_FILE)
+    print(generate_prediction(data_input=test_data))
@@ -1,6 +1,9 @@
 # Functions required to Load the dataset
 # Functions required to Save the Trained ML Model
+import hashlib
 import os
+from collections.abc import Iterator
+
 import joblib
 
 import pandas as pd
@@ -8,14 +11,85 @@ from sklearn.pipeline import Pipeline
 
 from prediction_model.config import config
 
-def load_dataset(filename: str) -> pd.DataFrame:
+COLUMNAR_FORMATS:dict[str, str] = {".parquet": "parquet", ".pq": "parquet", ".feather": "arrow", ".arrow": "arrow", ".ipc": "arrow"}
+
+def get_file_format(filepath: str) -> str:
+    """
+    Detect the format of a dataset file from its extension.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the dataset file.
+
+    Returns
+    -------
+    str
+        "parquet", "arrow" (Feather V2 / Arrow IPC file) or "csv" for any other extension.
+    """
+    return COLUMNAR_FORMATS.get(os.path.splitext(filepath)[1].lower(), "csv")
+
+def import_pyarrow():
+    """Import the optional 'pyarrow' dependency needed for columnar formats."""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "Reading and writing Parquet/Feather/Arrow IPC files requires 'pyarrow': "
+            "pip install 'prediction_model[columnar]'"
+        ) from e
+    return pyarrow
+
+def _project(available: list[str], columns: list[str] | None) -> list[str] | None:
+    """Keep the requested columns that exist in the file, in file order."""
+    return None if columns is None else [col for col in available if col in columns]
+
+def compact_dtypes(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Downcast the feature columns of a dataset to the memory-lean dtypes of 'config.COMPACT_DTYPES'.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        The dataset; columns without a compact dtype are kept as they are.
+
+    Returns
+    -------
+    pd.DataFrame
+        The dataset with category columns for the categorical features and float32 columns
+        for the incomes and loan fields.
+    """
+    return data.astype({col: dtype for col, dtype in config.COMPACT_DTYPES.items() if col in data.columns})
+
+def _compact_csv_dtypes() -> dict[str, str]:
+    """Dtypes to parse CSV columns with directly in their compact dtype.
+
+    'read_csv' parses categories as strings, so only the string features are read as categories;
+    the others, e.g. the 0/1 'Credit_History', are converted by 'compact_dtypes' once parsed.
+    """
+    return {**config.FEATURE_DTYPES, **{col: dtype for col, dtype in config.COMPACT_DTYPES.items()
+                                        if dtype != "category" or config.FEATURE_DTYPES.get(col) == "object"}}
+
+def load_dataset(filename: str, columns: list[str] | None = None, compact: bool = False) -> pd.DataFrame:
     """
     Load either Train or Test dataset based on 'filename'.
 
+    CSV, Parquet and Feather/Arrow IPC files are supported, based on the file extension.
+    Columnar files are memory-mapped and only the requested columns are read.
+
     Parameters
     ----------
     filename : str
-        The name of the dataset file to be loaded.
+        The name of the dataset file to be loaded, relative to 'config.DATA_PATH', or an absolute path.
+
+    columns : list of str, optional
+        Columns to read, e.g. 'config.FEATURES' and the target. Columns missing from the
+        file are skipped. All columns are read when None.
+
+    compact : bool, default=False
+        Read the features with the memory-lean dtypes of 'config.COMPACT_DTYPES'.
 
     Returns
     -------
@@ -23,8 +97,108 @@ def load_dataset(filename: str) -> pd.DataFrame:
         The loaded dataset as a pandas DataFrame.
     """
     filepath: str = os.path.join(config.DATA_PATH, filename)
-    _data: pd.DataFrame = pd.read_csv(filepath_or_buffer=filepath)
-    return _data
+    file_format: str = get_file_format(filepath=filepath)
+    if file_format == "csv":
+        usecols = None if columns is None else (lambda col: col in columns)
+        dtype = _compact_csv_dtypes() if compact else None
+        _data: pd.DataFrame = pd.read_csv(filepath_or_buffer=filepath, usecols=usecols, dtype=dtype)
+        return compact_dtypes(data=_data) if compact else _data
+
+    pa = import_pyarrow()
+    if file_format == "parquet":
+        parquet_file = pa.parquet.ParquetFile(filepath, memory_map=True)
+        table = parquet_file.read(columns=_project(available=parquet_file.schema_arrow.names, columns=columns))
+        _data = table.to_pandas()
+        return compact_dtypes(data=_data) if compact else _data
+
+    with pa.memory_map(filepath) as source:
+        table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select(_project(available=table.column_names, columns=columns))
+        _data = table.to_pandas()
+    return compact_dtypes(data=_data) if compact else _data
+
+def iter_dataset_chunks(filepath: str, chunksize: int = config.BATCH_CHUNK_SIZE, columns: list[str] | None = None,
+                        compact: bool = False) -> Iterator[pd.DataFrame]:
+    """
+    Lazily read a dataset in chunks of at most 'chunksize' rows.
+
+    Only one chunk is held in memory at a time, so arbitrarily large files can be
+    processed with bounded memory. CSV, Parquet and Feather/Arrow IPC files are
+    supported, based on the file extension.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the file to read.
+
+    chunksize : int, default=config.BATCH_CHUNK_SIZE
+        Maximum number of rows per chunk.
+
+    columns : list of str, optional
+        Columns to keep. Columns missing from the file are skipped. All columns are
+        read when None.
+
+    compact : bool, default=False
+        Read the features with the memory-lean dtypes of 'config.COMPACT_DTYPES'.
+
+    Yields
+    ------
+    pd.DataFrame
+        The next chunk of the dataset. CSV files are read with the dtypes in 'config.FEATURE_DTYPES'.
+    """
+    if compact:
+        for chunk in iter_dataset_chunks(filepath=filepath, chunksize=chunksize, columns=columns):
+            yield compact_dtypes(data=chunk)
+        return
+    file_format: str = get_file_format(filepath=filepath)
+    if file_format == "csv":
+        usecols = None if columns is None else (lambda col: col in columns)
+        with pd.read_csv(filepath_or_buffer=filepath, chunksize=chunksize, usecols=usecols, dtype=config.FEATURE_DTYPES) as reader:
+            yield from reader
+        return
+
+    pa = import_pyarrow()
+    if file_format == "parquet":
+        parquet_file = pa.parquet.ParquetFile(filepath, memory_map=True)
+        projection = _project(available=parquet_file.schema_arrow.names, columns=columns)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=projection):
+            yield batch.to_pandas()
+        return
+
+    with pa.memory_map(filepath) as source:
+        reader = pa.ipc.open_file(source)
+        projection = _project(available=reader.schema.names, columns=columns)
+        for index in range(reader.num_record_batches):
+            batch = reader.get_batch(index)
+            if projection is not None:
+                batch = batch.select(projection)
+            for offset in range(0, batch.num_rows, chunksize):
+                yield batch.slice(offset, chunksize).to_pandas()
+
+def write_dataset(data: pd.DataFrame, filepath: str) -> None:
+    """
+    Write a dataset in the format given by the extension of 'filepath'.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        The dataset to write.
+
+    filepath : str
+        Path to the CSV, Parquet or Feather/Arrow IPC file to write.
+    """
+    file_format: str = get_file_format(filepath=filepath)
+    if file_format == "csv":
+        data.to_csv(filepath, index=False)
+        return
+    pa = import_pyarrow()
+    table = pa.Table.from_pandas(data, preserve_index=False)
+    if file_format == "parquet":
+        pa.parquet.write_table(table, filepath)
+    else:
+        with pa.OSFile(filepath, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
 
 def save_pipeline(pipeline_to_save) -> None:
     """
@@ -64,4 +238,39 @@ def load_pipeline(pipeline_to_load: str) -> Pipeline:
     print(f"Model has been loaded: {pipeline_to_load}")
     return loaded_model
 
+def get_file_fingerprint(filepath: str) -> str:
+    """
+    Fingerprint a file by its content, e.g. the dataset a model was trained on.
 
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+
+    Returns
+    -------
+    str
+        The SHA-256 hex digest of the file.
+    """
+    with open(filepath, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+def get_pipeline_fingerprint(pipeline_to_load: str) -> str:
+    """
+    Fingerprint a saved Pipeline object by the content of its file.
+
+    Two files with the same fingerprint hold the same fitted model, whatever their name
+    or modification time.
+
+    Parameters
+    ----------
+    pipeline_to_load : str
+        The name of the saved Pipeline object.
+
+    Returns
+    -------
+    str
+        The SHA-256 hex digest of the saved file.
+    """
+    savepath: str = os.path.join(config.SAVE_MODEL_PATH, pipeline_to_load)
+    return get_file_fingerprint(filepath=savepath)
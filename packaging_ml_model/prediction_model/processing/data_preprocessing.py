@@ -6,6 +6,10 @@ from sklearn.base import BaseEstimator, TransformerMixin
 
 from prediction_model.config import config
 
+def _in_column_dtype(value, column: pd.Series):
+    """'value' in the float dtype of 'column', so that filling a float32 column does not upcast it to float64."""
+    return column.dtype.type(value) if pd.api.types.is_float_dtype(column.dtype) else value
+
 class MeanImputer(BaseEstimator, TransformerMixin):
     """
     Custom Data Transformer for Imputing Missing Values in Numerical Features.
@@ -19,13 +23,23 @@ class MeanImputer(BaseEstimator, TransformerMixin):
         List of column names in the input data that should be treated as numerical
         features and imputed using this transformer.
 
+    copy : bool, default=True
+        If False, impute in place on the input DataFrame instead of on a copy.
+
     Attributes
     ----------
     mean_dict_ : dict of str: float
         Dictionary containing the mean values for each numerical feature.
+
+    sum_dict_, count_dict_ : dict of str: float, dict of str: int
+        Sum and number of non-missing values of each numerical feature, learned by 'fit' and
+        accumulated by 'partial_fit'.
     """
-    def __init__(self, numerical_features: list[str]) -> None:
+    copy: bool = True  # Class-level default for transformers unpickled from before 'copy' existed
+
+    def __init__(self, numerical_features: list[str], copy: bool = True) -> None:
         self.numerical_features: list[str] = numerical_features
+        self.copy: bool = copy
         super().__init__()
 
     def fit(self, X, y=None) -> 'MeanImputer':
@@ -46,8 +60,43 @@ class MeanImputer(BaseEstimator, TransformerMixin):
             The fitted transformer object.
         """
         self.mean_dict_ = {}
+        self.sum_dict_ = {}
+        self.count_dict_ = {}
         for col in self.numerical_features:
             self.mean_dict_[col] = X[col].mean()
+            # Sufficient statistics, so that 'partial_fit' can later add new data to this fit
+            self.sum_dict_[col] = float(X[col].sum())
+            self.count_dict_[col] = int(X[col].count())
+        return self
+
+    def partial_fit(self, X, y=None) -> 'MeanImputer':
+        """
+        Update the mean values with one more chunk of data.
+
+        Only the sum and count of each feature are kept, so the means of a dataset streamed
+        in chunks are those 'fit' would learn on the whole dataset.
+
+        Parameters
+        ----------
+        X : pandas.DataFrame of shape (n_samples, n_features)
+            The next chunk of the input data.
+
+        y : None
+            Ignored in this transformer.
+
+        Returns
+        -------
+        self : MeanImputer
+            The updated transformer object.
+        """
+        if not hasattr(self, "count_dict_"):
+            self.sum_dict_ = {col: 0.0 for col in self.numerical_features}
+            self.count_dict_ = {col: 0 for col in self.numerical_features}
+        self.mean_dict_ = {}
+        for col in self.numerical_features:
+            self.sum_dict_[col] += float(X[col].sum())
+            self.count_dict_[col] += int(X[col].count())
+            self.mean_dict_[col] = self.sum_dict_[col] / self.count_dict_[col] if self.count_dict_[col] else np.nan
         return self
 
     def transform(self, X) -> pd.DataFrame:
@@ -64,9 +113,10 @@ class MeanImputer(BaseEstimator, TransformerMixin):
         X_imputed : pandas.DataFrame of shape (n_samples, n_features)
             The imputed input data with missing values replaced.
         """
-        X = X.copy()
+        if self.copy:
+            X = X.copy()
         for col in self.numerical_features:
-            X[col] = X[col].fillna(self.mean_dict_[col])
+            X[col] = X[col].fillna(_in_column_dtype(value=self.mean_dict_[col], column=X[col]))
         return X
 
 class ModeImputer(BaseEstimator, TransformerMixin):
@@ -82,13 +132,23 @@ class ModeImputer(BaseEstimator, TransformerMixin):
         List of column names in the input data that should be treated as categorical
         features and imputed using this transformer.
 
+    copy : bool, default=True
+        If False, impute in place on the input DataFrame instead of on a copy.
+
     Attributes
     ----------
     mode_dict_ : dict of str: Any
         Dictionary containing the mode values for each categorical feature.
+
+    counts_dict_ : dict of str: dict
+        Number of occurrences of each value of each categorical feature, learned by 'fit' and
+        accumulated by 'partial_fit'.
     """
-    def __init__(self, categorical_features: list[str]) -> None:
+    copy: bool = True  # Class-level default for transformers unpickled from before 'copy' existed
+
+    def __init__(self, categorical_features: list[str], copy: bool = True) -> None:
         self.categorical_features: list[str] = categorical_features
+        self.copy: bool = copy
         super().__init__()
 
     def fit(self, X, y=None) -> 'ModeImputer':
@@ -109,8 +169,41 @@ class ModeImputer(BaseEstimator, TransformerMixin):
             The fitted transformer object.
         """
         self.mode_dict_ = {}
+        self.counts_dict_ = {}
         for col in self.categorical_features:
             self.mode_dict_[col] = X[col].mode()[0]
+            # Sufficient statistics, so that 'partial_fit' can later add new data to this fit
+            self.counts_dict_[col] = {value: int(count) for value, count in X[col].value_counts().items()}
+        return self
+
+    def partial_fit(self, X, y=None) -> 'ModeImputer':
+        """
+        Update the mode values with one more chunk of data.
+
+        Value counts are accumulated, so the modes of a dataset streamed in chunks are those
+        'fit' would learn on the whole dataset, ties going to the smallest value.
+
+        Parameters
+        ----------
+        X : pandas.DataFrame of shape (n_samples, n_features)
+            The next chunk of the input data.
+
+        y : None
+            Ignored in this transformer.
+
+        Returns
+        -------
+        self : ModeImputer
+            The updated transformer object.
+        """
+        if not hasattr(self, "counts_dict_"):
+            self.counts_dict_ = {col: {} for col in self.categorical_features}
+        self.mode_dict_ = {}
+        for col in self.categorical_features:
+            counts = self.counts_dict_[col]
+            for value, count in X[col].value_counts().items():
+                counts[value] = counts.get(value, 0) + int(count)
+            self.mode_dict_[col] = min(value for value, count in counts.items() if count == max(counts.values()))
         return self
 
     def transform(self, X) -> pd.DataFrame:
@@ -127,9 +220,15 @@ class ModeImputer(BaseEstimator, TransformerMixin):
         X_imputed : pandas.DataFrame of shape (n_samples, n_features)
             The imputed input data with missing values replaced.
         """
-        X = X.copy()
+        if self.copy:
+            X = X.copy()
         for col in self.categorical_features:
-            X[col] = X[col].fillna(self.mode_dict_[col])
+            column = X[col]
+            if not column.hasnans:
+                continue
+            if isinstance(column.dtype, pd.CategoricalDtype) and self.mode_dict_[col] not in column.cat.categories:
+                column = column.cat.add_categories([self.mode_dict_[col]])
+            X[col] = column.fillna(self.mode_dict_[col])
         return X
 
     
@@ -143,9 +242,15 @@ class DropColumns(BaseEstimator, TransformerMixin):
     ----------
     columns_to_drop : list of str
         List of column names in the input data to be dropped.
+
+    copy : bool, default=True
+        If False, drop the columns in place from the input DataFrame instead of returning a new one.
     """
-    def __init__(self, columns_to_drop: list[str]) -> None:
+    copy: bool = True  # Class-level default for transformers unpickled from before 'copy' existed
+
+    def __init__(self, columns_to_drop: list[str], copy: bool = True) -> None:
         self.columns_to_drop: list[str] = columns_to_drop
+        self.copy: bool = copy
         super().__init__()
 
     def fit(self, X, y=None) -> 'DropColumns':
@@ -181,8 +286,9 @@ class DropColumns(BaseEstimator, TransformerMixin):
         X_dropped : pandas.DataFrame of shape (n_samples, n_features - n_dropped)
             The input data with the specified columns dropped.
         """
-        X = X.copy()
-        X = X.drop(columns=self.columns_to_drop)
+        if self.copy:
+            return X.drop(columns=self.columns_to_drop)
+        X.drop(columns=self.columns_to_drop, inplace=True)
         return X
 
     
@@ -202,10 +308,16 @@ class CombineColumns(BaseEstimator, TransformerMixin):
     columnB : str
         The name of the column in the input data whose values will be added to
         `columnA`.
+
+    copy : bool, default=True
+        If False, combine the columns in place on the input DataFrame instead of on a copy.
     """
-    def __init__(self, columnA: list[str], columnB: str) -> None:
+    copy: bool = True  # Class-level default for transformers unpickled from before 'copy' existed
+
+    def __init__(self, columnA: list[str], columnB: str, copy: bool = True) -> None:
         self.columnA: list[str] = columnA
         self.columnB: str = columnB
+        self.copy: bool = copy
         super().__init__()
 
     def fit(self, X, y=None) -> 'CombineColumns':
@@ -242,7 +354,8 @@ class CombineColumns(BaseEstimator, TransformerMixin):
         X_combined : pandas.DataFrame of shape (n_samples, n_features)
             The combined input data with the updated values in `columnA`.
         """
-        X = X.copy()
+        if self.copy:
+            X = X.copy()
         for col in self.columnA:
             X[col] += X[col]
         return X
@@ -255,20 +368,42 @@ class CustomLabelEncoder(BaseEstimator, TransformerMixin):
     This transformer replaces each unique categorical value with a numerical index,
     based on the sorted order of their frequency in the input data.
 
+    Encoding goes through `pandas.Categorical` code tables instead of per-value lookups,
+    and accepts both object and category dtype columns. Category dtype input is recoded
+    through its categories only, without materializing a Python object per row.
+
     Parameters
     ----------
     categorical_features : list of str
         List of column names in the input data that should be treated as categorical
         features and encoded using this transformer.
 
+    unknown_value : float, default=np.nan
+        Code given to categories not seen during fit, and to missing values.
+
+    copy : bool, default=True
+        If False, encode in place on the input DataFrame instead of on a copy.
+
     Attributes
     ----------
     label_dict_ : dict of dict
         Mapping of each categorical feature to a dictionary of its unique values and
         their corresponding numerical indices.
+
+    categories_ : dict of str: numpy.ndarray
+        Categories of each categorical feature, ordered by their numerical index.
+
+    counts_dict_ : dict of str: dict
+        Number of occurrences of each category of each feature, learned by 'fit' and accumulated
+        by 'partial_fit'.
 """
-    def __init__(self, categorical_features: list[str]) -> None:
+    copy: bool = True  # Class-level default for transformers unpickled from before 'copy' existed
+    unknown_value: float = np.nan  # Class-level default for transformers unpickled from before 'unknown_value' existed
+
+    def __init__(self, categorical_features: list[str], unknown_value: float = np.nan, copy: bool = True) -> None:
         self.categorical_features: list[str] = categorical_features
+        self.unknown_value: float = unknown_value
+        self.copy: bool = copy
         super().__init__()
 
     def fit(self, X, y=None) -> 'CustomLabelEncoder':
@@ -290,11 +425,92 @@ class CustomLabelEncoder(BaseEstimator, TransformerMixin):
             The fitted transformer object.
         """
         self.label_dict_ = {}
+        self.categories_ = {}
+        self.counts_dict_ = {}
+        for col in self.categorical_features:
+            counts = X[col].value_counts()
+            counts = counts[counts > 0]  # Unused categories of category dtype input
+            t = counts.sort_values(ascending=True).index
+            self.label_dict_[col] = {value: index for index, value in enumerate(iterable=t, start=0)}
+            self.categories_[col] = np.asarray(t, dtype=object)
+            self.counts_dict_[col] = {value: int(count) for value, count in counts.items()}
+        return self
+
+    def partial_fit(self, X, y=None, keep_codes: bool = False) -> 'CustomLabelEncoder':
+        """
+        Update the category frequencies, and so the mapping, with one more chunk of data.
+
+        The codes may change while chunks are added: use the mapping once every chunk
+        has been seen, or keep the codes already given with 'keep_codes'.
+
+        Parameters
+        ----------
+        X : pandas.DataFrame of shape (n_samples, n_features)
+            The next chunk of the input data.
+
+        y : None
+            Ignored in this transformer.
+
+        keep_codes : bool, default=False
+            Keep the code of every category already encoded, and give new categories the
+            next codes, in ascending order of frequency. Use it when a model trained on the
+            codes is updated rather than refitted.
+
+        Returns
+        -------
+        self : CustomLabelEncoder
+            The updated transformer object.
+        """
+        if not hasattr(self, "counts_dict_"):
+            self.counts_dict_ = {col: {} for col in self.categorical_features}
+        known = {col: list(self._get_categories(col=col)) for col in self.categorical_features} if keep_codes else {}
+        self.label_dict_ = {}
+        self.categories_ = {}
         for col in self.categorical_features:
-            t = X[col].value_counts().sort_values(ascending=True).index
+            counts = self.counts_dict_[col]
+            for value, count in X[col].value_counts().items():
+                counts[value] = counts.get(value, 0) + int(count)
+            # Ascending frequency, as in 'fit'; ties keep the order in which the categories were first seen
+            t = pd.Series(counts, dtype="int64").sort_values(ascending=True, kind="stable").index
+            if keep_codes:
+                known_values = set(known[col])
+                t = known[col] + [value for value in t if value not in known_values]
             self.label_dict_[col] = {value: index for index, value in enumerate(iterable=t, start=0)}
+            self.categories_[col] = np.asarray(t, dtype=object)
         return self
 
+    def _get_categories(self, col: str) -> np.ndarray:
+        """Categories of 'col' ordered by code, rebuilt from 'label_dict_' for encoders fitted without 'categories_'."""
+        if not hasattr(self, "categories_"):
+            self.categories_ = {
+                feature: np.asarray(sorted(mapping, key=mapping.get), dtype=object)
+                for feature, mapping in self.label_dict_.items()
+            }
+        return self.categories_[col]
+
+    def encode(self, col: str, values) -> np.ndarray:
+        """
+        Encode the values of one categorical feature.
+
+        Parameters
+        ----------
+        col : str
+            Name of the categorical feature.
+
+        values : array-like of shape (n_samples,)
+            Values to encode, of object or category dtype.
+
+        Returns
+        -------
+        numpy.ndarray of shape (n_samples,)
+            The integer codes, or float codes when some values are mapped to a NaN 'unknown_value'.
+        """
+        codes = pd.Categorical(values, categories=self._get_categories(col=col)).codes
+        unknown = codes < 0
+        if unknown.any():
+            return np.where(unknown, self.unknown_value, codes)
+        return codes
+
     def transform(self, X) -> pd.DataFrame:
         """
         Replace each unique categorical value with its corresponding numerical index.
@@ -309,9 +525,10 @@ class CustomLabelEncoder(BaseEstimator, TransformerMixin):
         X_encoded : pandas.DataFrame of shape (n_samples, n_features)
             The encoded input data with numerical features.
         """
-        X = X.copy()
+        if self.copy:
+            X = X.copy()
         for col in self.categorical_features:
-            X[col] = X[col].map(self.label_dict_[col])
+            X[col] = self.encode(col=col, values=X[col])
         return X
     
 class LogTransform(BaseEstimator, TransformerMixin):
@@ -320,7 +537,9 @@ class LogTransform(BaseEstimator, TransformerMixin):
 
     This class is used to transform features with a positively skewed distribution to a more normal distribution, which can improve the performance of some machine learning algorithms.
     """
-    def __init__(self, numerical_features: list[str]) -> None:
+    copy: bool = True  # Class-level default for transformers unpickled from before 'copy' existed
+
+    def __init__(self, numerical_features: list[str], copy: bool = True) -> None:
         """
         Initialize the LogTransform object with the specified numerical_features.
 
@@ -328,8 +547,11 @@ class LogTransform(BaseEstimator, TransformerMixin):
         ----------
         numerical_features : list[str]
             List of feature names to apply logarithmic transformation.
+        copy : bool, default=True
+            If False, transform in place on the input DataFrame instead of on a copy.
         """
         self.numerical_features: list[str] = numerical_features
+        self.copy: bool = copy
         super().__init__()
 
     def fit(self, X, y=None) -> 'LogTransform':
@@ -364,9 +586,10 @@ class LogTransform(BaseEstimator, TransformerMixin):
         pd.DataFrame
             The transformed dataset with logarithmic transformation applied to the specified numerical_features.
         """
-        X = X.copy()
+        if self.copy:
+            X = X.copy()
         for col in self.numerical_features:
             # Replace non-positive values with a small positive value
-            X[col] = X[col].replace([np.inf, -np.inf, 0], np.finfo(dtype=float).eps)
+            X[col] = X[col].replace([np.inf, -np.inf, 0], _in_column_dtype(value=np.finfo(dtype=float).eps, column=X[col]))
             X[col] = np.log(X[col])
         return X
\ No newline at end of file
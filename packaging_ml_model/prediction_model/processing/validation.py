@@ -0,0 +1,112 @@
+# Functions required to Validate and Coerce the scoring input
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from prediction_model.config import config
+
+class ValidationResult(NamedTuple):
+    """
+    Outcome of 'validate_batch'.
+
+    Attributes
+    ----------
+    data : pd.DataFrame of shape (n_samples, len(config.FEATURES))
+        The coerced input, with the columns of 'config.FEATURES' and the dtypes of
+        'config.FEATURE_DTYPES'. Invalid values are replaced with NaN.
+
+    invalid : numpy.ndarray of shape (n_samples, len(config.FEATURES))
+        Whether each value is invalid, in the order of 'config.FEATURES'.
+
+    raw : pd.DataFrame
+        The input values, to report the invalid ones.
+    """
+    data: pd.DataFrame
+    invalid: np.ndarray
+    raw: pd.DataFrame
+
+    @property
+    def errors(self) -> np.ndarray:
+        """Per-row error mask: True for the rows that must not be scored."""
+        return self.invalid.any(axis=1)
+
+    def messages(self) -> dict[int, str]:
+        """Description of the invalid values of each bad row, keyed by row position."""
+        rows, cols = np.nonzero(self.invalid)
+        messages: dict[int, list[str]] = {}
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            name = config.FEATURES[col]
+            messages.setdefault(row, []).append(f"{name}={self.raw[name].iat[row]!r}")
+        return {row: "Invalid values: " + ", ".join(values) for row, values in messages.items()}
+
+def _category_lookup(categories: list) -> tuple[dict[str, object], dict[str, object]]:
+    """Map the accepted spellings of each category to the category: exact, then case and whitespace insensitive."""
+    lookup: dict[str, object] = {}
+    for category in categories:
+        lookup[str(category)] = category
+        try:
+            number = float(category)
+        except ValueError:
+            continue
+        # Numbers sent for numeric-looking categories, e.g. 1 or 1.0 for '1' and 1 for 1.0
+        lookup[str(number)] = category
+        if number.is_integer():
+            lookup[str(int(number))] = category
+    return lookup, {text.strip().lower(): category for text, category in lookup.items()}
+
+def validate_batch(data_input, numeric_ranges: dict[str, tuple[float, float]] = config.NUMERIC_RANGES,
+                   allowed_categories: dict[str, list] = config.ALLOWED_CATEGORIES) -> ValidationResult:
+    """
+    Validate and coerce a batch of applications in one vectorized pass over each column.
+
+    Numerical features are parsed from numbers or numeric strings and checked against their
+    range. Categorical features are matched against their allowed categories, ignoring case
+    and surrounding whitespace, and numbers are accepted for numeric-looking categories.
+    Missing values, and missing columns, are valid: the pipeline imputes them.
+
+    Parameters
+    ----------
+    data_input : pandas.DataFrame, list of dict or dict of str: array-like
+        The applications to validate.
+
+    numeric_ranges : dict of str: (float, float), default=config.NUMERIC_RANGES
+        Inclusive range of each numerical feature.
+
+    allowed_categories : dict of str: list, default=config.ALLOWED_CATEGORIES
+        Categories of each categorical feature.
+
+    Returns
+    -------
+    ValidationResult
+        The coerced data, ready for 'classification_pipeline', and the per-row error mask.
+    """
+    raw = pd.DataFrame(data_input, columns=config.FEATURES)
+    data = pd.DataFrame(index=raw.index)
+    invalid = np.zeros(shape=raw.shape, dtype=bool)
+    for index, col in enumerate(config.FEATURES):
+        values = raw[col]
+        if col in allowed_categories:
+            lookup, folded = _category_lookup(categories=allowed_categories[col])
+            try:
+                codes, uniques = pd.factorize(values)
+                missing = codes < 0
+            except TypeError:  # Unhashable values, e.g. lists in JSON input
+                missing = values.isna().to_numpy()
+                codes, uniques = pd.factorize(values.astype(str).mask(missing))
+            # Only the few distinct values are looked up; the last slot is for the missing values (code -1)
+            matched = [lookup.get(str(value), folded.get(str(value).strip().lower(), np.nan)) for value in uniques]
+            known = np.array([not pd.isna(category) for category in matched] + [True])
+            coerced = pd.Series(np.asarray(matched + [np.nan], dtype=object)[codes], index=values.index)
+            bad = ~known[codes]
+        else:
+            missing = values.isna().to_numpy()
+            coerced = pd.to_numeric(values, errors="coerce").astype("float64")
+            low, high = numeric_ranges.get(col, (-np.inf, np.inf))
+            numbers = coerced.to_numpy()
+            bad = (np.isnan(numbers) & ~missing) | (numbers < low) | (numbers > high)
+            if bad.any():
+                coerced = coerced.mask(bad)
+        data[col] = coerced.astype(config.FEATURE_DTYPES.get(col, coerced.dtype))
+        invalid[:, index] = bad
+    return ValidationResult(data=data, invalid=invalid, raw=raw)
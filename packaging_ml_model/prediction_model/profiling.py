@@ -0,0 +1,253 @@
+import bisect
+import json
+import os
+import threading
+import time
+import tracemalloc
+import weakref
+from collections import deque
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
+
+# Methods of a pipeline step that are timed
+PROFILED_METHODS:tuple[str, ...] = ("fit", "transform", "predict", "predict_proba", "decision_function")
+
+# Upper bounds of the duration histogram buckets, in seconds
+DURATION_BUCKETS:tuple[float, ...] = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _n_rows(X) -> int:
+    shape = getattr(X, "shape", None)
+    return int(shape[0]) if shape else 0
+
+class StepMetrics:
+    """Counters and duration histogram of one (step, method) pair."""
+    def __init__(self) -> None:
+        self.calls: int = 0
+        self.rows: int = 0
+        self.seconds: float = 0.0
+        self.allocated_bytes: int = 0
+        self.bucket_counts: list[int] = [0] * (len(DURATION_BUCKETS) + 1)
+
+    def observe(self, seconds: float, rows: int, allocated_bytes: int) -> None:
+        self.calls += 1
+        self.rows += rows
+        self.seconds += seconds
+        self.allocated_bytes += allocated_bytes
+        self.bucket_counts[bisect.bisect_left(DURATION_BUCKETS, seconds)] += 1
+
+    def as_dict(self) -> dict:
+        return {"calls": self.calls, "rows": self.rows, "seconds": self.seconds,
+                "allocated_bytes": self.allocated_bytes,
+                "mean_seconds": self.seconds / self.calls if self.calls else 0.0}
+
+class _ProfiledMethod:
+    """Instance-level override of one method of one pipeline step, timing each call."""
+    def __init__(self, profiler: 'PipelineProfiler', step, name: str, method: str) -> None:
+        self.profiler = profiler
+        self.bound = getattr(step, method)
+        self.step_id: int = id(step)
+        self.name: str = name
+        self.method: str = method
+        self.__doc__ = getattr(self.bound, "__doc__", None)
+
+    def __call__(self, *args, **kwargs):
+        active = self.profiler._active()
+        if self.step_id in active:
+            return self.bound(*args, **kwargs)
+        active.add(self.step_id)
+        try:
+            return self.profiler._call(step=self.name, method=self.method, bound=self.bound, args=args, kwargs=kwargs)
+        finally:
+            active.discard(self.step_id)
+
+    def __reduce__(self):
+        raise TypeError("A profiled pipeline step cannot be pickled or copied; call 'disable' first")
+
+class PipelineProfiler:
+    """
+    Per-step instrumentation of the 'fit', 'transform' and 'predict' calls of pipeline steps.
+
+    While enabled, the profiled methods of each step of the given pipelines are overridden on
+    the step objects themselves by timing wrappers; the step classes, and any other instance of
+    them, are left untouched. 'disable' removes the overrides, so a disabled profiler costs
+    nothing. Each call records wall time, rows processed and, with 'trace_memory', the peak
+    memory it allocated (measured with 'tracemalloc', which slows allocations down while it runs).
+
+    Steps are reported under their name in the pipeline they were enabled for. Clones and
+    reloaded models are not profiled unless 'enable' is called for them too, and profiled steps
+    cannot be pickled until 'disable' is called. A method called from another profiled method of
+    the same step, e.g. 'decision_function' from 'predict', is only counted once, as the outer call.
+
+    Parameters
+    ----------
+    max_events : int, default=100_000
+        Number of most recent calls kept for 'dump_trace'.
+    """
+    def __init__(self, max_events: int = 100_000) -> None:
+        self.enabled: bool = False
+        self.trace_memory: bool = False
+        self.metrics: dict[tuple[str, str], StepMetrics] = {}
+        self.events: deque = deque(maxlen=max_events)
+        self._steps: weakref.WeakSet = weakref.WeakSet()
+        self._started_tracemalloc: bool = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._origin: float = time.perf_counter()
+
+    def enable(self, pipeline: 'Pipeline | None' = None, trace_memory: bool = False) -> 'PipelineProfiler':
+        """
+        Start profiling the steps of 'pipeline'.
+
+        Parameters
+        ----------
+        pipeline : Pipeline, optional
+            Pipeline whose steps are profiled. Defaults to the served pipeline, 'predict.model.pipeline'.
+            May be called again to profile the steps of several pipelines; a step already
+            profiled keeps the name it was first enabled with.
+
+        trace_memory : bool, default=False
+            Also record the memory allocated by each call.
+
+        Returns
+        -------
+        PipelineProfiler
+            The profiler itself.
+        """
+        if pipeline is None:
+            from prediction_model.predict import model
+            pipeline = model.pipeline
+        with self._lock:
+            for name, step in pipeline.steps:
+                if step is None or isinstance(step, str) or step in self._steps:
+                    continue
+                for method in PROFILED_METHODS:
+                    if hasattr(step, method):
+                        setattr(step, method, _ProfiledMethod(profiler=self, step=step, name=name, method=method))
+                self._steps.add(step)
+            if trace_memory and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            self.trace_memory = self.trace_memory or trace_memory
+            self.enabled = True
+        return self
+
+    def disable(self) -> None:
+        """Remove the overrides from the profiled steps. Recorded metrics are kept until 'reset'."""
+        with self._lock:
+            for step in list(self._steps):
+                for method in PROFILED_METHODS:
+                    if isinstance(vars(step).get(method), _ProfiledMethod):
+                        delattr(step, method)
+            self._steps = weakref.WeakSet()
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+            self.trace_memory = False
+            self.enabled = False
+
+    def reset(self) -> None:
+        """Drop every recorded metric and trace event."""
+        with self._lock:
+            self.metrics.clear()
+            self.events.clear()
+
+    def __enter__(self) -> 'PipelineProfiler':
+        if not self.enabled:
+            self.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.disable()
+
+    def _active(self) -> set:
+        active = getattr(self._local, "active", None)
+        if active is None:
+            active = self._local.active = set()
+        return active
+
+    def _call(self, step: str, method: str, bound, args: tuple, kwargs: dict):
+        trace_memory = self.trace_memory and tracemalloc.is_tracing()
+        if trace_memory:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        result = bound(*args, **kwargs)
+        seconds = time.perf_counter() - start
+        allocated = max(tracemalloc.get_traced_memory()[1] - before, 0) if trace_memory else 0
+        rows = _n_rows(args[0] if args else kwargs.get("X"))
+        with self._lock:
+            metrics = self.metrics.get((step, method))
+            if metrics is None:
+                metrics = self.metrics[(step, method)] = StepMetrics()
+            metrics.observe(seconds=seconds, rows=rows, allocated_bytes=allocated)
+            self.events.append((step, method, start, seconds, rows, allocated, threading.get_ident()))
+        return result
+
+    def summary(self) -> dict[str, dict[str, dict]]:
+        """Totals of each step, as {step: {method: {calls, rows, seconds, allocated_bytes, mean_seconds}}}."""
+        with self._lock:
+            summary: dict[str, dict[str, dict]] = {}
+            for (step, method), metrics in self.metrics.items():
+                summary.setdefault(step, {})[method] = metrics.as_dict()
+        return summary
+
+    def to_prometheus(self, prefix: str = "pipeline_step") -> str:
+        """
+        Export the metrics in the Prometheus text exposition format.
+
+        Parameters
+        ----------
+        prefix : str, default="pipeline_step"
+            Prefix of every metric name.
+
+        Returns
+        -------
+        str
+            Counters of calls, rows and allocated bytes, and the duration histogram, labelled by step and method.
+        """
+        with self._lock:
+            items = [(step, method, metrics.as_dict(), list(metrics.bucket_counts))
+                     for (step, method), metrics in sorted(self.metrics.items())]
+        lines = []
+        for name, key, help_text in [("calls_total", "calls", "Number of calls."),
+                                     ("rows_total", "rows", "Number of rows processed."),
+                                     ("allocated_bytes_total", "allocated_bytes", "Peak memory allocated by the calls, in bytes.")]:
+            lines += [f"# HELP {prefix}_{name} {help_text}", f"# TYPE {prefix}_{name} counter"]
+            lines += [f'{prefix}_{name}{{step="{step}",method="{method}"}} {totals[key]}' for step, method, totals, _ in items]
+        lines += [f"# HELP {prefix}_duration_seconds Wall time of the calls.", f"# TYPE {prefix}_duration_seconds histogram"]
+        for step, method, totals, bucket_counts in items:
+            labels = f'step="{step}",method="{method}"'
+            cumulative = 0
+            for bound, count in zip(DURATION_BUCKETS + (float("inf"),), bucket_counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{prefix}_duration_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f"{prefix}_duration_seconds_sum{{{labels}}} {totals['seconds']!r}")
+            lines.append(f"{prefix}_duration_seconds_count{{{labels}}} {totals['calls']}")
+        return "\n".join(lines) + "\n"
+
+    def dump_trace(self, filepath: str) -> None:
+        """
+        Write the recorded calls as a Chrome trace event file, viewable in Perfetto or chrome://tracing.
+
+        Parameters
+        ----------
+        filepath : str
+            Path of the JSON file to write.
+        """
+        with self._lock:
+            events = list(self.events)
+        pid = os.getpid()
+        trace = {"traceEvents": [
+            {"name": f"{step}.{method}", "cat": step, "ph": "X", "pid": pid, "tid": tid,
+             "ts": (start - self._origin) * 1e6, "dur": seconds * 1e6,
+             "args": {"rows": rows, "allocated_bytes": allocated}}
+            for step, method, start, seconds, rows, allocated, tid in events
+        ], "displayTimeUnit": "ms"}
+        with open(filepath, "w") as f:
+            json.dump(trace, f)
+
+# Process-wide profiler, disabled until 'profiler.enable()' is called
+profiler:PipelineProfiler = PipelineProfiler()
@@ -0,0 +1,263 @@
+import argparse
+import datetime
+import json
+import os
+import shutil
+import threading
+import time
+
+from prediction_model.config import config
+from prediction_model.model_loader import ModelLoader
+
+CURRENT_POINTER:str = "CURRENT"
+METADATA_FILE:str = "metadata.json"
+
+def _write_atomic(path: str, content: bytes) -> None:
+    tmp_path = f"{path}.tmp{os.getpid()}.{threading.get_ident()}"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+class ModelRegistry:
+    """
+    Versioned model files with a "current" pointer, stored in a local directory.
+
+    Version 'v<n>' is stored in 'versions/v<n>' with its 'metadata.json', and the 'CURRENT'
+    file names the version to serve. Files are renamed into place once written.
+
+    Parameters
+    ----------
+    root : str, default=config.REGISTRY_PATH
+        Directory of the registry, created on first registration.
+    """
+    def __init__(self, root: str = config.REGISTRY_PATH) -> None:
+        self.root: str = root
+        self.versions_path: str = os.path.join(root, "versions")
+
+    def versions(self) -> list[str]:
+        """Registered versions, oldest first."""
+        if not os.path.isdir(self.versions_path):
+            return []
+        names = [name for name in os.listdir(self.versions_path)
+                 if name.startswith("v") and name[1:].isdigit() and os.path.exists(os.path.join(self.versions_path, name, METADATA_FILE))]
+        return sorted(names, key=lambda name: int(name[1:]))
+
+    def metadata(self, version: str) -> dict:
+        """The metadata recorded when 'version' was registered."""
+        metadata_path = os.path.join(self.versions_path, version, METADATA_FILE)
+        if not os.path.exists(metadata_path):
+            raise KeyError(f"Unknown model version: {version}")
+        with open(metadata_path) as f:
+            return json.load(f)
+
+    def model_path(self, version: str | None = None) -> str:
+        """
+        Absolute path to the model file of 'version'.
+
+        Parameters
+        ----------
+        version : str, optional
+            The version to locate. Defaults to the current version.
+
+        Returns
+        -------
+        str
+            Path to the model file, to be loaded with 'ModelLoader'.
+        """
+        version = version or self.current_version()
+        if version is None:
+            raise KeyError(f"No current model version in {self.root}")
+        return os.path.join(self.versions_path, version, self.metadata(version=version)["file"])
+
+    def current_version(self) -> str | None:
+        """The version the "current" pointer refers to, or None before the first promotion."""
+        try:
+            with open(os.path.join(self.root, CURRENT_POINTER)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def register(self, model_path: str, promote: bool = False) -> str:
+        """
+        Copy a saved pipeline or model artifact into the registry as a new version.
+
+        Parameters
+        ----------
+        model_path : str
+            Path to the file saved by 'save_pipeline' or 'artifact.save_artifact'.
+
+        promote : bool, default=False
+            Also make the new version the current one.
+
+        Returns
+        -------
+        str
+            The name of the new version.
+        """
+        from prediction_model.processing.data_handling import get_pipeline_fingerprint
+
+        os.makedirs(self.versions_path, exist_ok=True)
+        # Creating the directory claims the version number, even against concurrent registrations
+        number = max([int(name[1:]) for name in os.listdir(self.versions_path) if name[1:].isdigit()], default=0) + 1
+        while True:
+            version = f"v{number}"
+            try:
+                os.mkdir(os.path.join(self.versions_path, version))
+                break
+            except FileExistsError:
+                number += 1
+
+        version_path = os.path.join(self.versions_path, version)
+        filename = os.path.basename(model_path)
+        tmp_path = os.path.join(version_path, f"{filename}.tmp")
+        shutil.copyfile(model_path, tmp_path)
+        os.replace(tmp_path, os.path.join(version_path, filename))
+        metadata = {
+            "version": version,
+            "file": filename,
+            "fingerprint": get_pipeline_fingerprint(pipeline_to_load=os.path.join(version_path, filename)),
+            "source": os.path.abspath(model_path),
+            "registered_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        }
+        # The metadata file is written last: a version without it is not listed
+        _write_atomic(path=os.path.join(version_path, METADATA_FILE), content=json.dumps(metadata, indent=2).encode())
+        print(f"Model has been registered: {version}")
+        if promote:
+            self.promote(version=version)
+        return version
+
+    def promote(self, version: str) -> None:
+        """Atomically point "current" to 'version'; watching scorers swap to it on their next poll."""
+        self.metadata(version=version)
+        _write_atomic(path=os.path.join(self.root, CURRENT_POINTER), content=f"{version}\n".encode())
+        print(f"Current model version: {version}")
+
+class RegistryWatcher:
+    """
+    Keeps a 'ModelLoader' serving the current version of a registry.
+
+    A background thread polls the "current" pointer. When it changes, the new version is
+    loaded and warmed in that thread, then swapped in atomically with 'ModelLoader.swap':
+    requests never wait for the load, and requests in flight finish on the previous model.
+    A version that fails to load is reported and the previous model keeps serving; loading it
+    is retried with exponential backoff, from 'poll_interval' up to 'max_retry_interval'.
+
+    Parameters
+    ----------
+    loader : ModelLoader
+        The loader to keep up to date, e.g. 'predict.model'.
+
+    registry : ModelRegistry
+        The registry to follow.
+
+    poll_interval : float, default=config.REGISTRY_POLL_SECONDS
+        Seconds between two reads of the "current" pointer.
+
+    max_retry_interval : float, default=config.REGISTRY_MAX_RETRY_SECONDS
+        Longest wait before loading a version that failed to load again.
+
+    Attributes
+    ----------
+    version : str or None
+        The version being served.
+
+    failed_version : str or None
+        The current version when it failed to load, until it is loaded.
+    """
+    def __init__(self, loader: ModelLoader, registry: ModelRegistry, poll_interval: float = config.REGISTRY_POLL_SECONDS,
+                 max_retry_interval: float = config.REGISTRY_MAX_RETRY_SECONDS) -> None:
+        self.loader: ModelLoader = loader
+        self.registry: ModelRegistry = registry
+        self.poll_interval: float = poll_interval
+        self.max_retry_interval: float = max_retry_interval
+        self.version: str | None = None
+        self.failed_version: str | None = None
+        self.n_swaps: int = 0
+        self._n_failures: int = 0
+        self._retry_at: float = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def sync(self) -> bool:
+        """
+        Swap to the current version of the registry if it is not served yet.
+
+        Returns
+        -------
+        bool
+            Whether the served model was swapped.
+        """
+        version = self.registry.current_version()
+        if version is None or version == self.version:
+            self.failed_version, self._n_failures = None, 0
+            return False
+        if version == self.failed_version and time.monotonic() < self._retry_at:
+            return False
+        try:
+            self.loader.swap(pipeline_to_load=self.registry.model_path(version=version))
+        except Exception as e:
+            self._n_failures = self._n_failures + 1 if version == self.failed_version else 1
+            self.failed_version = version
+            delay = min(self.poll_interval * 2 ** (self._n_failures - 1), self.max_retry_interval)
+            self._retry_at = time.monotonic() + delay
+            print(f"Model version {version} could not be loaded, still serving {self.version}, "
+                  f"retrying in {delay:g}s: {e!r}", flush=True)
+            return False
+        self.version = version
+        self.failed_version, self._n_failures = None, 0
+        self.n_swaps += 1
+        print(f"Now serving model version: {version}", flush=True)
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            self.sync()
+
+    def start(self) -> 'RegistryWatcher':
+        """Serve the current version now, then follow the pointer in a daemon thread."""
+        self.sync()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="registry-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop following the pointer; the served model is kept."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> 'RegistryWatcher':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Manage the local model registry.")
+    parser.add_argument("--registry", default=config.REGISTRY_PATH, help="registry directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    register = commands.add_parser("register", help="add a saved model as a new version")
+    register.add_argument("model_path", help="file saved by 'save_pipeline' or 'save_artifact'")
+    register.add_argument("--promote", action="store_true", help="also make it the current version")
+    promote = commands.add_parser("promote", help="make a version the current one")
+    promote.add_argument("version")
+    commands.add_parser("list", help="list the registered versions")
+    args = parser.parse_args(argv)
+
+    registry = ModelRegistry(root=args.registry)
+    if args.command == "register":
+        registry.register(model_path=args.model_path, promote=args.promote)
+    elif args.command == "promote":
+        registry.promote(version=args.version)
+    else:
+        current = registry.current_version()
+        for version in registry.versions():
+            metadata = registry.metadata(version=version)
+            print(f"{'*' if version == current else ' '} {version:<6} {metadata['registered_at']} {metadata['file']} {metadata['fingerprint'][:12]}")
+
+if __name__ == "__main__":
+    main()
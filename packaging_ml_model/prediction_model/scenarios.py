@@ -0,0 +1,98 @@
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+from scipy.special import expit
+
+from prediction_model.compiled_pipeline import CompiledPipeline
+
+AMOUNT_FEATURE:str = "LoanAmount"
+TERM_FEATURE:str = "Loan_Amount_Term"
+
+class OfferSurface(NamedTuple):
+    """
+    Outcome of 'score_offer_grid'.
+
+    Attributes
+    ----------
+    probability : numpy.ndarray of shape (n_applicants, n_amounts, n_terms)
+        Approval probability of each applicant for each amount and term.
+
+    amounts : numpy.ndarray of shape (n_amounts,)
+        The 'LoanAmount' values of the grid.
+
+    terms : numpy.ndarray of shape (n_terms,)
+        The 'Loan_Amount_Term' values of the grid.
+
+    index : pd.Index
+        The applicants, from the index of the input.
+    """
+    probability: np.ndarray
+    amounts: np.ndarray
+    terms: np.ndarray
+    index: pd.Index
+
+    def approved(self, threshold: float = 0.5) -> np.ndarray:
+        """Whether each offer is approved, i.e. has an approval probability above 'threshold'."""
+        return self.probability > threshold
+
+    def max_approvable_amount(self, threshold: float = 0.5) -> pd.DataFrame:
+        """
+        Largest approved amount of the grid, per applicant and term.
+
+        Parameters
+        ----------
+        threshold : float, default=0.5
+            Approval probability an offer must exceed.
+
+        Returns
+        -------
+        pd.DataFrame of shape (n_applicants, n_terms)
+            The amounts, one column per term; NaN where no amount of the grid is approved.
+        """
+        amounts = np.where(self.approved(threshold=threshold), self.amounts[None, :, None], -np.inf).max(axis=1)
+        amounts[np.isneginf(amounts)] = np.nan
+        return pd.DataFrame(amounts, index=self.index, columns=pd.Index(self.terms, name=TERM_FEATURE))
+
+    def to_frame(self) -> pd.DataFrame:
+        """The surface in long format: one row per applicant, amount and term."""
+        index = pd.MultiIndex.from_product([self.index, self.amounts, self.terms],
+                                           names=[self.index.name, AMOUNT_FEATURE, TERM_FEATURE])
+        return pd.DataFrame({"probability": self.probability.reshape(-1)}, index=index)
+
+def score_offer_grid(compiled: CompiledPipeline, data_input, amounts, terms) -> OfferSurface:
+    """
+    Score every applicant for every combination of 'amounts' and 'terms', in one broadcast operation.
+
+    Every preprocessing step transforms each column on its own, see 'CompiledPipeline.column_terms',
+    so the decision score of an offer is the sum of the terms of the fixed features, the amount and the term.
+
+    Parameters
+    ----------
+    compiled : CompiledPipeline
+        The scorer, e.g. 'predict.compiled_pipeline'.
+
+    data_input : pandas.DataFrame or dict of str: array-like
+        The applicants, containing at least 'config.FEATURES'. Their own 'LoanAmount' and
+        'Loan_Amount_Term' are ignored.
+
+    amounts : array-like of shape (n_amounts,)
+        The 'LoanAmount' values to score.
+
+    terms : array-like of shape (n_terms,)
+        The 'Loan_Amount_Term' values to score.
+
+    Returns
+    -------
+    OfferSurface
+        The approval probability of each applicant for each offer.
+    """
+    amounts = np.asarray(amounts, dtype=np.float64).reshape(-1)
+    terms = np.asarray(terms, dtype=np.float64).reshape(-1)
+    contributions, scores = compiled.contributions(data=data_input)
+    fixed = scores - contributions[:, compiled.columns.index(AMOUNT_FEATURE)] - contributions[:, compiled.columns.index(TERM_FEATURE)]
+    surface = (fixed[:, None, None]
+               + compiled.column_terms(col=AMOUNT_FEATURE, values=amounts)[None, :, None]
+               + compiled.column_terms(col=TERM_FEATURE, values=terms)[None, None, :])
+    index = data_input.index if isinstance(data_input, pd.DataFrame) else pd.RangeIndex(len(fixed))
+    return OfferSurface(probability=expit(surface, out=surface), amounts=amounts, terms=terms, index=index)
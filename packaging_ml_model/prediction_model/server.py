@@ -0,0 +1,280 @@
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from prediction_model.config import config
+from prediction_model.predict import follow_registry, model
+from prediction_model.processing.validation import validate_batch
+from prediction_model.profiling import profiler
+
+HTTP_REASONS:dict[int, str] = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                               422: "Unprocessable Entity", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+class ScoringError(ValueError):
+    """Raised, or returned by 'score_records', when a record cannot be scored, e.g. because of an unseen category."""
+
+def score_records(records: list[dict]) -> list[dict | ScoringError]:
+    """
+    Validate records, then score the valid ones with one vectorized 'classification_pipeline.predict_proba' call.
+
+    Parameters
+    ----------
+    records : list of dict
+        Feature values of each application, keyed by the names in 'config.FEATURES'.
+
+    Returns
+    -------
+    list of dict or ScoringError
+        The 'Y'/'N' "prediction" and the approval "probability" of each valid record, and a
+        'ScoringError' describing the invalid values of each other record.
+    """
+    pipeline = model.pipeline
+    validation = validate_batch(data_input=records)
+    errors = validation.errors
+    results: list[dict | ScoringError] = [None] * len(records)
+    for row, message in validation.messages().items():
+        results[row] = ScoringError(message)
+    if errors.all():
+        return results
+    try:
+        proba = pipeline.predict_proba(X=validation.data[~errors])
+    except ValueError as e:
+        raise ScoringError(str(e)) from e
+    labels = pipeline.classes_[np.argmax(proba, axis=1)]
+    for row, label, p in zip(np.flatnonzero(~errors).tolist(), labels, proba[:, 1]):
+        results[row] = {"prediction": "Y" if label == 1 else "N", "probability": float(p)}
+    return results
+
+class MicroBatcher:
+    """
+    Gathers concurrent single-record requests and scores them together.
+
+    The first queued request opens a batch window of 'batch_window_ms'; every request that
+    arrives before the window closes, up to 'max_batch_size', is scored in the same
+    vectorized call. Scoring runs in a worker thread, so the event loop keeps accepting
+    requests while a batch is scored.
+
+    Parameters
+    ----------
+    batch_window_ms : float, default=config.BATCH_WINDOW_MS
+        Maximum time to wait for more requests once the first one has arrived.
+
+    max_batch_size : int, default=config.MAX_BATCH_SIZE
+        Maximum number of records scored together.
+
+    max_queue_depth : int, default=config.MAX_QUEUE_DEPTH
+        Maximum number of waiting records; further requests are rejected with 'asyncio.QueueFull'.
+    """
+    def __init__(self, batch_window_ms: float = config.BATCH_WINDOW_MS, max_batch_size: int = config.MAX_BATCH_SIZE,
+                 max_queue_depth: int = config.MAX_QUEUE_DEPTH) -> None:
+        self.batch_window_ms: float = batch_window_ms
+        self.max_batch_size: int = max_batch_size
+        self.max_queue_depth: int = max_queue_depth
+        self.n_batches: int = 0
+        self.n_records: int = 0
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start the batching loop on the running event loop."""
+        self._queue = asyncio.Queue(maxsize=self.max_queue_depth)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the batching loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(self, record: dict) -> dict:
+        """
+        Queue one record and wait for its result.
+
+        Raises
+        ------
+        asyncio.QueueFull
+            If 'max_queue_depth' records are already waiting.
+
+        ScoringError
+            If the record cannot be scored.
+
+        Exception
+            Any other error raised while scoring the batch of the record, e.g. by model loading.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((record, future))
+        return await future
+
+    async def _next_batch(self) -> list[tuple[dict, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.batch_window_ms / 1000
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._next_batch()
+            records = [record for record, _ in batch]
+            try:
+                # Invalid records are reported individually, the valid ones are still scored together
+                results = await loop.run_in_executor(None, score_records, records)
+            except Exception as e:
+                # Any other failure is raised to the requests of this batch only, the loop keeps running
+                results = [e] * len(records)
+            self.n_batches += 1
+            self.n_records += len(batch)
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+class ScoringServer:
+    """
+    Minimal asyncio HTTP/1.1 scoring server, built on the standard library only.
+
+    Routes
+    ------
+    POST /predict
+        Body: one JSON record. Micro-batched with concurrent requests.
+    POST /predict/batch
+        Body: a JSON list of records, scored in one call. Invalid records get an "error" in place of their result.
+    GET /health
+        Liveness and micro-batching statistics.
+    GET /metrics
+        Per-step pipeline metrics in the Prometheus text format, see 'profiling.PipelineProfiler'.
+
+    Parameters
+    ----------
+    batcher : MicroBatcher, optional
+        The micro-batching scheduler of '/predict'. A default one is created when None.
+    """
+    def __init__(self, batcher: MicroBatcher | None = None) -> None:
+        self.batcher: MicroBatcher = batcher or MicroBatcher()
+        self._server: asyncio.Server | None = None
+
+    async def start(self, host: str = config.SERVER_HOST, port: int = config.SERVER_PORT) -> int:
+        """Load the model, start listening and return the bound port."""
+        await asyncio.get_running_loop().run_in_executor(None, model.warmup)
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle_connection, host=host, port=port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Stop listening and stop the micro-batching scheduler."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.batcher.stop()
+
+    async def serve_forever(self, host: str = config.SERVER_HOST, port: int = config.SERVER_PORT) -> None:
+        bound_port = await self.start(host=host, port=port)
+        print(f"Scoring server listening on http://{host}:{bound_port}", flush=True)
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _route(self, method: str, path: str, body: bytes) -> tuple[int, object]:
+        if path == "/health":
+            return 200, {"status": "ok", "batches": self.batcher.n_batches, "records": self.batcher.n_records,
+                         "model": model.fingerprint if model.loaded else None}
+        if path == "/metrics":
+            return 200, profiler.to_prometheus()
+        if path not in ("/predict", "/predict/batch"):
+            return 404, {"error": f"Unknown path: {path}"}
+        if method != "POST":
+            return 405, {"error": f"Use POST for {path}"}
+        try:
+            payload = json.loads(body or b"null")
+        except json.JSONDecodeError as e:
+            return 400, {"error": f"Invalid JSON: {e}"}
+
+        try:
+            if path == "/predict":
+                if not isinstance(payload, dict):
+                    return 400, {"error": "Expected one JSON object"}
+                return 200, await self.batcher.submit(record=payload)
+            if not isinstance(payload, list) or not all(isinstance(record, dict) for record in payload):
+                return 400, {"error": "Expected a JSON list of objects"}
+            results = await asyncio.get_running_loop().run_in_executor(None, score_records, payload)
+            return 200, [{"error": str(result)} if isinstance(result, ScoringError) else result for result in results]
+        except asyncio.QueueFull:
+            return 503, {"error": "Scoring queue is full"}
+        except ScoringError as e:
+            return 422, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": f"Scoring failed: {type(e).__name__}: {e}"}
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers: dict[str, str] = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                status, payload = await self._route(method=method, path=path, body=body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                if isinstance(payload, str):
+                    content, content_type = payload.encode(), "text/plain; version=0.0.4"
+                else:
+                    content, content_type = json.dumps(payload).encode(), "application/json"
+                writer.write(
+                    f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\nContent-Type: {content_type}\r\n"
+                    f"Content-Length: {len(content)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                    .encode("latin-1") + content
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve loan eligibility predictions over HTTP.")
+    parser.add_argument("--host", default=config.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=config.SERVER_PORT)
+    parser.add_argument("--batch-window-ms", type=float, default=config.BATCH_WINDOW_MS)
+    parser.add_argument("--max-batch-size", type=int, default=config.MAX_BATCH_SIZE)
+    parser.add_argument("--max-queue-depth", type=int, default=config.MAX_QUEUE_DEPTH)
+    parser.add_argument("--profile", action="store_true", help="record per-step metrics, served on /metrics")
+    parser.add_argument("--registry", nargs="?", const=config.REGISTRY_PATH, metavar="PATH",
+                        help="serve the current version of a model registry and hot-swap to new ones")
+    args = parser.parse_args(argv)
+    if args.profile:
+        # Models hot-swapped in from the registry are profiled as they are loaded
+        model.load_hooks.append(lambda loaded: profiler.enable(pipeline=loaded.pipeline))
+    if args.registry:
+        follow_registry(registry_path=args.registry)
+    batcher = MicroBatcher(batch_window_ms=args.batch_window_ms, max_batch_size=args.max_batch_size,
+                           max_queue_depth=args.max_queue_depth)
+    try:
+        asyncio.run(ScoringServer(batcher=batcher).serve_forever(host=args.host, port=args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
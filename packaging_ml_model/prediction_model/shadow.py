@@ -0,0 +1,195 @@
+import argparse
+import os
+from collections.abc import Mapping
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+from scipy.special import expit
+
+from prediction_model.compiled_pipeline import CompiledPipeline
+from prediction_model.config import config
+
+class ShadowResult(NamedTuple):
+    """
+    Outcome of 'ShadowScorer.score'.
+
+    Attributes
+    ----------
+    probabilities : pd.DataFrame of shape (n_samples, n_models)
+        Approval probability of each model, one column per model.
+
+    predictions : pd.DataFrame of shape (n_samples, n_models)
+        Predicted label of each model, one column per model.
+
+    champion : str
+        Name of the model the others are compared with.
+    """
+    probabilities: pd.DataFrame
+    predictions: pd.DataFrame
+    champion: str
+
+    def disagreement(self) -> pd.DataFrame:
+        """
+        Disagreement of each challenger with the champion.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per challenger: the "n_disagreements" and "disagreement_rate" of the
+            predicted labels, and the "mean_diff", "mean_abs_diff" and "max_abs_diff" of the
+            approval probabilities (challenger minus champion).
+        """
+        challengers = [name for name in self.probabilities.columns if name != self.champion]
+        disagree = self.predictions[challengers].ne(self.predictions[self.champion], axis=0)
+        diff = self.probabilities[challengers].sub(self.probabilities[self.champion], axis=0)
+        return pd.DataFrame({
+            "n_disagreements": disagree.sum(),
+            "disagreement_rate": disagree.mean(),
+            "mean_diff": diff.mean(),
+            "mean_abs_diff": diff.abs().mean(),
+            "max_abs_diff": diff.abs().max(),
+        }, index=pd.Index(challengers, name="challenger"))
+
+class ShadowScorer:
+    """
+    Score several compiled models on the same input, sharing their preprocessing.
+
+    Models with the same fitted preprocessing, see 'CompiledPipeline.shares_preprocessing',
+    transform the input once, and their decision scores come from one matrix product.
+
+    Parameters
+    ----------
+    models : mapping of str: CompiledPipeline
+        Models by name, e.g. the served model and its challengers.
+
+    champion : str, optional
+        Name of the model the others are compared with. Defaults to the first one.
+    """
+    def __init__(self, models: Mapping[str, CompiledPipeline], champion: str | None = None) -> None:
+        if not models:
+            raise ValueError("At least one model is required")
+        self.models: dict[str, CompiledPipeline] = dict(models)
+        self.champion: str = champion if champion is not None else next(iter(self.models))
+        if self.champion not in self.models:
+            raise KeyError(f"Unknown champion: {self.champion}")
+
+        # Groups of models with identical preprocessing: (scorer whose preprocessing is replayed,
+        # model names, stacked coefficients of shape (n_features, n_models), intercepts, classes)
+        groups: list[tuple[CompiledPipeline, list[str]]] = []
+        for name, compiled in self.models.items():
+            for preprocessing, names in groups:
+                if preprocessing.shares_preprocessing(other=compiled):
+                    names.append(name)
+                    break
+            else:
+                groups.append((compiled, [name]))
+        self._groups: list[tuple] = [
+            (preprocessing, names,
+             np.asfortranarray(np.vstack([self.models[name].coef for name in names]).T),
+             np.concatenate([self.models[name].intercept for name in names]),
+             np.vstack([self.models[name].classes for name in names]))
+            for preprocessing, names in groups
+        ]
+
+    @classmethod
+    def from_files(cls, challengers: Mapping[str, str], champion: str = config.MODEL_NAME,
+                   champion_name: str = "champion") -> 'ShadowScorer':
+        """
+        Load the champion and its challengers from saved models or model artifacts.
+
+        Parameters
+        ----------
+        challengers : mapping of str: str
+            Saved model of each challenger, by name: a name in 'config.SAVE_MODEL_PATH' or a path.
+
+        champion : str, default=config.MODEL_NAME
+            Saved model of the champion.
+
+        champion_name : str, default="champion"
+            Name of the champion in the results.
+
+        Returns
+        -------
+        ShadowScorer
+            The scorer of the champion and its challengers.
+        """
+        from prediction_model.model_loader import read_model
+
+        models = {champion_name: read_model(pipeline_to_load=champion).compiled}
+        for name, pipeline_to_load in challengers.items():
+            models[name] = read_model(pipeline_to_load=pipeline_to_load).compiled
+        return cls(models=models, champion=champion_name)
+
+    @property
+    def n_preprocessing_passes(self) -> int:
+        """Number of times the input is transformed per call: one per distinct preprocessing."""
+        return len(self._groups)
+
+    def decision_function(self, data) -> pd.DataFrame:
+        """
+        Compute the decision scores of every model.
+
+        Parameters
+        ----------
+        data : pandas.DataFrame or dict of str: array-like
+            Input data containing at least the columns of every model.
+
+        Returns
+        -------
+        pd.DataFrame of shape (n_samples, n_models)
+            Decision scores, one column per model in the order of 'models'.
+        """
+        scores = {}
+        for preprocessing, names, coefs, intercepts, _ in self._groups:
+            matrix = preprocessing.transform_matrix(matrix=preprocessing.to_matrix(data=data))
+            group_scores = matrix @ coefs + intercepts
+            for index, name in enumerate(names):
+                scores[name] = group_scores[:, index]
+        index = data.index if isinstance(data, pd.DataFrame) else None
+        return pd.DataFrame({name: scores[name] for name in self.models}, index=index)
+
+    def score(self, data) -> ShadowResult:
+        """
+        Compute the approval probability and predicted label of every model.
+
+        Parameters
+        ----------
+        data : pandas.DataFrame or dict of str: array-like
+            Input data containing at least the columns of every model.
+
+        Returns
+        -------
+        ShadowResult
+            Per-model probabilities and predictions; see 'ShadowResult.disagreement'.
+        """
+        scores = self.decision_function(data=data)
+        predictions = {}
+        for _, names, _, _, classes in self._groups:
+            for index, name in enumerate(names):
+                predictions[name] = classes[index][(scores[name].to_numpy() > 0).astype(int)]
+        return ShadowResult(
+            probabilities=pd.DataFrame(expit(scores.to_numpy()), columns=scores.columns, index=scores.index),
+            predictions=pd.DataFrame({name: predictions[name] for name in self.models}, index=scores.index),
+            champion=self.champion,
+        )
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare challenger models with the champion on the same applications.")
+    parser.add_argument("challengers", nargs="+", help="saved models or model artifacts to compare")
+    parser.add_argument("--champion", default=config.MODEL_NAME, help="saved model the challengers are compared with")
+    parser.add_argument("--data", default=config.TEST_FILE, help="dataset in 'config.DATA_PATH' to score")
+    args = parser.parse_args(argv)
+
+    from prediction_model.processing.data_handling import load_dataset
+
+    # Paths relative to the working directory, otherwise names in 'config.SAVE_MODEL_PATH'
+    resolve = lambda path: os.path.abspath(path) if os.path.exists(path) else path
+    scorer = ShadowScorer.from_files(challengers={os.path.basename(path): resolve(path) for path in args.challengers},
+                                     champion=resolve(args.champion))
+    result = scorer.score(data=load_dataset(filename=args.data)[config.FEATURES])
+    print(f"Scored {len(scorer.models)} models with {scorer.n_preprocessing_passes} preprocessing pass(es)")
+    print(result.disagreement().to_string())
+
+if __name__ == "__main__":
+    main()
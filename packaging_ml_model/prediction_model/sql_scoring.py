@@ -0,0 +1,307 @@
+import argparse
+import contextlib
+import functools
+import queue
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from prediction_model.batch_predict import score_chunk
+from prediction_model.config import config
+
+def _quote(name: str) -> str:
+    """Quote an SQL identifier."""
+    return '"' + name.replace('"', '""') + '"'
+
+def _placeholders(paramstyle: str, n: int) -> list[str]:
+    """Positional parameter markers of a DB-API 'paramstyle'."""
+    if paramstyle == "qmark":
+        return ["?"] * n
+    if paramstyle in ("format", "pyformat"):
+        return ["%s"] * n
+    if paramstyle == "numeric":
+        return [f":{i + 1}" for i in range(n)]
+    raise ValueError(f"Unsupported paramstyle: {paramstyle}, expected 'qmark', 'format', 'pyformat' or 'numeric'")
+
+def _sql_type(dtype, key: bool = False) -> str:
+    """Column type of the predictions table for a pandas dtype."""
+    if pd.api.types.is_float_dtype(dtype):
+        return "DOUBLE PRECISION"
+    if pd.api.types.is_integer_dtype(dtype):
+        return "BIGINT"
+    return "VARCHAR(255)" if key else "TEXT"
+
+class ConnectionPool:
+    """
+    Thread-safe pool of DB-API connections, opened on first use and reused afterwards.
+
+    Use it as a context manager to close the connections on exit.
+
+    Parameters
+    ----------
+    connect : callable
+        Opens a new DB-API connection.
+
+    size : int, default=config.SQL_POOL_SIZE
+        Maximum number of connections open at once; 'connection' waits for a free one.
+    """
+    def __init__(self, connect: Callable, size: int = config.SQL_POOL_SIZE) -> None:
+        self.connect: Callable = connect
+        self.size: int = size
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    @contextlib.contextmanager
+    def connection(self):
+        """
+        Borrow a connection. The transaction is rolled back if the block raises.
+
+        Yields
+        ------
+        DB-API connection
+            The borrowed connection, returned to the pool on exit.
+        """
+        with self._slots:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self.connect()
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                self._idle.put(conn)
+                raise
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        """Close the idle connections."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def __enter__(self) -> 'ConnectionPool':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def read_batches(pool: ConnectionPool, table: str = config.APPLICATIONS_TABLE, key_column: str = config.ID_FEATURE,
+                 batch_size: int = config.BATCH_CHUNK_SIZE, paramstyle: str = "qmark") -> Iterator[pd.DataFrame]:
+    """
+    Read the applications of a table in batches, ordered by their key.
+
+    Each batch is an 'ORDER BY <key> LIMIT <batch_size>' query starting after the last key
+    read, so no read transaction stays open while predictions are written.
+
+    Parameters
+    ----------
+    pool : ConnectionPool
+        Connections to the database.
+
+    table : str, default=config.APPLICATIONS_TABLE
+        Table with the applications, with a unique 'key_column' and the 'config.FEATURES' columns.
+
+    key_column : str, default=config.ID_FEATURE
+        Unique, indexed column the batches are paginated on.
+
+    batch_size : int, default=config.BATCH_CHUNK_SIZE
+        Maximum number of rows per batch.
+
+    paramstyle : str, default="qmark"
+        The 'paramstyle' of the DB-API driver.
+
+    Yields
+    ------
+    pd.DataFrame
+        The next batch: 'key_column' and 'config.FEATURES', with the dtypes of 'config.FEATURE_DTYPES'.
+    """
+    columns = [key_column] + config.FEATURES
+    select = f"SELECT {', '.join(map(_quote, columns))} FROM {_quote(table)}"
+    order = f" ORDER BY {_quote(key_column)} LIMIT {int(batch_size)}"
+    (marker,) = _placeholders(paramstyle=paramstyle, n=1)
+    last_key = None
+    while True:
+        with pool.connection() as conn:
+            cursor = conn.cursor()
+            if last_key is None:
+                cursor.execute(select + order)
+            else:
+                cursor.execute(select + f" WHERE {_quote(key_column)} > {marker}" + order, (last_key,))
+            rows = cursor.fetchall()
+            cursor.close()
+            # End the read transaction, so that writers are not blocked by it
+            conn.rollback()
+        if not rows:
+            return
+        batch = pd.DataFrame.from_records(rows, columns=columns)
+        batch = batch.astype({col: config.FEATURE_DTYPES[col] for col in config.FEATURES if col in config.FEATURE_DTYPES})
+        for col in batch.columns[batch.dtypes == object]:
+            # NULLs as NaN, like in the frames read by 'load_dataset'
+            batch[col] = batch[col].where(batch[col].notna(), np.nan)
+        yield batch
+        if len(rows) < batch_size:
+            return
+        last_key = rows[-1][0]
+
+def create_predictions_table(pool: ConnectionPool, scored: pd.DataFrame, table: str = config.PREDICTIONS_TABLE,
+                             key_column: str = config.ID_FEATURE) -> None:
+    """Create the predictions table, keyed by 'key_column', with the columns of 'scored', unless it exists."""
+    columns = [f"{_quote(col)} {_sql_type(dtype=scored[col].dtype, key=col == key_column)}"
+               + (" PRIMARY KEY" if col == key_column else "") for col in scored.columns]
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {_quote(table)} ({', '.join(columns)})")
+        cursor.close()
+        conn.commit()
+
+def write_predictions(pool: ConnectionPool, scored: pd.DataFrame, table: str = config.PREDICTIONS_TABLE,
+                      key_column: str = config.ID_FEATURE, upsert: bool = False, paramstyle: str = "qmark") -> None:
+    """
+    Write a batch of predictions with one bulk statement, in one transaction.
+
+    Parameters
+    ----------
+    pool : ConnectionPool
+        Connections to the database.
+
+    scored : pd.DataFrame
+        The predictions, with the 'key_column' of the applications.
+
+    table : str, default=config.PREDICTIONS_TABLE
+        The predictions table, see 'create_predictions_table'.
+
+    key_column : str, default=config.ID_FEATURE
+        Primary key of the predictions table.
+
+    upsert : bool, default=False
+        Replace the predictions of applications scored before, instead of failing on them.
+
+    paramstyle : str, default="qmark"
+        The 'paramstyle' of the DB-API driver.
+    """
+    columns = list(scored.columns)
+    statement = (f"INSERT INTO {_quote(table)} ({', '.join(map(_quote, columns))}) "
+                 f"VALUES ({', '.join(_placeholders(paramstyle=paramstyle, n=len(columns)))})")
+    if upsert:
+        statement += f" ON CONFLICT ({_quote(key_column)}) DO UPDATE SET " + ", ".join(
+            f"{_quote(col)} = excluded.{_quote(col)}" for col in columns if col != key_column)
+    # Plain Python values, with None for the missing ones, are accepted by every driver
+    values = [scored[col].astype(object).where(scored[col].notna(), None).tolist() for col in columns]
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.executemany(statement, list(zip(*values)))
+        cursor.close()
+        conn.commit()
+
+def score_table(connect: Callable, table: str = config.APPLICATIONS_TABLE, output_table: str = config.PREDICTIONS_TABLE,
+                key_column: str = config.ID_FEATURE, batch_size: int = config.BATCH_CHUNK_SIZE, upsert: bool = False,
+                compiled: bool = False, n_reasons: int = 0, paramstyle: str = "qmark",
+                pool_size: int = config.SQL_POOL_SIZE, verbose: bool = True) -> dict:
+    """
+    Score every application of a table and write the predictions back to the database.
+
+    Peak memory is bounded by 'batch_size', not by the size of the table. Batches written
+    before a failure stay committed, so a rerun with 'upsert=True' completes the job.
+
+    Parameters
+    ----------
+    connect : callable
+        Opens a new DB-API connection, e.g. 'functools.partial(sqlite3.connect, path)' or
+        'engine.raw_connection' of a SQLAlchemy engine.
+
+    table : str, default=config.APPLICATIONS_TABLE
+        Table with the applications, see 'read_batches'.
+
+    output_table : str, default=config.PREDICTIONS_TABLE
+        Table the predictions are written to, created when missing.
+
+    key_column : str, default=config.ID_FEATURE
+        Unique column identifying the applications in both tables.
+
+    batch_size : int, default=config.BATCH_CHUNK_SIZE
+        Maximum number of rows read, scored and written at once.
+
+    upsert : bool, default=False
+        Replace the predictions of applications scored before, see 'write_predictions'.
+
+    compiled : bool, default=False
+        Score with the compiled NumPy engine instead of 'classification_pipeline'.
+
+    n_reasons : int, default=0
+        Number of reason codes written per application, see 'batch_predict.score_chunk'.
+
+    paramstyle : str, default="qmark"
+        The 'paramstyle' of the DB-API driver, e.g. 'sqlite3.paramstyle'.
+
+    pool_size : int, default=config.SQL_POOL_SIZE
+        Maximum number of open connections.
+
+    verbose : bool, default=True
+        Print the throughput of each stage after every batch.
+
+    Returns
+    -------
+    dict
+        "n_rows", and the "<stage>_seconds" and "<stage>_rows_per_s" of the "read",
+        "score" and "write" stages.
+    """
+    seconds = {"read": 0.0, "score": 0.0, "write": 0.0}
+    n_rows, created = 0, False
+    with ConnectionPool(connect=connect, size=pool_size) as pool:
+        batches = read_batches(pool=pool, table=table, key_column=key_column, batch_size=batch_size, paramstyle=paramstyle)
+        while True:
+            start = time.perf_counter()
+            batch = next(batches, None)
+            seconds["read"] += time.perf_counter() - start
+            if batch is None:
+                break
+
+            start = time.perf_counter()
+            scored = score_chunk(chunk=batch[config.FEATURES], compiled=compiled, n_reasons=n_reasons)
+            scored.insert(0, key_column, batch[key_column])
+            seconds["score"] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            if not created:
+                create_predictions_table(pool=pool, scored=scored, table=output_table, key_column=key_column)
+                created = True
+            write_predictions(pool=pool, scored=scored, table=output_table, key_column=key_column, upsert=upsert,
+                              paramstyle=paramstyle)
+            seconds["write"] += time.perf_counter() - start
+
+            n_rows += len(scored)
+            if verbose:
+                print(f"Scored {n_rows:,} rows: " + ", ".join(
+                    f"{stage} {n_rows / max(elapsed, np.finfo(float).eps):,.0f} rows/s" for stage, elapsed in seconds.items()), flush=True)
+    report = {"n_rows": n_rows}
+    for stage, elapsed in seconds.items():
+        report[f"{stage}_seconds"] = elapsed
+        report[f"{stage}_rows_per_s"] = n_rows / max(elapsed, np.finfo(float).eps)
+    return report
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Score the loan applications of a SQLite table and write the predictions back.")
+    parser.add_argument("database", help="SQLite database file")
+    parser.add_argument("--table", default=config.APPLICATIONS_TABLE, help="table with the applications")
+    parser.add_argument("--output-table", default=config.PREDICTIONS_TABLE, help="table the predictions are written to")
+    parser.add_argument("--key", default=config.ID_FEATURE, help="unique column identifying the applications")
+    parser.add_argument("--batch-size", type=int, default=config.BATCH_CHUNK_SIZE, help="rows read, scored and written at once")
+    parser.add_argument("--upsert", action="store_true", help="replace the predictions of applications scored before")
+    parser.add_argument("--compiled", action="store_true", help="score with the compiled NumPy engine")
+    parser.add_argument("--reasons", type=int, default=0, metavar="N",
+                        help="also write the approval probability and N reason codes per application")
+    args = parser.parse_args(argv)
+
+    score_table(connect=functools.partial(sqlite3.connect, args.database), table=args.table, output_table=args.output_table,
+                key_column=args.key, batch_size=args.batch_size, upsert=args.upsert, compiled=args.compiled,
+                n_reasons=args.reasons, paramstyle=sqlite3.paramstyle)
+
+if __name__ == "__main__":
+    main()
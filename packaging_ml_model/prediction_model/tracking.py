@@ -0,0 +1,405 @@
+import argparse
+import getpass
+import os
+import pathlib
+import shutil
+import subprocess
+import sys
+import time
+import tracemalloc
+import uuid
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING
+
+from prediction_model.config import config
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from sklearn.pipeline import Pipeline
+
+# MLflow's run statuses and source types, as stored in the run 'meta.yaml'
+RUN_STATUS:dict[str, int] = {"RUNNING": 1, "FINISHED": 3, "FAILED": 4}
+SOURCE_TYPE_LOCAL:int = 4
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+def _write_yaml(path: str, values: dict) -> None:
+    """Write a flat mapping in the subset of YAML used by the MLflow file store."""
+    lines = []
+    for key, value in values.items():
+        if isinstance(value, str) and (value == "" or value.isdigit()):
+            value = f"'{value}'"
+        elif isinstance(value, list):
+            value = "[]" if not value else value
+        lines.append(f"{key}: {value}")
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+def _read_yaml(path: str) -> dict[str, str]:
+    """Read a flat mapping written by '_write_yaml' or by MLflow."""
+    values = {}
+    with open(path) as f:
+        for line in f:
+            key, sep, value = line.rstrip("\n").partition(": ")
+            if sep:
+                values[key] = value.strip("'")
+    return values
+
+def git_commit() -> str | None:
+    """The current git commit, when run from a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=config.PACKAGE_ROOT_PATH).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+class TrackedRun:
+    """
+    One run of an experiment, written to disk as it is logged.
+
+    Use it as a context manager: the run is marked FINISHED on exit, or FAILED on an exception.
+
+    Parameters
+    ----------
+    path : str
+        Directory of the run.
+
+    meta : dict
+        Content of the run 'meta.yaml'.
+    """
+    def __init__(self, path: str, meta: dict) -> None:
+        self.path: str = path
+        self.meta: dict = meta
+        self.run_id: str = meta["run_id"]
+
+    def _write(self, kind: str, key: str, content: str, mode: str = "w") -> None:
+        filepath = os.path.join(self.path, kind, key)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, mode) as f:
+            f.write(content)
+
+    def log_params(self, params: dict) -> None:
+        """Record parameters; values are stored as strings."""
+        for key, value in params.items():
+            self._write(kind="params", key=key, content=str(value))
+
+    def log_metrics(self, metrics: dict[str, float], step: int = 0) -> None:
+        """Append one value to each metric."""
+        timestamp = _now_ms()
+        for key, value in metrics.items():
+            self._write(kind="metrics", key=key, content=f"{timestamp} {float(value)} {step}\n", mode="a")
+
+    def set_tags(self, tags: dict) -> None:
+        """Record tags, e.g. the git commit of the run."""
+        for key, value in tags.items():
+            self._write(kind="tags", key=key, content=str(value))
+
+    def log_artifact(self, filepath: str) -> None:
+        """Copy a file into the artifacts of the run."""
+        artifacts_path = os.path.join(self.path, "artifacts")
+        os.makedirs(artifacts_path, exist_ok=True)
+        shutil.copyfile(filepath, os.path.join(artifacts_path, os.path.basename(filepath)))
+
+    def end(self, status: str = "FINISHED") -> None:
+        """Mark the run as ended with 'status', one of 'RUN_STATUS'."""
+        self.meta.update(end_time=_now_ms(), status=RUN_STATUS[status])
+        _write_yaml(path=os.path.join(self.path, "meta.yaml"), values=self.meta)
+
+    def __enter__(self) -> 'TrackedRun':
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        self.end(status="FINISHED" if exc_type is None else "FAILED")
+
+class ExperimentTracker:
+    """
+    File-based store of the runs of one experiment, in the layout of MLflow's file store.
+
+    Parameters
+    ----------
+    root : str, default=config.TRACKING_PATH
+        Directory of the store, e.g. an existing 'mlruns' directory.
+
+    experiment_name : str, default=config.EXPERIMENT_NAME
+        Name of the experiment the runs belong to, created on first use.
+    """
+    def __init__(self, root: str = config.TRACKING_PATH, experiment_name: str = config.EXPERIMENT_NAME) -> None:
+        self.root: str = root
+        self.experiment_name: str = experiment_name
+        self._experiment_id: str | None = None
+
+    @property
+    def experiment_id(self) -> str:
+        """Id of the experiment, found by name or created with the next free id."""
+        if self._experiment_id is None:
+            os.makedirs(self.root, exist_ok=True)
+            ids = [name for name in os.listdir(self.root) if name.isdigit()]
+            for experiment_id in ids:
+                meta_path = os.path.join(self.root, experiment_id, "meta.yaml")
+                if os.path.exists(meta_path) and _read_yaml(path=meta_path).get("name") == self.experiment_name:
+                    self._experiment_id = experiment_id
+                    return experiment_id
+            experiment_id = str(max(map(int, ids), default=-1) + 1)
+            experiment_path = os.path.join(self.root, experiment_id)
+            os.makedirs(experiment_path)
+            now = _now_ms()
+            _write_yaml(path=os.path.join(experiment_path, "meta.yaml"), values={
+                "artifact_location": pathlib.Path(experiment_path).resolve().as_uri(),
+                "creation_time": now,
+                "experiment_id": experiment_id,
+                "last_update_time": now,
+                "lifecycle_stage": "active",
+                "name": self.experiment_name,
+            })
+            self._experiment_id = experiment_id
+        return self._experiment_id
+
+    def start_run(self, run_name: str | None = None) -> TrackedRun:
+        """
+        Start a new run, tagged with its source, user and git commit.
+
+        Parameters
+        ----------
+        run_name : str, optional
+            Display name of the run. Defaults to its start time.
+
+        Returns
+        -------
+        TrackedRun
+            The running run.
+        """
+        run_id = uuid.uuid4().hex
+        run_path = os.path.join(self.root, self.experiment_id, run_id)
+        os.makedirs(os.path.join(run_path, "artifacts"))
+        run_name = run_name or time.strftime("%Y%m%d-%H%M%S")
+        meta = {
+            "artifact_uri": pathlib.Path(run_path, "artifacts").resolve().as_uri(),
+            "end_time": "null",
+            "entry_point_name": "",
+            "experiment_id": self.experiment_id,
+            "lifecycle_stage": "active",
+            "run_id": run_id,
+            "run_name": run_name,
+            "run_uuid": run_id,
+            "source_name": "",
+            "source_type": SOURCE_TYPE_LOCAL,
+            "source_version": "",
+            "start_time": _now_ms(),
+            "status": RUN_STATUS["RUNNING"],
+            "tags": [],
+            "user_id": getpass.getuser(),
+        }
+        _write_yaml(path=os.path.join(run_path, "meta.yaml"), values=meta)
+        run = TrackedRun(path=run_path, meta=meta)
+        tags = {"mlflow.runName": run_name, "mlflow.source.name": os.path.abspath(sys.argv[0]) if sys.argv[0] else "",
+                "mlflow.source.type": "LOCAL", "mlflow.user": meta["user_id"]}
+        commit = git_commit()
+        if commit:
+            tags["mlflow.source.git.commit"] = commit
+        run.set_tags(tags=tags)
+        return run
+
+    def runs(self) -> list[dict]:
+        """
+        The finished and failed runs of the experiment, oldest first.
+
+        Returns
+        -------
+        list of dict
+            "run_id", "run_name", "start_time", "status", and the "params", "tags" and
+            latest "metrics" of each run.
+        """
+        experiment_path = os.path.join(self.root, self.experiment_id)
+        runs = []
+        for run_id in os.listdir(experiment_path):
+            run_path = os.path.join(experiment_path, run_id)
+            if not os.path.isfile(os.path.join(run_path, "meta.yaml")):
+                continue
+            meta = _read_yaml(path=os.path.join(run_path, "meta.yaml"))
+            run = {"run_id": run_id, "run_name": meta.get("run_name"), "start_time": int(meta["start_time"]),
+                   "status": int(meta["status"]), "params": {}, "tags": {}, "metrics": {}}
+            for kind in ("params", "tags", "metrics"):
+                kind_path = os.path.join(run_path, kind)
+                for dirpath, _, filenames in os.walk(kind_path):
+                    for filename in filenames:
+                        filepath = os.path.join(dirpath, filename)
+                        with open(filepath) as f:
+                            content = f.read()
+                        key = os.path.relpath(filepath, kind_path).replace(os.sep, "/")
+                        run[kind][key] = float(content.split()[-2]) if kind == "metrics" else content
+            runs.append(run)
+        return sorted(runs, key=lambda run: run["start_time"])
+
+def measure_fit(fit:Callable[[], 'Pipeline']) -> tuple['Pipeline', dict[str, float]]:
+    """
+    Call 'fit' and measure it.
+
+    Parameters
+    ----------
+    fit : callable
+        Fits and returns a pipeline, e.g. 'lambda: fit_pipeline(train_data=train_data)'.
+
+    Returns
+    -------
+    tuple of (Pipeline, dict)
+        The fitted pipeline, and its "fit_seconds" and "fit_peak_memory_mb", the peak of the
+        memory allocated while fitting, traced with 'tracemalloc'.
+    """
+    already_tracing = tracemalloc.is_tracing()
+    if already_tracing:
+        tracemalloc.reset_peak()
+    else:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        fitted_pipeline = fit()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+    return fitted_pipeline, {"fit_seconds": elapsed, "fit_peak_memory_mb": peak / 2**20}
+
+def performance_metrics(fitted_pipeline:'Pipeline', test_data:'pd.DataFrame', repeat:int=config.TRACKING_REPEAT) -> dict[str, float]:
+    """
+    Time every step of a fitted pipeline and its inference throughput on a test set.
+
+    Parameters
+    ----------
+    fitted_pipeline : Pipeline
+        The pipeline to measure.
+
+    test_data : pd.DataFrame
+        Dataset with 'config.FEATURES'.
+
+    repeat : int, default=config.TRACKING_REPEAT
+        Number of timed passes; the fastest one is kept.
+
+    Returns
+    -------
+    dict of str: float
+        "transform_seconds.<step>" of each preprocessing step, "predict_seconds.<step>" of the
+        final estimator, and "inference_rows_per_s.pipeline" and, when the pipeline can be
+        compiled, "inference_rows_per_s.compiled" for batch prediction.
+    """
+    import numpy as np
+
+    from prediction_model.compiled_pipeline import CompiledPipeline
+
+    test_X = test_data[config.FEATURES]
+    metrics: dict[str, float] = {}
+
+    def record(key: str, seconds: float) -> None:
+        metrics[key] = min(seconds, metrics.get(key, np.inf))
+
+    for _ in range(repeat):
+        # The first step copies 'test_X', later steps may transform that copy in place
+        step_input = test_X
+        for name, step in fitted_pipeline.steps[:-1]:
+            start = time.perf_counter()
+            step_input = step.transform(step_input)
+            record(key=f"transform_seconds.{name}", seconds=time.perf_counter() - start)
+        name, estimator = fitted_pipeline.steps[-1]
+        start = time.perf_counter()
+        estimator.predict(step_input)
+        record(key=f"predict_seconds.{name}", seconds=time.perf_counter() - start)
+        start = time.perf_counter()
+        fitted_pipeline.predict(test_X)
+        record(key="inference_seconds.pipeline", seconds=time.perf_counter() - start)
+
+    try:
+        compiled = CompiledPipeline.from_pipeline(pipeline=fitted_pipeline)
+    except (TypeError, ValueError):
+        compiled = None
+    if compiled is not None:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            compiled.predict(data=test_X)
+            record(key="inference_seconds.compiled", seconds=time.perf_counter() - start)
+    for engine in ("pipeline", "compiled"):
+        if f"inference_seconds.{engine}" in metrics:
+            metrics[f"inference_rows_per_s.{engine}"] = len(test_X) / max(metrics.pop(f"inference_seconds.{engine}"), np.finfo(float).eps)
+    return metrics
+
+def log_training_run(fitted_pipeline:'Pipeline', mode:str, dataset_path:str, fit_metrics:dict[str, float],
+                     extra_metrics:dict[str, float]|None=None, extra_params:dict|None=None, saved_models:Iterable[str]=(config.MODEL_NAME, config.ARTIFACT_NAME),
+                     tracker=None) -> str:
+    """
+    Record a training run in the local experiment store.
+
+    Parameters
+    ----------
+    fitted_pipeline : Pipeline
+        The trained pipeline.
+
+    mode : str
+        How it was trained, e.g. "batch", "search", "incremental" or "retrain".
+
+    dataset_path : str
+        The training dataset, relative to 'config.DATA_PATH' or absolute, recorded by path and content fingerprint.
+
+    fit_metrics : dict of str: float
+        Duration and peak memory of the fit, see 'measure_fit'.
+
+    extra_metrics : dict of str: float, optional
+        Further metrics, e.g. the cross-validation score of a search.
+
+    extra_params : dict, optional
+        Further parameters, e.g. the dtypes the dataset was loaded with.
+
+    saved_models : iterable of str, default=(config.MODEL_NAME, config.ARTIFACT_NAME)
+        Files in 'config.SAVE_MODEL_PATH' that were saved for this run: their size is recorded
+        and they are copied into the artifacts of the run.
+
+    tracker : ExperimentTracker, optional
+        The store to record into. Defaults to 'config.TRACKING_PATH'.
+
+    Returns
+    -------
+    str
+        The id of the recorded run.
+    """
+    from prediction_model import __version__
+    from prediction_model.processing.data_handling import get_file_fingerprint, load_dataset
+
+    tracker = ExperimentTracker() if tracker is None else tracker
+    dataset_path = os.path.join(config.DATA_PATH, dataset_path)
+    # Scalar hyperparameters of every step, e.g. "LogisticRegression__C"
+    params = {key: value for key, value in fitted_pipeline.get_params(deep=True).items()
+              if "__" in key and not hasattr(value, "get_params")}
+    with tracker.start_run(run_name=f"{mode}-{time.strftime('%Y%m%d-%H%M%S')}") as run:
+        run.set_tags(tags={"prediction_model.version": __version__})
+        run.log_params(params={"mode": mode, "dataset": os.path.abspath(dataset_path),
+                               "dataset_fingerprint": get_file_fingerprint(filepath=dataset_path),
+                               "estimator": type(fitted_pipeline.steps[-1][1]).__name__, **params, **(extra_params or {})})
+        metrics = {**fit_metrics, **(extra_metrics or {})}
+        if config.TRACKING_REPEAT:
+            test_data = load_dataset(filename=config.TEST_FILE, columns=config.FEATURES)
+            metrics.update(performance_metrics(fitted_pipeline=fitted_pipeline, test_data=test_data))
+        for model_name in saved_models:
+            savepath = os.path.join(config.SAVE_MODEL_PATH, model_name)
+            metrics[f"model_size_bytes.{model_name}"] = os.path.getsize(savepath)
+            run.log_artifact(filepath=savepath)
+        run.log_metrics(metrics=metrics)
+    print(f"Training run has been recorded: {run.run_id}")
+    return run.run_id
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="List the tracked training runs, to spot performance regressions.")
+    parser.add_argument("--root", default=config.TRACKING_PATH)
+    parser.add_argument("--experiment", default=config.EXPERIMENT_NAME)
+    parser.add_argument("--metrics", nargs="+", default=["fit_seconds", "fit_peak_memory_mb", "inference_rows_per_s.pipeline",
+                                                         "inference_rows_per_s.compiled"])
+    args = parser.parse_args(argv)
+
+    runs = ExperimentTracker(root=args.root, experiment_name=args.experiment).runs()
+    widths = [max(len(metric), 12) for metric in args.metrics]
+    print(f"{'run':<28} {'mode':<12} " + " ".join(f"{metric:>{width}}" for metric, width in zip(args.metrics, widths)))
+    for run in runs:
+        values = [run["metrics"].get(metric) for metric in args.metrics]
+        print(f"{run['run_name'][:28]:<28} {run['params'].get('mode', '')[:12]:<12} "
+              + " ".join(f"{'-' if value is None else f'{value:,.4g}':>{width}}" for value, width in zip(values, widths)))
+
+if __name__ == "__main__":
+    main()
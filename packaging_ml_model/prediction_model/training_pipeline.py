@@ -1,18 +1,558 @@
+import argparse
+import copy
+import os
+import time
+from collections.abc import Callable, Iterable
+
+import joblib
+import numpy as np
 import pandas as pd
+from sklearn.base import clone
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import ParameterGrid, StratifiedKFold
+from sklearn.pipeline import Pipeline
 
 from .config import config
-from prediction_model.processing.data_handling import load_dataset, save_pipeline
+from prediction_model.processing.data_handling import iter_dataset_chunks, load_dataset, load_pipeline, save_pipeline
 from prediction_model import pipeline
+from prediction_model.artifact import save_artifact
+from prediction_model.processing.data_preprocessing import CustomLabelEncoder
+from prediction_model.tracking import log_training_run, measure_fit
+
+def split_features_target(data:pd.DataFrame) -> tuple[pd.DataFrame, pd.Series]:
+    """
+    Split a labelled dataset into the model features and the 0/1 encoded target.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        Dataset with 'config.FEATURES' and 'config.TARGET_FEATURE'.
 
-def perform_training() -> None:
-    train_data:pd.DataFrame = load_dataset(filename=config.TRAIN_FILE)
-    train_X:pd.DataFrame = train_data[config.FEATURES]
-    train_y:pd.Series = train_data[config.TARGET_FEATURE].map(arg={
+    Returns
+    -------
+    tuple of (pd.DataFrame, pd.Series)
+        The features and the target, 1 for approved ("Y") loans.
+    """
+    train_X:pd.DataFrame = data[config.FEATURES]
+    train_y:pd.Series = data[config.TARGET_FEATURE].map(arg={
         "N":0,
         "Y":1
     })
-    pipeline.classification_pipeline.fit(X=train_X, y=train_y)
-    save_pipeline(pipeline_to_save=pipeline.classification_pipeline)
+    return train_X, train_y
+
+def fit_pipeline(train_data:pd.DataFrame, pipeline_to_fit:Pipeline|None=None) -> Pipeline:
+    """
+    Fit the classification pipeline on a labelled dataset.
+
+    Parameters
+    ----------
+    train_data : pd.DataFrame
+        Dataset with 'config.FEATURES' and 'config.TARGET_FEATURE'.
+
+    pipeline_to_fit : Pipeline, optional
+        The pipeline to fit. Defaults to 'pipeline.classification_pipeline'.
+
+    Returns
+    -------
+    Pipeline
+        The fitted pipeline.
+    """
+    pipeline_to_fit = pipeline.classification_pipeline if pipeline_to_fit is None else pipeline_to_fit
+    train_X, train_y = split_features_target(data=train_data)
+    pipeline_to_fit.fit(X=train_X, y=train_y)
+    return pipeline_to_fit
+
+def default_param_grid() -> list[dict]:
+    """
+    Candidates of the hyperparameter search: the regularization of the logistic regression,
+    and a logistic SGD classifier as alternative estimator.
+
+    Every candidate has a logistic link and can be compiled, see 'CompiledPipeline'.
+    """
+    step = pipeline.classification_pipeline.steps[-1][0]
+    return [
+        {step: [LogisticRegression(random_state=0, max_iter=1000)],
+         f"{step}__penalty": ["l2"], f"{step}__solver": ["lbfgs", "liblinear"],
+         f"{step}__C": [0.01, 0.1, 1.0, 10.0, 100.0]},
+        {step: [LogisticRegression(random_state=0, max_iter=1000)],
+         f"{step}__penalty": ["l1"], f"{step}__solver": ["liblinear", "saga"],
+         f"{step}__C": [0.01, 0.1, 1.0, 10.0, 100.0]},
+        {step: [SGDClassifier(loss="log_loss", random_state=0)],
+         f"{step}__penalty": ["l2", "l1", "elasticnet"], f"{step}__alpha": [1e-4, 1e-3, 1e-2]},
+    ]
+
+def _fit_preprocessing(preprocessing:Pipeline, X:pd.DataFrame, y:pd.Series, train:np.ndarray, test:np.ndarray) -> tuple:
+    """Fit the preprocessing steps on one training fold and transform both sides of the fold."""
+    preprocessing = clone(preprocessing)
+    start = time.perf_counter()
+    train_Xt = preprocessing.fit_transform(X.iloc[train], y.iloc[train])
+    fit_time = time.perf_counter() - start
+    return train_Xt, y.iloc[train].to_numpy(), preprocessing.transform(X.iloc[test]), y.iloc[test].to_numpy(), fit_time
+
+def _fit_candidate(estimator:Pipeline, params:dict, fold:tuple, scoring:str) -> tuple[float, float, float]:
+    """Fit one candidate on one preprocessed fold, and return its fit time, score time and score."""
+    train_Xt, train_y, test_Xt, test_y, _ = fold
+    estimator = clone(estimator).set_params(**params)
+    start = time.perf_counter()
+    estimator.fit(train_Xt, train_y)
+    fit_time = time.perf_counter() - start
+    start = time.perf_counter()
+    score = get_scorer(scoring)(estimator, test_Xt, test_y)
+    return fit_time, time.perf_counter() - start, score
+
+def search_pipeline(train_data:pd.DataFrame, param_grid:list[dict]|None=None, cv:int=config.CV_FOLDS,
+                    scoring:str=config.SEARCH_SCORING, n_jobs:int=config.SEARCH_N_JOBS) -> tuple[Pipeline, pd.DataFrame]:
+    """
+    Cross-validated grid search over the final estimator of the classification pipeline.
+
+    The preprocessing steps are fitted once per fold and their output is shared by every
+    candidate, so the imputers, encoders and scaler are not refitted per candidate. Folds,
+    then (candidate, fold) pairs, are fitted in parallel. The folds are those of
+    'GridSearchCV(cv=cv)', and so are the scores.
+
+    Parameters
+    ----------
+    train_data : pd.DataFrame
+        Dataset with 'config.FEATURES' and 'config.TARGET_FEATURE'.
+
+    param_grid : list of dict, optional
+        Candidates, as for 'GridSearchCV', whose keys all address the final step.
+        Defaults to 'default_param_grid()'.
+
+    cv : int, default=config.CV_FOLDS
+        Number of stratified folds.
+
+    scoring : str, default=config.SEARCH_SCORING
+        Metric the candidates are ranked by.
+
+    n_jobs : int, default=config.SEARCH_N_JOBS
+        Number of parallel fits, -1 for all cores.
+
+    Returns
+    -------
+    tuple of (Pipeline, pd.DataFrame)
+        The best pipeline refitted on the whole dataset, and the per-candidate report: rank,
+        estimator, parameters, mean/std test score and mean fit/score times, best first.
+
+    Raises
+    ------
+    ValueError
+        If the grid has parameters of other steps than the final one.
+    """
+    template = clone(pipeline.classification_pipeline)
+    step = template.steps[-1][0]
+    candidates = list(ParameterGrid(param_grid or default_param_grid()))
+    other_steps = {key for params in candidates for key in params if key.split("__")[0] != step}
+    if other_steps:
+        raise ValueError(f"Only the final step '{step}' can be searched, got parameters: {sorted(other_steps)}")
+
+    train_X, train_y = split_features_target(data=train_data)
+    splits = StratifiedKFold(n_splits=cv).split(train_X, train_y)
+    parallel = joblib.Parallel(n_jobs=n_jobs)
+    folds = parallel(joblib.delayed(_fit_preprocessing)(template[:-1], train_X, train_y, train, test) for train, test in splits)
+    estimator = Pipeline(steps=[template.steps[-1]])
+    results = np.array(parallel(
+        joblib.delayed(_fit_candidate)(estimator, params, fold, scoring) for params in candidates for fold in folds
+    )).reshape(len(candidates), cv, 3)
+
+    scores = results[:, :, 2]
+    report = pd.DataFrame({
+        "estimator": [type(params.get(step, template.steps[-1][1])).__name__ for params in candidates],
+        "params": [{key.removeprefix(f"{step}__"): value for key, value in params.items() if key != step} for params in candidates],
+        "mean_test_score": scores.mean(axis=1),
+        "std_test_score": scores.std(axis=1),
+        "mean_fit_time": results[:, :, 0].mean(axis=1),
+        "mean_score_time": results[:, :, 1].mean(axis=1),
+    })
+    report.insert(loc=0, column="rank", value=report["mean_test_score"].rank(method="min", ascending=False).astype(int))
+    print(f"Preprocessing fitted once per fold: {np.mean([fold[-1] for fold in folds]):.3f}s per fold")
+
+    best = candidates[int(np.argmax(scores.mean(axis=1)))]
+    best_pipeline = template.set_params(**best)
+    best_pipeline.fit(X=train_X, y=train_y)
+    return best_pipeline, report.sort_values(by=["rank", "mean_fit_time"]).reset_index(drop=True)
+
+def incremental_pipeline() -> Pipeline:
+    """
+    The classification pipeline with a 'partial_fit'-capable final estimator: a logistic
+    'SGDClassifier', which can be compiled like the logistic regression.
+
+    Its regularization, 'alpha=0.01', is the best of the SGD candidates of 'default_param_grid',
+    and keeps the learned weights stable whatever the chunk size.
+    """
+    incremental = clone(pipeline.classification_pipeline)
+    step = incremental.steps[-1][0]
+    return incremental.set_params(**{step: SGDClassifier(loss="log_loss", alpha=0.01, random_state=0)})
+
+def partial_fit_pipeline(chunks:Callable[[], Iterable[pd.DataFrame]], pipeline_to_fit:Pipeline|None=None,
+                         n_epochs:int=config.INCREMENTAL_EPOCHS) -> Pipeline:
+    """
+    Fit a pipeline out of core, on a dataset streamed in chunks.
+
+    Every step that learns statistics ('partial_fit': imputers, label encoder, scaler and
+    final estimator) gets its own pass over the data, on chunks transformed by the steps
+    before it once these are final, so each step sees the data it would see in a batch fit.
+    Steps without 'partial_fit' are stateless and fitted on the first chunk of the next pass.
+    Only one chunk is in memory at a time.
+
+    Parameters
+    ----------
+    chunks : callable
+        Called once per pass, returns an iterable over the chunks of a dataset with
+        'config.FEATURES' and 'config.TARGET_FEATURE', e.g. 'iter_dataset_chunks'.
+
+    pipeline_to_fit : Pipeline, optional
+        The pipeline to fit. Defaults to 'incremental_pipeline()'.
+
+    n_epochs : int, default=config.INCREMENTAL_EPOCHS
+        Number of passes of the final estimator over the data.
+
+    Returns
+    -------
+    Pipeline
+        The fitted pipeline.
+    """
+    pipeline_to_fit = incremental_pipeline() if pipeline_to_fit is None else pipeline_to_fit
+    classes = np.array([0, 1])
+    stateless: list = []
+    for index, (name, step) in enumerate(pipeline_to_fit.steps):
+        if not hasattr(step, "partial_fit"):
+            if index == len(pipeline_to_fit.steps) - 1:
+                raise TypeError(f"The final step '{name}' must support 'partial_fit', got {type(step).__name__}")
+            stateless.append(step)
+            continue
+        fitted = pipeline_to_fit[:index]
+        is_estimator = index == len(pipeline_to_fit.steps) - 1
+        for _ in range(n_epochs if is_estimator else 1):
+            for chunk in chunks():
+                chunk_X, chunk_y = split_features_target(data=chunk)
+                for stateless_step in stateless:
+                    stateless_step.fit(chunk_X, chunk_y)
+                stateless = []
+                chunk_Xt = fitted.transform(chunk_X) if index else chunk_X
+                if is_estimator:
+                    step.partial_fit(chunk_Xt, chunk_y.to_numpy(), classes=classes)
+                else:
+                    step.partial_fit(chunk_Xt, chunk_y)
+    return pipeline_to_fit
+
+# Fitted attributes compared before and after 'retrain_pipeline', per preprocessing step
+RETRAINED_ATTRIBUTES:tuple[str, ...] = ("mean_dict_", "mode_dict_", "label_dict_", "data_min_", "data_max_")
+# Sufficient statistics 'partial_fit' adds the new data to; fits from before they were stored lack them
+SUFFICIENT_STATISTICS:tuple[str, ...] = ("count_dict_", "counts_dict_", "n_samples_seen_")
+
+def _retrained_values(step) -> dict:
+    """The fitted values of 'step' listed in 'RETRAINED_ATTRIBUTES', as {(attribute, feature): value}."""
+    values = {}
+    for attr in RETRAINED_ATTRIBUTES:
+        fitted = getattr(step, attr, None)
+        if isinstance(fitted, dict):
+            values.update({(attr, feature): value for feature, value in fitted.items()})
+        elif fitted is not None:
+            features = getattr(step, "feature_names_in_", range(len(fitted)))
+            values.update({(attr, feature): value for feature, value in zip(features, fitted.tolist())})
+    return values
+
+def backfill_statistics(fitted_pipeline:Pipeline, history:pd.DataFrame) -> Pipeline:
+    """
+    Store the sufficient statistics of the history in the preprocessing steps fitted without them.
+
+    Models saved before the statistics were stored cannot be retrained on new data only. One
+    pass over 'history' fits a copy of each such step on the data it was fitted on, and the
+    statistics of that copy are added to the step; its fitted values are left as they are.
+
+    Parameters
+    ----------
+    fitted_pipeline : Pipeline
+        The fitted pipeline, modified in place.
+
+    history : pd.DataFrame
+        The data the pipeline was fitted on, with 'config.FEATURES'.
+
+    Returns
+    -------
+    Pipeline
+        The pipeline, ready for 'retrain_pipeline'.
+
+    Raises
+    ------
+    ValueError
+        If 'history' is not the data the pipeline was fitted on: the copy of a step fitted on it
+        learns other fitted values.
+    """
+    history_Xt = history[config.FEATURES]
+    for name, step in fitted_pipeline.steps[:-1]:
+        if hasattr(step, "partial_fit") and not any(hasattr(step, attr) for attr in SUFFICIENT_STATISTICS):
+            refit = clone(step).fit(history_Xt)
+            expected, learned = _retrained_values(step=step), _retrained_values(step=refit)
+            if expected.keys() != learned.keys() or any(
+                    not np.isclose(learned[key], value) if isinstance(value, float) else learned[key] != value
+                    for key, value in expected.items()):
+                raise ValueError(f"Step '{name}' learns other values on 'history': it is not the data the pipeline was fitted on")
+            for attr, value in vars(refit).items():
+                if attr.endswith("_") and not hasattr(step, attr):
+                    setattr(step, attr, value)
+        history_Xt = step.transform(history_Xt)
+    return fitted_pipeline
+
+def retrain_pipeline(fitted_pipeline:Pipeline, new_data:pd.DataFrame, n_epochs:int=config.INCREMENTAL_EPOCHS,
+                     tolerance:float=config.DRIFT_TOLERANCE, history:pd.DataFrame|None=None) -> tuple[Pipeline, pd.DataFrame]:
+    """
+    Retrain a fitted pipeline on new data, reusing the preprocessing statistics learned on the history.
+
+    Preprocessing steps with 'partial_fit' add the statistics of 'new_data' (sums, counts and
+    category frequencies stored by 'fit' and 'partial_fit') to those of the history, so their
+    means, modes, labels and ranges are those of a fit on history and new data together.
+    Steps fitted before these statistics were stored first get them from 'history', see
+    'backfill_statistics'. Stateless steps are kept.
+
+    Only a final estimator with 'partial_fit', e.g. that of 'incremental_pipeline', is updated
+    from its stored state: 'n_epochs' passes over the new data continue from its weights, so
+    its retraining time depends on the size of 'new_data' only. The label codes its weights
+    were learned on are then kept, new categories getting the next codes. Any other estimator, including
+    the 'LogisticRegression' of 'pipeline.classification_pipeline', is not updated: it is
+    refitted from scratch on 'history' and 'new_data' together, in time that grows with the history.
+
+    Parameters
+    ----------
+    fitted_pipeline : Pipeline
+        The pipeline to retrain. It is not modified.
+
+    new_data : pd.DataFrame
+        The new partition, with 'config.FEATURES' and 'config.TARGET_FEATURE'.
+
+    n_epochs : int, default=config.INCREMENTAL_EPOCHS
+        Number of passes of a 'partial_fit'-capable final estimator over 'new_data'.
+
+    tolerance : float, default=config.DRIFT_TOLERANCE
+        Relative change beyond which a numerical fitted value is reported as drifted.
+
+    history : pd.DataFrame, optional
+        The data the pipeline was fitted on, with 'config.FEATURES' and 'config.TARGET_FEATURE'.
+        Required when the final estimator has no 'partial_fit', or when a step lacks sufficient statistics.
+
+    Returns
+    -------
+    tuple of (Pipeline, pd.DataFrame)
+        The retrained pipeline, and the drift report: one row per fitted value of each
+        preprocessing step, with its value "before" and "after" retraining and whether it "drifted".
+
+    Raises
+    ------
+    ValueError
+        If a preprocessing step was fitted without sufficient statistics, or if the final
+        estimator has no 'partial_fit', and 'history' is not given.
+    """
+    estimator_name, estimator = fitted_pipeline.steps[-1]
+    if not hasattr(estimator, "partial_fit") and history is None:
+        raise ValueError(f"Final step '{estimator_name}' ({type(estimator).__name__}) has no 'partial_fit' and cannot be "
+                         f"updated on new data only: pass the 'history' it was fitted on, or use 'incremental_pipeline'")
+    retrained:Pipeline = copy.deepcopy(fitted_pipeline)
+    if history is not None:
+        backfill_statistics(fitted_pipeline=retrained, history=history)
+    new_X, new_y = split_features_target(data=new_data)
+    # Codes re-ranked by the new frequencies would no longer match the weights of an updated estimator
+    keep_codes = hasattr(estimator, "partial_fit")
+    rows = []
+    new_Xt = new_X
+    for name, step in retrained.steps[:-1]:
+        if hasattr(step, "partial_fit"):
+            if not any(hasattr(step, attr) for attr in SUFFICIENT_STATISTICS):
+                raise ValueError(f"Step '{name}' was fitted without sufficient statistics: pass the 'history' it was fitted on")
+            before = _retrained_values(step=step)
+            if isinstance(step, CustomLabelEncoder):
+                step.partial_fit(new_Xt, new_y, keep_codes=keep_codes)
+            else:
+                step.partial_fit(new_Xt, new_y)
+            for (attr, feature), after in _retrained_values(step=step).items():
+                previous = before.get((attr, feature))
+                if isinstance(after, float) and isinstance(previous, float):
+                    drifted = not np.isclose(after, previous, rtol=tolerance, atol=0)
+                else:
+                    drifted = after != previous
+                rows.append({"step": name, "attribute": attr, "feature": feature, "before": previous, "after": after, "drifted": drifted})
+        new_Xt = step.transform(new_Xt)
+
+    estimator = retrained.steps[-1][1]
+    if hasattr(estimator, "partial_fit"):
+        for _ in range(n_epochs):
+            estimator.partial_fit(new_Xt, new_y.to_numpy(), classes=estimator.classes_)
+    else:
+        history_X, history_y = split_features_target(data=history)
+        estimator.fit(np.concatenate([retrained[:-1].transform(history_X), new_Xt]), pd.concat([history_y, new_y]))
+    return retrained, pd.DataFrame(rows, columns=["step", "attribute", "feature", "before", "after", "drifted"])
+
+def bytes_per_row(data:pd.DataFrame|np.ndarray) -> float:
+    """Memory of a dataset or of a step output per row, strings included."""
+    total = data.memory_usage(index=False, deep=True).sum() if isinstance(data, pd.DataFrame) else data.nbytes
+    return total / max(len(data), 1)
+
+def compare_compact_dtypes(holdout_fraction:float=0.2, random_state:int=0) -> tuple[pd.DataFrame, dict[str, float]]:
+    """
+    Compare training with the default dtypes and with the compact dtypes of 'config.COMPACT_DTYPES'.
+
+    The training dataset is split into a training and a holdout set, and a copy of the
+    classification pipeline is fitted on each dtype mode of the training set.
+
+    Parameters
+    ----------
+    holdout_fraction : float, default=0.2
+        Fraction of the training dataset held out to measure accuracy.
+
+    random_state : int, default=0
+        Seed of the holdout sample.
+
+    Returns
+    -------
+    tuple of (pd.DataFrame, dict)
+        The "default" and "compact" bytes per row of the loaded holdout set and of the output
+        of every preprocessing step, and the holdout "accuracy_default", "accuracy_compact",
+        their "accuracy_diff", the "prediction_agreement" of both modes and the
+        "max_abs_probability_diff".
+    """
+    columns = config.FEATURES + [config.TARGET_FEATURE]
+    footprints, probabilities, accuracies = {}, {}, {}
+    for mode, compact in (("default", False), ("compact", True)):
+        data:pd.DataFrame = load_dataset(filename=config.TRAIN_FILE, columns=columns, compact=compact)
+        holdout = data.sample(frac=holdout_fraction, random_state=random_state)
+        fitted_pipeline = fit_pipeline(train_data=data.drop(index=holdout.index),
+                                       pipeline_to_fit=clone(pipeline.classification_pipeline))
+        holdout_X, holdout_y = split_features_target(data=holdout)
+        footprint = {"loaded": bytes_per_row(data=holdout_X)}
+        step_output = holdout_X
+        for name, step in fitted_pipeline.steps[:-1]:
+            step_output = step.transform(step_output)
+            footprint[name] = bytes_per_row(data=step_output)
+        footprints[mode] = footprint
+        probabilities[mode] = fitted_pipeline.predict_proba(holdout_X)[:, 1]
+        accuracies[mode] = fitted_pipeline.score(holdout_X, holdout_y)
+
+    report = pd.DataFrame(footprints).rename_axis(index="stage")
+    metrics = {
+        "accuracy_default": accuracies["default"],
+        "accuracy_compact": accuracies["compact"],
+        "accuracy_diff": accuracies["compact"] - accuracies["default"],
+        "prediction_agreement": np.mean((probabilities["default"] >= 0.5) == (probabilities["compact"] >= 0.5)),
+        "max_abs_probability_diff": np.abs(probabilities["default"] - probabilities["compact"]).max(),
+    }
+    return report, metrics
+
+def perform_training(track:bool=config.TRACK_TRAINING_RUNS, compact:bool=False) -> None:
+    train_data:pd.DataFrame = load_dataset(filename=config.TRAIN_FILE, columns=config.FEATURES + [config.TARGET_FEATURE], compact=compact)
+    fitted_pipeline, fit_metrics = measure_fit(fit=lambda: fit_pipeline(train_data=train_data))
+    save_pipeline(pipeline_to_save=fitted_pipeline)
+    save_artifact(pipeline_to_save=fitted_pipeline)
+    if track:
+        log_training_run(fitted_pipeline=fitted_pipeline, mode="batch", fit_metrics=fit_metrics,
+                         dataset_path=os.path.join(config.DATA_PATH, config.TRAIN_FILE),
+                         extra_params={"dtypes": "compact" if compact else "default"},
+                         extra_metrics={"dataset_bytes_per_row": bytes_per_row(data=train_data)})
+
+def perform_compact_report() -> pd.DataFrame:
+    """Print the memory and accuracy of training with compact dtypes, see 'compare_compact_dtypes'."""
+    report, metrics = compare_compact_dtypes()
+    report["saving"] = 1 - report["compact"] / report["default"]
+    print(report.to_string(formatters={"default": "{:.1f}".format, "compact": "{:.1f}".format, "saving": "{:.0%}".format}))
+    print(f"Holdout accuracy: {metrics['accuracy_default']:.4f} default, {metrics['accuracy_compact']:.4f} compact "
+          f"({metrics['accuracy_diff']:+.4f}), {metrics['prediction_agreement']:.2%} of predictions agree, "
+          f"max probability difference {metrics['max_abs_probability_diff']:.2e}")
+    return report
+
+def perform_search(n_jobs:int=config.SEARCH_N_JOBS, cv:int=config.CV_FOLDS, track:bool=config.TRACK_TRAINING_RUNS) -> pd.DataFrame:
+    """Search the best candidate of 'default_param_grid', print the report and save the best pipeline."""
+    train_data:pd.DataFrame = load_dataset(filename=config.TRAIN_FILE, columns=config.FEATURES + [config.TARGET_FEATURE])
+    (best_pipeline, report), fit_metrics = measure_fit(fit=lambda: search_pipeline(train_data=train_data, cv=cv, n_jobs=n_jobs))
+    with pd.option_context("display.max_colwidth", 80, "display.width", 200):
+        print(report.to_string(index=False))
+    print(f"Best {config.SEARCH_SCORING} over {cv} folds: {report['mean_test_score'].iloc[0]:.4f}")
+    save_pipeline(pipeline_to_save=best_pipeline)
+    save_artifact(pipeline_to_save=best_pipeline)
+    if track:
+        log_training_run(fitted_pipeline=best_pipeline, mode="search", fit_metrics=fit_metrics,
+                         dataset_path=os.path.join(config.DATA_PATH, config.TRAIN_FILE),
+                         extra_metrics={f"cv_{config.SEARCH_SCORING}": report["mean_test_score"].iloc[0],
+                                        "n_candidates": len(report)})
+    return report
+
+def perform_incremental_training(filepath:str=os.path.join(config.DATA_PATH, config.TRAIN_FILE),
+                                 chunksize:int=config.BATCH_CHUNK_SIZE, n_epochs:int=config.INCREMENTAL_EPOCHS,
+                                 track:bool=config.TRACK_TRAINING_RUNS) -> None:
+    """Fit 'incremental_pipeline' on a dataset streamed in chunks of 'chunksize' rows, and save it."""
+    columns = config.FEATURES + [config.TARGET_FEATURE]
+    fitted_pipeline, fit_metrics = measure_fit(fit=lambda: partial_fit_pipeline(
+        chunks=lambda: iter_dataset_chunks(filepath=filepath, chunksize=chunksize, columns=columns), n_epochs=n_epochs
+    ))
+    save_pipeline(pipeline_to_save=fitted_pipeline)
+    save_artifact(pipeline_to_save=fitted_pipeline)
+    if track:
+        log_training_run(fitted_pipeline=fitted_pipeline, mode="incremental", fit_metrics=fit_metrics, dataset_path=filepath)
+
+def perform_backfill(history_path:str=os.path.join(config.DATA_PATH, config.TRAIN_FILE)) -> None:
+    """Store the sufficient statistics of the training data in 'history_path' in the saved pipeline and save it."""
+    history:pd.DataFrame = load_dataset(filename=history_path, columns=config.FEATURES + [config.TARGET_FEATURE])
+    fitted_pipeline = backfill_statistics(fitted_pipeline=load_pipeline(pipeline_to_load=config.MODEL_NAME), history=history)
+    save_pipeline(pipeline_to_save=fitted_pipeline)
+    save_artifact(pipeline_to_save=fitted_pipeline)
+
+def perform_retraining(filepath:str, n_epochs:int=config.INCREMENTAL_EPOCHS, track:bool=config.TRACK_TRAINING_RUNS,
+                       history_path:str|None=None) -> pd.DataFrame:
+    """Retrain the saved pipeline on the new data in 'filepath', print the drifted values and save it.
+
+    'history_path', the data the pipeline was fitted on, is needed when its estimator has no 'partial_fit':
+    the 'LogisticRegression' of the default pipeline is then refitted in full on history and new data."""
+    columns = config.FEATURES + [config.TARGET_FEATURE]
+    new_data:pd.DataFrame = load_dataset(filename=filepath, columns=columns)
+    history = None if history_path is None else load_dataset(filename=history_path, columns=columns)
+    fitted_pipeline = load_pipeline(pipeline_to_load=config.MODEL_NAME)
+    (retrained, drift), fit_metrics = measure_fit(fit=lambda: retrain_pipeline(fitted_pipeline=fitted_pipeline, new_data=new_data,
+                                                                               n_epochs=n_epochs, history=history))
+    drifted = drift[drift["drifted"]]
+    estimator_name, estimator = retrained.steps[-1]
+    if not hasattr(estimator, "partial_fit"):
+        print(f"'{estimator_name}' has no 'partial_fit': refitted in full on {len(history):,} history and {len(new_data):,} new rows")
+    print(f"Retrained on {len(new_data):,} new rows, {len(drifted)} of {len(drift)} fitted values drifted")
+    if len(drifted):
+        print(drifted.to_string(index=False))
+    save_pipeline(pipeline_to_save=retrained)
+    save_artifact(pipeline_to_save=retrained)
+    if track:
+        log_training_run(fitted_pipeline=retrained, mode="retrain", fit_metrics=fit_metrics, dataset_path=filepath,
+                         extra_metrics={"n_drifted_values": len(drifted)})
+    return drift
 
 if __name__ == "__main__":
-    perform_training()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Train the classification pipeline.")
+    parser.add_argument("--search", action="store_true", help="select the estimator by cross-validated grid search")
+    parser.add_argument("--n-jobs", type=int, default=config.SEARCH_N_JOBS)
+    parser.add_argument("--cv", type=int, default=config.CV_FOLDS)
+    parser.add_argument("--incremental", metavar="PATH", help="train out of core on this CSV/Parquet/Arrow file")
+    parser.add_argument("--retrain", metavar="PATH",
+                        help="update the saved pipeline with the new data in this file; an estimator without partial_fit, "
+                             "e.g. the default LogisticRegression, is refitted in full on --history and the new data")
+    parser.add_argument("--history", metavar="PATH",
+                        help="data the saved pipeline was fitted on, for --retrain of an estimator without partial_fit "
+                             "or of a pipeline saved without sufficient statistics")
+    parser.add_argument("--backfill", nargs="?", const=os.path.join(config.DATA_PATH, config.TRAIN_FILE), metavar="PATH",
+                        help="store the sufficient statistics of this training data in the saved pipeline, so that "
+                             "--retrain needs no --history for an estimator with partial_fit")
+    parser.add_argument("--chunksize", type=int, default=config.BATCH_CHUNK_SIZE)
+    parser.add_argument("--epochs", type=int, default=config.INCREMENTAL_EPOCHS)
+    parser.add_argument("--no-track", dest="track", action="store_false", default=config.TRACK_TRAINING_RUNS,
+                        help="do not record the run, its metrics and the saved model in 'config.TRACKING_PATH'")
+    parser.add_argument("--compact", action="store_true", help="load the training data with the dtypes of 'config.COMPACT_DTYPES'")
+    parser.add_argument("--compact-report", action="store_true",
+                        help="compare bytes per row and holdout accuracy of the default and compact dtypes, without saving")
+    args = parser.parse_args()
+    if args.compact_report:
+        perform_compact_report()
+    elif args.backfill:
+        perform_backfill(history_path=args.backfill)
+    elif args.search:
+        perform_search(n_jobs=args.n_jobs, cv=args.cv, track=args.track)
+    elif args.retrain:
+        perform_retraining(filepath=args.retrain, n_epochs=args.epochs, track=args.track, history_path=args.history)
+    elif args.incremental:
+        perform_incremental_training(filepath=args.incremental, chunksize=args.chunksize, n_epochs=args.epochs, track=args.track)
+    else:
+        perform_training(track=args.track, compact=args.compact)
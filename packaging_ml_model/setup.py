@@ -47,7 +47,7 @@ setup(
     packages = find_packages(exclude=("tests",)),
     package_data = {"prediction_model":["VERSION"]},
     install_requires = list_requirements(),
-    extras_require = {},
+    extras_require = {"columnar": ["pyarrow>=15.0.0"]},
     include_package_data = True,
     license = "MIT",
     classifiers=[
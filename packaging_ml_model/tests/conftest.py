@@ -0,0 +1,15 @@
+import pandas as pd
+import pytest
+
+from ..prediction_model.config import config
+from ..prediction_model.processing.data_handling import load_dataset
+
+@pytest.fixture
+def test_dataset() -> pd.DataFrame:
+    """The test file, with 'config.ID_FEATURE' and 'config.FEATURES'"""
+    return load_dataset(filename=config.TEST_FILE)
+
+@pytest.fixture
+def test_data(test_dataset) -> pd.DataFrame:
+    """The 'config.FEATURES' of the test file"""
+    return test_dataset[config.FEATURES]
@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from ..prediction_model import predict
+from ..prediction_model.artifact import load_artifact, save_artifact
+from ..prediction_model.config import config
+from ..prediction_model.model_loader import ModelLoader
+
+"""
+What will be tested?
+1. The pipeline and the compiled scorer rebuilt from an artifact predict exactly like the joblib model.
+2. Arrays are read-only views on the mapped file, and the scorer path never imports sklearn.
+3. Files that are not artifacts, or from a newer format version, are rejected.
+"""
+
+ARTIFACT_NAME = "test_model.artifact"
+
+@pytest.fixture(scope="module")
+def artifact():
+    save_artifact(pipeline_to_save=predict.classification_pipeline, artifact_name=ARTIFACT_NAME)
+    yield load_artifact(artifact_name=ARTIFACT_NAME)
+    os.remove(os.path.join(config.SAVE_MODEL_PATH, ARTIFACT_NAME))
+
+def test_rebuilt_models_match(artifact, test_data) -> None:
+    """Test that both rebuilt models give bit-identical probabilities"""
+    expected = predict.classification_pipeline.predict_proba(X=test_data)
+    assert np.array_equal(artifact.to_pipeline().predict_proba(X=test_data), expected)
+    assert np.array_equal(artifact.to_compiled().predict_proba(data=test_data), predict.compiled_pipeline.predict_proba(data=test_data))
+
+    loader = ModelLoader(pipeline_to_load=ARTIFACT_NAME)
+    assert np.array_equal(loader.pipeline.predict_proba(X=test_data), expected)
+    assert loader.fingerprint != predict.model.fingerprint
+
+def test_arrays_are_mapped(artifact) -> None:
+    """Test that fitted arrays are read-only views on the file, and that categories keep their types"""
+    estimator = artifact.to_pipeline().named_steps["LogisticRegression"]
+    assert not estimator.coef_.flags.writeable and estimator.coef_.base is not None
+    assert np.array_equal(estimator.coef_, predict.classification_pipeline.named_steps["LogisticRegression"].coef_)
+    label_dict = artifact.to_pipeline().named_steps["LabelEncoding"].label_dict_
+    assert label_dict == predict.classification_pipeline.named_steps["LabelEncoding"].label_dict_
+    assert all(isinstance(value, float) for value in label_dict["Credit_History"])
+
+def test_scorer_does_not_import_sklearn(artifact) -> None:
+    """Test that loading the compiled scorer from an artifact never imports sklearn"""
+    code = ("import sys; from prediction_model.artifact import load_artifact; "
+            f"load_artifact(artifact_name={ARTIFACT_NAME!r}).to_compiled(); print('sklearn' in sys.modules)")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=config.PACKAGE_ROOT_PATH.parent)
+    assert result.stdout.splitlines()[-1] == "False"
+
+def test_invalid_files(artifact) -> None:
+    """Test that joblib models and artifacts of a newer format are rejected"""
+    with pytest.raises(ValueError, match="Not a model artifact"):
+        load_artifact(artifact_name=config.MODEL_NAME)
+
+    path = os.path.join(config.SAVE_MODEL_PATH, ARTIFACT_NAME)
+    with open(path, "rb") as f:
+        content = f.read()
+    newer = os.path.join(config.SAVE_MODEL_PATH, "newer_" + ARTIFACT_NAME)
+    with open(newer, "wb") as f:
+        f.write(content.replace(b'"format_version": 1', b'"format_version": 9', 1))
+    try:
+        with pytest.raises(ValueError, match="newer than the supported version"):
+            load_artifact(artifact_name="newer_" + ARTIFACT_NAME)
+    finally:
+        os.remove(newer)
@@ -0,0 +1,124 @@
+import importlib.util
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ..prediction_model import batch_job
+from ..prediction_model.batch_job import MANIFEST_FILE, merge_job_output, run_batch_job
+from ..prediction_model.config import config
+from ..prediction_model.predict import explain_predictions, generate_prediction, model
+from ..prediction_model.processing.data_handling import load_dataset
+
+"""
+What will be tested?
+1. A job writes one file per partition and a manifest, and its merged output matches 'generate_prediction'.
+2. A job killed midway only scores its missing partitions when rerun, serially or in worker processes.
+3. A job is never resumed with another model, input or partitioning, nor merged before it is complete.
+4. Partitions with reason codes missing from the first one merge into Parquet and Feather.
+"""
+
+TEST_FILE_PATH:str = os.path.join(config.DATA_PATH, config.TEST_FILE)
+HAS_PYARROW:bool = importlib.util.find_spec("pyarrow") is not None
+
+def test_job_output(tmp_path) -> None:
+    """Test the partitions, the manifest and the merged predictions"""
+    job_dir = str(tmp_path / "job")
+    manifest = run_batch_job(input_path=TEST_FILE_PATH, job_dir=job_dir, chunksize=100, verbose=False)
+    test_data = load_dataset(filename=config.TEST_FILE)
+    n_partitions = -(-len(test_data) // 100)
+    assert manifest["n_partitions"] == len(manifest["partitions"]) == n_partitions
+    assert manifest["model_fingerprint"] == model.fingerprint
+    assert sorted(os.listdir(job_dir)) == sorted([MANIFEST_FILE] + [f"part-{index:05d}.csv" for index in range(n_partitions)])
+    with open(os.path.join(job_dir, MANIFEST_FILE)) as f:
+        assert json.load(f) == manifest
+
+    output_path = str(tmp_path / "predictions.csv")
+    assert merge_job_output(job_dir=job_dir, output_path=output_path) == len(test_data)
+    output = pd.read_csv(output_path)
+    assert list(output[config.ID_FEATURE]) == list(test_data[config.ID_FEATURE])
+    assert np.array_equal(output[config.TARGET_FEATURE], generate_prediction(data_input=test_data)["prediction"])
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_resume_after_failure(tmp_path, monkeypatch, n_jobs) -> None:
+    """Test that a rerun scores only the partitions the failed run did not complete"""
+    job_dir = str(tmp_path / "job")
+    score_partition = batch_job.score_partition
+    scored = []
+
+    def failing_score_partition(chunk, partition_path, *args, **kwargs):
+        if len(scored) == 2:
+            raise RuntimeError("worker killed")
+        scored.append(partition_path)
+        return score_partition(chunk, partition_path, *args, **kwargs)
+
+    monkeypatch.setattr(batch_job, "score_partition", failing_score_partition)
+    with pytest.raises(RuntimeError):
+        run_batch_job(input_path=TEST_FILE_PATH, job_dir=job_dir, chunksize=100, verbose=False)
+    with open(os.path.join(job_dir, MANIFEST_FILE)) as f:
+        assert json.load(f)["partitions"] == {"0": 100, "1": 100}
+
+    monkeypatch.setattr(batch_job, "score_partition", score_partition)
+    mtimes = {name: os.stat(os.path.join(job_dir, name)).st_mtime_ns for name in ("part-00000.csv", "part-00001.csv")}
+    manifest = run_batch_job(input_path=TEST_FILE_PATH, job_dir=job_dir, chunksize=100, n_jobs=n_jobs, verbose=False)
+    assert len(manifest["partitions"]) == manifest["n_partitions"]
+    assert mtimes == {name: os.stat(os.path.join(job_dir, name)).st_mtime_ns for name in mtimes}
+
+    output_path = str(tmp_path / "predictions.csv")
+    merge_job_output(job_dir=job_dir, output_path=output_path)
+    test_data = load_dataset(filename=config.TEST_FILE)
+    assert np.array_equal(pd.read_csv(output_path)[config.TARGET_FEATURE], generate_prediction(data_input=test_data)["prediction"])
+
+def test_changed_settings_are_rejected(tmp_path) -> None:
+    """Test that another model, input or partitioning cannot resume a job, and that incomplete jobs are not merged"""
+    job_dir = str(tmp_path / "job")
+    run_batch_job(input_path=TEST_FILE_PATH, job_dir=job_dir, chunksize=100, verbose=False)
+    with pytest.raises(ValueError, match="chunksize"):
+        run_batch_job(input_path=TEST_FILE_PATH, job_dir=job_dir, chunksize=50, verbose=False)
+
+    # An input edited in place, keeping its size
+    input_path = str(tmp_path / "applications.csv")
+    with open(TEST_FILE_PATH) as f:
+        content = f.read()
+    with open(input_path, "w") as f:
+        f.write(content)
+    edited_job_dir = str(tmp_path / "edited_job")
+    run_batch_job(input_path=input_path, job_dir=edited_job_dir, chunksize=100, verbose=False)
+    with open(input_path, "w") as f:
+        f.write(content.replace("Male", "Mael", 1))
+    with pytest.raises(ValueError, match="input_fingerprint"):
+        run_batch_job(input_path=input_path, job_dir=edited_job_dir, chunksize=100, verbose=False)
+
+    manifest_path = os.path.join(job_dir, MANIFEST_FILE)
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    manifest["model_fingerprint"] = "0" * 64
+    del manifest["partitions"]["3"]
+    # A manifest written before the input was fingerprinted
+    del manifest["input_fingerprint"]
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f)
+    with pytest.raises(ValueError, match="input_fingerprint.*model_fingerprint"):
+        run_batch_job(input_path=TEST_FILE_PATH, job_dir=job_dir, chunksize=100, verbose=False)
+    with pytest.raises(ValueError, match="not complete"):
+        merge_job_output(job_dir=job_dir, output_path=str(tmp_path / "predictions.csv"))
+
+@pytest.mark.skipif(not HAS_PYARROW, reason="needs pyarrow")
+@pytest.mark.parametrize("output_format, merged_format", [("csv", "parquet"), ("feather", "feather")])
+def test_merge_sparse_reasons(tmp_path, output_format, merged_format) -> None:
+    """Test that reason columns empty in the first partition are merged as strings"""
+    job_dir = str(tmp_path / "job")
+    run_batch_job(input_path=TEST_FILE_PATH, job_dir=job_dir, chunksize=5, n_reasons=8, output_format=output_format, verbose=False)
+    first_partition = load_dataset(filename=os.path.join(job_dir, f"part-00000.{output_format}"))
+    empty_reasons = [col for col in first_partition.columns if col.startswith("Reason_") and first_partition[col].isna().all()]
+
+    output_path = str(tmp_path / f"predictions.{merged_format}")
+    merge_job_output(job_dir=job_dir, output_path=output_path)
+    output = load_dataset(filename=output_path)
+    assert any(output[col].notna().any() for col in empty_reasons)
+    test_data = load_dataset(filename=config.TEST_FILE)
+    expected = explain_predictions(data_input=test_data, n_reasons=8)
+    assert np.allclose(output["Probability"], expected["probability"])
+    assert output["Reason_1"].tolist() == expected["reasons"][:, 0].tolist()
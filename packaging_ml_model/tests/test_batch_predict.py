@@ -0,0 +1,63 @@
+import importlib.util
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ..prediction_model.config import config
+from ..prediction_model.processing.data_handling import load_dataset
+from ..prediction_model.predict import generate_prediction
+from ..prediction_model.batch_predict import read_chunks, run_batch_prediction, score_chunk
+
+"""
+What will be tested?
+1. Chunks never exceed the requested size and only keep the needed columns.
+2. Chunked scoring writes the same predictions as scoring the whole file at once.
+3. Parallel scoring keeps the input order.
+4. Parquet and Feather outputs accept reason codes that are missing from the first chunk.
+"""
+
+TEST_FILE_PATH:str = os.path.join(config.DATA_PATH, config.TEST_FILE)
+HAS_PYARROW:bool = importlib.util.find_spec("pyarrow") is not None
+
+def test_read_chunks_bounded() -> None:
+    """Test that chunks are bounded and projected to the ID and feature columns"""
+    chunks = list(read_chunks(input_path=TEST_FILE_PATH, chunksize=50))
+    assert all(len(chunk) <= 50 for chunk in chunks)
+    assert sum(len(chunk) for chunk in chunks) == len(load_dataset(filename=config.TEST_FILE))
+    assert set(chunks[0].columns) == set([config.ID_FEATURE] + config.FEATURES)
+
+def test_batch_prediction_matches_full_prediction(tmp_path) -> None:
+    """Test that the streamed output matches 'generate_prediction' on the full file"""
+    output_path = tmp_path / "predictions.csv"
+    n_rows = run_batch_prediction(input_path=TEST_FILE_PATH, output_path=str(output_path), chunksize=64, verbose=False)
+    test_data = load_dataset(filename=config.TEST_FILE)
+    output = pd.read_csv(output_path)
+    assert n_rows == len(test_data) == len(output)
+    assert list(output[config.ID_FEATURE]) == list(test_data[config.ID_FEATURE])
+    assert np.array_equal(output[config.TARGET_FEATURE], generate_prediction(data_input=test_data)["prediction"])
+
+def test_parallel_batch_prediction_keeps_order(tmp_path) -> None:
+    """Test that scoring shards in worker processes writes the same file as serial scoring"""
+    serial_path, parallel_path = tmp_path / "serial.csv", tmp_path / "parallel.csv"
+    run_batch_prediction(input_path=TEST_FILE_PATH, output_path=str(serial_path), chunksize=40, verbose=False)
+    run_batch_prediction(input_path=TEST_FILE_PATH, output_path=str(parallel_path), chunksize=40, n_jobs=2, verbose=False)
+    assert serial_path.read_text() == parallel_path.read_text()
+
+@pytest.mark.skipif(not HAS_PYARROW, reason="needs pyarrow")
+@pytest.mark.parametrize("output_format, n_reasons, chunksize", [("feather", config.N_REASON_CODES, 20), ("parquet", 8, 5)])
+def test_columnar_output_with_sparse_reasons(tmp_path, output_format, n_reasons, chunksize) -> None:
+    """Test that reason columns empty in the first chunk are typed as strings, not null"""
+    first_scored = score_chunk(chunk=next(read_chunks(input_path=TEST_FILE_PATH, chunksize=chunksize)), n_reasons=n_reasons)
+    empty_reasons = [col for col in first_scored.columns if col.startswith("Reason_") and first_scored[col].isna().all()]
+
+    csv_path, output_path = tmp_path / "predictions.csv", tmp_path / f"predictions.{output_format}"
+    run_batch_prediction(input_path=TEST_FILE_PATH, output_path=str(csv_path), chunksize=chunksize, verbose=False, n_reasons=n_reasons)
+    run_batch_prediction(input_path=TEST_FILE_PATH, output_path=str(output_path), chunksize=chunksize, verbose=False, n_reasons=n_reasons)
+    output, expected = load_dataset(filename=str(output_path)), pd.read_csv(csv_path)
+    assert any(output[col].notna().any() for col in empty_reasons)
+    assert list(output.columns) == list(expected.columns)
+    assert np.allclose(output["Probability"], expected["Probability"])
+    for col in expected.columns.drop("Probability"):
+        assert output[col].replace({np.nan: None}).tolist() == expected[col].replace({np.nan: None}).tolist()
@@ -0,0 +1,52 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ..prediction_model.config import config
+from ..prediction_model.processing.data_handling import iter_dataset_chunks, load_dataset, write_dataset
+from ..prediction_model.batch_predict import run_batch_prediction
+
+pytest.importorskip("pyarrow")
+
+"""
+What will be tested?
+1. Parquet and Feather/Arrow IPC files load like the CSV file, with column projection.
+2. Columnar files are streamed in bounded chunks.
+3. Batch scoring reads and writes columnar files with the same predictions as CSV.
+"""
+
+COLUMNS:list[str] = config.FEATURES + [config.TARGET_FEATURE]
+
+@pytest.fixture(params=["parquet", "feather"])
+def columnar_train_file(request, tmp_path) -> str:
+    filepath = str(tmp_path / f"loan-train.{request.param}")
+    write_dataset(data=load_dataset(filename=config.TRAIN_FILE), filepath=filepath)
+    return filepath
+
+def test_load_columnar_with_projection(columnar_train_file) -> None:
+    """Test that only the requested columns are read, with the CSV values"""
+    expected = load_dataset(filename=config.TRAIN_FILE, columns=COLUMNS)
+    loaded = load_dataset(filename=columnar_train_file, columns=COLUMNS)
+    assert config.ID_FEATURE not in loaded.columns
+    # Arrow returns missing strings as None where the CSV reader returns NaN
+    pd.testing.assert_frame_equal(loaded[expected.columns].replace({None: np.nan}), expected)
+
+def test_columnar_chunks_are_bounded(columnar_train_file) -> None:
+    """Test that columnar files are streamed in chunks of at most 'chunksize' rows"""
+    chunks = list(iter_dataset_chunks(filepath=columnar_train_file, chunksize=100, columns=COLUMNS))
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    assert sum(len(chunk) for chunk in chunks) == len(load_dataset(filename=config.TRAIN_FILE))
+
+@pytest.mark.parametrize("extension", ["parquet", "arrow"])
+def test_columnar_batch_prediction(tmp_path, extension) -> None:
+    """Test that columnar batch scoring matches CSV batch scoring"""
+    input_path = str(tmp_path / f"input.{extension}")
+    write_dataset(data=load_dataset(filename=config.TEST_FILE), filepath=input_path)
+    run_batch_prediction(input_path=os.path.join(config.DATA_PATH, config.TEST_FILE), output_path=str(tmp_path / "expected.csv"), verbose=False)
+    run_batch_prediction(input_path=input_path, output_path=str(tmp_path / f"output.{extension}"), chunksize=50, verbose=False)
+    output = load_dataset(filename=str(tmp_path / f"output.{extension}"))
+    expected = pd.read_csv(tmp_path / "expected.csv")
+    assert np.array_equal(output[config.TARGET_FEATURE], expected[config.TARGET_FEATURE])
+    assert list(output[config.ID_FEATURE]) == list(expected[config.ID_FEATURE])
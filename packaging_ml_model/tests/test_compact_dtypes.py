@@ -0,0 +1,80 @@
+import importlib.util
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.base import clone
+
+from ..prediction_model.batch_predict import run_batch_prediction
+from ..prediction_model.config import config
+from ..prediction_model.predict import generate_prediction
+from ..prediction_model.processing.data_handling import iter_dataset_chunks, load_dataset, write_dataset
+from ..prediction_model.training_pipeline import compare_compact_dtypes, fit_pipeline, pipeline
+
+"""
+What will be tested?
+1. Compact loading gives the dtypes of 'config.COMPACT_DTYPES' from CSV and columnar files, with the same values.
+2. The pipeline keeps them: int8 codes after label encoding, float32 through the log transform and scaling.
+3. A pipeline fitted on compact data predicts like the float64 one, with fewer bytes per row at every step.
+"""
+
+COLUMNS:list[str] = config.FEATURES + [config.TARGET_FEATURE]
+HAS_PYARROW:bool = importlib.util.find_spec("pyarrow") is not None
+
+@pytest.fixture
+def compact_data() -> pd.DataFrame:
+    return load_dataset(filename=config.TRAIN_FILE, columns=COLUMNS, compact=True)
+
+@pytest.mark.parametrize("file_format", ["csv", pytest.param("parquet", marks=pytest.mark.skipif(not HAS_PYARROW, reason="needs pyarrow"))])
+def test_compact_loading(tmp_path, file_format) -> None:
+    """Test the loaded dtypes and values, whole and in chunks"""
+    data = load_dataset(filename=config.TRAIN_FILE, columns=COLUMNS)
+    filepath = str(tmp_path / f"train.{file_format}")
+    write_dataset(data=data, filepath=filepath)
+
+    compact = load_dataset(filename=filepath, compact=True)
+    assert {col: str(compact[col].dtype) for col in config.FEATURES} == config.COMPACT_DTYPES
+    assert compact[config.TARGET_FEATURE].dtype == object
+    pd.testing.assert_frame_equal(compact.astype(data.dtypes), data, check_exact=False, rtol=1e-6)
+
+    chunks = list(iter_dataset_chunks(filepath=filepath, chunksize=100, compact=True))
+    assert all(str(chunk[col].dtype) == dtype for chunk in chunks for col, dtype in config.COMPACT_DTYPES.items())
+
+def test_dtypes_through_pipeline(compact_data) -> None:
+    """Test the dtypes of the label encoding, log transform and scaling outputs"""
+    fitted_pipeline = fit_pipeline(train_data=compact_data, pipeline_to_fit=clone(pipeline.classification_pipeline))
+    steps = dict(fitted_pipeline.steps)
+    step_output = compact_data[config.FEATURES]
+    for name, step in fitted_pipeline.steps[:-1]:
+        step_output = step.transform(step_output)
+        if name == "LabelEncoding":
+            assert all(step_output[col].dtype == np.int8 for col in config.CAT_FEATURES)
+        if name == "LogTransformation":
+            assert all(step_output[col].dtype == np.float32 for col in config.FEATURES_TO_LOG_TRANSFORM)
+            assert np.isfinite(step_output[config.FEATURES_TO_LOG_TRANSFORM]).all().all()
+    assert step_output.dtype == np.float32
+    assert steps["MeanImputation"].transform(compact_data[config.FEATURES])[config.NUM_FEATURES].notna().all().all()
+
+def test_compact_predictions(tmp_path, compact_data) -> None:
+    """Test that compact and float64 pipelines agree, and that compact batch scoring matches"""
+    default_pipeline = fit_pipeline(train_data=load_dataset(filename=config.TRAIN_FILE, columns=COLUMNS),
+                                    pipeline_to_fit=clone(pipeline.classification_pipeline))
+    compact_pipeline = fit_pipeline(train_data=compact_data, pipeline_to_fit=clone(pipeline.classification_pipeline))
+    test_data = load_dataset(filename=config.TEST_FILE)
+    assert np.allclose(compact_pipeline.predict_proba(test_data[config.FEATURES]),
+                       default_pipeline.predict_proba(test_data[config.FEATURES]), atol=1e-5)
+
+    output_path = str(tmp_path / "predictions.csv")
+    run_batch_prediction(input_path=os.path.join(config.DATA_PATH, config.TEST_FILE), output_path=output_path,
+                         chunksize=100, verbose=False, compact=True)
+    assert np.array_equal(pd.read_csv(output_path)[config.TARGET_FEATURE], generate_prediction(data_input=test_data)["prediction"])
+
+def test_compact_report() -> None:
+    """Test that every stage is smaller in compact mode and that accuracy is unchanged"""
+    report, metrics = compare_compact_dtypes()
+    assert list(report.columns) == ["default", "compact"]
+    assert report.index[0] == "loaded" and len(report) == len(pipeline.classification_pipeline.steps)
+    assert (report["compact"] < report["default"]).all()
+    assert abs(metrics["accuracy_diff"]) <= 0.01
+    assert metrics["prediction_agreement"] >= 0.99
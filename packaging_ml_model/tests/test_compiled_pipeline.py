@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from ..prediction_model.predict import classification_pipeline, compiled_pipeline, generate_prediction
+
+"""
+What will be tested?
+1. The compiled scorer predicts exactly like 'classification_pipeline'.
+2. Missing values are imputed and unseen categories are rejected like in the pipeline.
+"""
+
+def test_compiled_predictions_match_pipeline(test_data) -> None:
+    """Test that labels and probabilities are bit-for-bit identical"""
+    assert np.array_equal(compiled_pipeline.predict(data=test_data), classification_pipeline.predict(X=test_data))
+    assert np.array_equal(compiled_pipeline.predict_proba(data=test_data), classification_pipeline.predict_proba(X=test_data))
+
+def test_compiled_generate_prediction(test_data) -> None:
+    """Test that the compiled path returns the same 'Y'/'N' output"""
+    expected = generate_prediction(data_input=test_data)["prediction"]
+    assert np.array_equal(generate_prediction(data_input=test_data, compiled=True)["prediction"], expected)
+
+def test_compiled_missing_values_match_pipeline(test_data) -> None:
+    """Test that rows with missing values are imputed like in the pipeline"""
+    missing = test_data[test_data.isna().any(axis=1)]
+    assert len(missing) > 0
+    assert np.array_equal(compiled_pipeline.predict_proba(data=missing), classification_pipeline.predict_proba(X=missing))
+
+def test_compiled_unseen_category_raises(test_data) -> None:
+    """Test that an unseen category is rejected instead of silently scored"""
+    data = test_data[:1].copy()
+    data["Property_Area"] = "Downtown"
+    with pytest.raises(ValueError):
+        compiled_pipeline.predict(data=data)
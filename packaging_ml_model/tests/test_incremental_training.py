@@ -0,0 +1,57 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.base import clone
+from sklearn.metrics import roc_auc_score
+
+from ..prediction_model.compiled_pipeline import CompiledPipeline
+from ..prediction_model.config import config
+from ..prediction_model.processing.data_handling import iter_dataset_chunks, load_dataset
+from ..prediction_model.training_pipeline import (fit_pipeline, partial_fit_pipeline, pipeline,
+                                                  split_features_target)
+
+"""
+What will be tested?
+1. Imputation values, label maps and scaler ranges learned from chunks equal those of a batch fit.
+2. The incremental model scores like the batch model within tolerance, and can be compiled.
+3. A final step without 'partial_fit' is rejected.
+"""
+
+TRAIN_PATH = os.path.join(config.DATA_PATH, config.TRAIN_FILE)
+
+def read_chunks(chunksize: int):
+    return lambda: iter_dataset_chunks(filepath=TRAIN_PATH, chunksize=chunksize,
+                                       columns=config.FEATURES + [config.TARGET_FEATURE])
+
+@pytest.fixture(scope="module")
+def batch_pipeline():
+    return fit_pipeline(train_data=load_dataset(filename=config.TRAIN_FILE), pipeline_to_fit=clone(pipeline.classification_pipeline))
+
+@pytest.mark.parametrize("chunksize", [50, 1000])
+def test_statistics_match_batch_fit(batch_pipeline, chunksize) -> None:
+    """Test that every preprocessing step learns the state of the batch fit"""
+    incremental = partial_fit_pipeline(chunks=read_chunks(chunksize=chunksize))
+    batch_steps, incremental_steps = batch_pipeline.named_steps, incremental.named_steps
+    assert incremental_steps["MeanImputation"].mean_dict_ == pytest.approx(batch_steps["MeanImputation"].mean_dict_)
+    assert incremental_steps["ModeImputation"].mode_dict_ == batch_steps["ModeImputation"].mode_dict_
+    assert incremental_steps["LabelEncoding"].label_dict_ == batch_steps["LabelEncoding"].label_dict_
+    for attr in ("data_min_", "data_max_", "scale_", "min_"):
+        assert np.allclose(getattr(incremental_steps["MinMaxScaling"], attr), getattr(batch_steps["MinMaxScaling"], attr))
+
+def test_incremental_model_scores_like_batch(batch_pipeline) -> None:
+    """Test that the SGD model is within tolerance of the batch logistic regression, and compiles"""
+    incremental = partial_fit_pipeline(chunks=read_chunks(chunksize=100))
+    train_X, train_y = split_features_target(data=load_dataset(filename=config.TRAIN_FILE))
+    batch_auc = roc_auc_score(train_y, batch_pipeline.predict_proba(X=train_X)[:, 1])
+    assert roc_auc_score(train_y, incremental.predict_proba(X=train_X)[:, 1]) == pytest.approx(batch_auc, abs=0.05)
+    assert (incremental.predict(X=train_X) == batch_pipeline.predict(X=train_X)).mean() > 0.95
+
+    compiled = CompiledPipeline.from_pipeline(pipeline=incremental)
+    assert np.allclose(compiled.predict_proba(data=train_X), incremental.predict_proba(X=train_X), rtol=0, atol=1e-12)
+
+def test_final_step_must_support_partial_fit() -> None:
+    """Test that the logistic regression of 'classification_pipeline' cannot be fitted incrementally"""
+    with pytest.raises(TypeError, match="must support 'partial_fit'"):
+        partial_fit_pipeline(chunks=read_chunks(chunksize=100), pipeline_to_fit=clone(pipeline.classification_pipeline))
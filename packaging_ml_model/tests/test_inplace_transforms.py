@@ -0,0 +1,64 @@
+import copy
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ..prediction_model.config import config
+from ..prediction_model.pipeline import set_single_copy
+from ..prediction_model.processing import data_preprocessing as data_pp
+from ..prediction_model.processing.data_handling import load_dataset, load_pipeline
+
+"""
+What will be tested?
+1. With copy=False the transformers modify the input DataFrame in place.
+2. A single-copy pipeline never modifies the caller's DataFrame and predicts identically.
+3. A single-copy pipeline has a lower peak memory than copying in every step.
+"""
+
+@pytest.fixture
+def large_data() -> pd.DataFrame:
+    test_data:pd.DataFrame = load_dataset(filename=config.TEST_FILE)[config.FEATURES]
+    return pd.concat([test_data] * 100, ignore_index=True)
+
+def peak_memory(func) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def test_transformers_in_place() -> None:
+    """Test that copy=False transforms and returns the input DataFrame itself"""
+    data = pd.DataFrame({"ApplicantIncome": [1.0, np.nan], "CoapplicantIncome": [2.0, 3.0]})
+    imputer = data_pp.MeanImputer(numerical_features=["ApplicantIncome"], copy=False).fit(data)
+    assert imputer.transform(data) is data
+    assert data["ApplicantIncome"].tolist() == [1.0, 1.0]
+    assert data_pp.DropColumns(columns_to_drop=["CoapplicantIncome"], copy=False).transform(data) is data
+    assert list(data.columns) == ["ApplicantIncome"]
+
+def test_single_copy_pipeline_keeps_input(large_data) -> None:
+    """Test that only the first step copies and that results are unchanged"""
+    pipeline = load_pipeline(pipeline_to_load=config.MODEL_NAME)
+    # Baseline where every step copies its input, whatever the setting saved with the model
+    for _, step in pipeline.steps[:-1]:
+        if "copy" in step.get_params(deep=False):
+            step.set_params(copy=True)
+    single_copy = set_single_copy(pipeline=copy.deepcopy(pipeline))
+    original = large_data.copy()
+    assert np.array_equal(single_copy.predict_proba(X=large_data), pipeline.predict_proba(X=large_data))
+    assert large_data.equals(original)
+
+def test_single_copy_pipeline_lowers_peak_memory(large_data) -> None:
+    """Test with tracemalloc that avoiding per-step copies reduces peak memory"""
+    pipeline = load_pipeline(pipeline_to_load=config.MODEL_NAME)
+    # Baseline where every step copies its input, whatever the setting saved with the model
+    for _, step in pipeline.steps[:-1]:
+        if "copy" in step.get_params(deep=False):
+            step.set_params(copy=True)
+    single_copy = set_single_copy(pipeline=copy.deepcopy(pipeline))
+    peak_copying = peak_memory(lambda: pipeline.predict(X=large_data))
+    peak_single_copy = peak_memory(lambda: single_copy.predict(X=large_data))
+    assert peak_single_copy < 0.8 * peak_copying
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from ..prediction_model.config import config
+from ..prediction_model.predict import classification_pipeline, compiled_pipeline
+from ..prediction_model.processing.data_preprocessing import CustomLabelEncoder
+
+"""
+What will be tested?
+1. Categorical code tables encode exactly like the fitted 'label_dict_'.
+2. Category dtype input is encoded like object dtype input.
+3. Unseen categories go to the configurable 'unknown_value' bucket.
+4. 'partial_fit' re-ranks the codes by frequency, or keeps them and appends new categories.
+"""
+
+def test_codes_match_label_dict(test_data) -> None:
+    """Test that the codes are those of 'label_dict_'"""
+    data = test_data.dropna()
+    encoder = CustomLabelEncoder(categorical_features=config.FEATURES_TO_ENCODE).fit(data)
+    encoded = encoder.transform(data)
+    for col in config.FEATURES_TO_ENCODE:
+        assert encoded[col].tolist() == data[col].map(encoder.label_dict_[col]).tolist()
+
+def test_category_dtype_input(test_data) -> None:
+    """Test that category dtype input scores like object dtype input"""
+    category_data = test_data.astype({col: "category" for col in ["Gender", "Married", "Dependents", "Property_Area"]})
+    expected = classification_pipeline.predict_proba(X=test_data)
+    assert np.array_equal(classification_pipeline.predict_proba(X=category_data), expected)
+    assert np.array_equal(compiled_pipeline.predict_proba(data=category_data), expected)
+
+def test_unknown_value_bucket(test_data) -> None:
+    """Test the default NaN and an explicit unknown bucket"""
+    data = pd.DataFrame({"Property_Area": ["Urban", "Downtown"]})
+    default = CustomLabelEncoder(categorical_features=["Property_Area"]).fit(test_data)
+    bucket = CustomLabelEncoder(categorical_features=["Property_Area"], unknown_value=-1).fit(test_data)
+    assert np.isnan(default.transform(data)["Property_Area"][1])
+    assert bucket.transform(data)["Property_Area"].tolist() == [default.label_dict_["Property_Area"]["Urban"], -1]
+
+def test_partial_fit_keep_codes() -> None:
+    """Test that 'keep_codes' keeps the codes of known categories when their frequencies change"""
+    history = pd.DataFrame({"Property_Area": ["Rural"] + ["Urban"] * 3})
+    new_data = pd.DataFrame({"Property_Area": ["Rural"] * 5 + ["Semiurban"] * 2})
+    reranked = CustomLabelEncoder(categorical_features=["Property_Area"]).fit(history).partial_fit(new_data)
+    assert reranked.label_dict_["Property_Area"] == {"Semiurban": 0, "Urban": 1, "Rural": 2}
+
+    kept = CustomLabelEncoder(categorical_features=["Property_Area"]).fit(history).partial_fit(new_data, keep_codes=True)
+    assert kept.label_dict_["Property_Area"] == {"Rural": 0, "Urban": 1, "Semiurban": 2}
+    assert kept.transform(new_data)["Property_Area"].tolist() == [0] * 5 + [2] * 2
+    assert kept.counts_dict_ == reranked.counts_dict_
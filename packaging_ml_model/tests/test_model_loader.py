@@ -0,0 +1,47 @@
+import pathlib
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from ..prediction_model import __version__
+from ..prediction_model.model_loader import ModelLoader
+
+"""
+What will be tested?
+1. Importing 'prediction_model.predict' neither loads the model nor imports sklearn or pandas.
+2. Concurrent first accesses load the model exactly once.
+3. 'warmup' loads the model and 'reload' replaces it.
+"""
+
+def test_version_is_read() -> None:
+    """Test that the package version is read from the VERSION file"""
+    assert __version__
+
+def test_import_is_lazy() -> None:
+    """Test that the import does not load the model or the heavy dependencies"""
+    code = ("import sys; import prediction_model.predict as p; "
+            "print(p.model.loaded, 'sklearn' in sys.modules, 'pandas' in sys.modules)")
+    package_dir = pathlib.Path(__file__).resolve().parent.parent
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=package_dir)
+    assert result.stdout.split() == ["False", "False", "False"]
+
+def test_concurrent_first_access_loads_once(monkeypatch) -> None:
+    """Test that the singleton is loaded once under concurrent access"""
+    loader = ModelLoader()
+    calls = []
+    original_load = loader._load
+    monkeypatch.setattr(loader, "_load", lambda: calls.append(1) or original_load())
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        pipelines = list(executor.map(lambda _: loader.pipeline, range(8)))
+    assert len(calls) == 1
+    assert all(pipeline is pipelines[0] for pipeline in pipelines)
+
+def test_warmup_and_reload() -> None:
+    """Test the explicit warmup and reload hooks"""
+    loader = ModelLoader()
+    assert not loader.loaded
+    loader.warmup()
+    assert loader.loaded
+    pipeline = loader.pipeline
+    loader.reload()
+    assert loader.pipeline is not pipeline
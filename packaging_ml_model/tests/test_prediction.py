@@ -1,15 +1,18 @@
 import pytest
+import numpy as np
 import pandas as pd
 
 from ..prediction_model.config import config
 from ..prediction_model.processing.data_handling import load_dataset
-from ..prediction_model.predict import generate_prediction
+from ..prediction_model.predict import classification_pipeline, generate_prediction, predict_many, predict_one
 
 """
 What will be tested?
 1. The output is not None.
 2. The output returns string datatype.
 3. The output is 'Y' or not for sample test data.
+4. 'predict_one' and 'predict_many' agree exactly with the pipeline.
+5. 'pd.NA' values, e.g. from nullable-dtype frames, are imputed like NaN.
 """
 
 @pytest.fixture
@@ -29,4 +32,40 @@ def test_single_prediction_is_str_dtype(single_prediction) -> None:
 
 def test_single_prediction_validate(single_prediction) -> None:
     """Test whether the Output is 'Y' or not"""
-    assert single_prediction.get("prediction")[0] == "Y"
\ No newline at end of file
+    assert single_prediction.get("prediction")[0] == "Y"
+
+@pytest.fixture
+def test_records() -> list[dict]:
+    test_data:pd.DataFrame = load_dataset(filename=config.TEST_FILE)
+    return test_data[config.FEATURES].to_dict(orient="records")
+
+def test_predict_one_matches_pipeline(test_records) -> None:
+    """Test that single-record scoring agrees exactly with the pipeline on each row"""
+    for record in test_records[:50]:
+        result = predict_one(record=record)
+        expected = classification_pipeline.predict_proba(X=pd.DataFrame([record]))[0, 1]
+        assert result["probability"] == expected
+        assert result["prediction"] == ("Y" if expected > 0.5 else "N")
+
+def test_predict_one_imputes_missing_keys() -> None:
+    """Test that an empty record is imputed like an all-missing row"""
+    expected = classification_pipeline.predict_proba(X=pd.DataFrame({col: [np.nan] for col in config.FEATURES}))[0, 1]
+    assert predict_one(record={})["probability"] == expected
+
+def test_predict_many_matches_pipeline(test_records) -> None:
+    """Test that list scoring agrees exactly with the pipeline on the whole batch"""
+    result = predict_many(records=test_records)
+    expected = classification_pipeline.predict_proba(X=pd.DataFrame(test_records))[:, 1]
+    assert np.array_equal(result["probability"], expected)
+    assert np.array_equal(result["prediction"], generate_prediction(data_input=test_records)["prediction"])
+
+def test_pd_na_is_imputed(test_records) -> None:
+    """Test that records holding 'pd.NA' score like records holding NaN"""
+    record = dict(test_records[0], LoanAmount=pd.NA, Gender=pd.NA)
+    expected = predict_one(record=dict(record, LoanAmount=np.nan, Gender=np.nan))
+    assert predict_one(record=record) == expected
+    result = predict_many(records=[record, test_records[1]])
+    assert result["probability"][0] == expected["probability"]
+    nullable = pd.DataFrame(test_records[:20]).convert_dtypes()
+    nullable.loc[0, ["LoanAmount", "Gender"]] = pd.NA
+    assert predict_many(records=nullable.to_dict("records"))["probability"][0] == expected["probability"]
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ..prediction_model import predict
+from ..prediction_model.cache import PredictionCache, frame_keys, record_key
+from ..prediction_model.config import config
+
+"""
+What will be tested?
+1. Cached predictions are identical to uncached ones, and only misses are scored.
+2. Keys ignore the representation of equal values and of missing values.
+3. LRU and TTL eviction, and invalidation when the model fingerprint changes.
+"""
+
+@pytest.fixture
+def cache():
+    cache = predict.enable_cache(max_size=10_000)
+    yield cache
+    predict.disable_cache()
+
+def test_cached_predictions_match(cache, test_data) -> None:
+    """Test that batch and single-record paths share the cache and agree with the model"""
+    expected = predict.generate_prediction(data_input=test_data[:100])["prediction"]
+    n_unique = len(set(frame_keys(data=test_data[:100])))
+    assert np.array_equal(predict.generate_prediction(data_input=test_data[:100])["prediction"], expected)
+    assert cache.stats()["misses"] == 100 and len(cache) == n_unique
+
+    cache_misses = cache.misses
+    result = predict.generate_prediction(data_input=test_data[:150])["prediction"]
+    assert cache.misses - cache_misses == 50
+    records = test_data[config.FEATURES].to_dict(orient="records")
+    assert predict.predict_one(record=records[0])["prediction"] == result[0]
+    assert np.array_equal(predict.predict_many(records=records[:150])["prediction"], result)
+
+def test_keys_normalize_values() -> None:
+    """Test that equal and missing values produce equal keys"""
+    frame = pd.DataFrame({col: [np.nan] for col in config.FEATURES}).assign(ApplicantIncome=5720.0)
+    assert frame_keys(data=frame) == [record_key(record={"ApplicantIncome": 5720, "Gender": None})]
+    assert record_key(record={"ApplicantIncome": 5720, "Gender": pd.NA}) == frame_keys(data=frame)[0]
+
+def test_lru_and_ttl_eviction(monkeypatch) -> None:
+    """Test that the least recently used and expired entries are evicted"""
+    lru = PredictionCache(max_size=2)
+    lru.get_many(keys=[], fingerprint="m")
+    lru.put_many(items=[("a", 1), ("b", 2)], fingerprint="m")
+    lru.get_many(keys=["a"], fingerprint="m")
+    lru.put_many(items=[("c", 3)], fingerprint="m")
+    assert lru.get_many(keys=["a", "b", "c"], fingerprint="m") == [1, None, 3]
+    assert lru.evictions == 1
+
+    now = [0.0]
+    monkeypatch.setattr("time.monotonic", lambda: now[0])
+    ttl = PredictionCache(ttl=10)
+    ttl.get_many(keys=[], fingerprint="m")
+    ttl.put_many(items=[("a", 1)], fingerprint="m")
+    now[0] = 11.0
+    assert ttl.get_many(keys=["a"], fingerprint="m") == [None]
+    assert ttl.expirations == 1
+
+def test_new_model_invalidates() -> None:
+    """Test that entries scored by another model are dropped"""
+    cache = PredictionCache()
+    cache.get_many(keys=[], fingerprint="old")
+    cache.put_many(items=[("a", 1)], fingerprint="old")
+    assert cache.get_many(keys=["a"], fingerprint="new") == [None]
+    assert cache.invalidations == 1
+    cache.put_many(items=[("a", 1)], fingerprint="old")
+    assert len(cache) == 0
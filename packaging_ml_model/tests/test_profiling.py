@@ -0,0 +1,114 @@
+import json
+import pickle
+
+import numpy as np
+import pytest
+from sklearn.base import clone
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import MinMaxScaler
+
+from ..prediction_model import pipeline, predict
+from ..prediction_model.config import config
+from ..prediction_model.model_loader import ModelLoader
+from ..prediction_model.processing.data_handling import load_dataset
+from ..prediction_model.profiling import PipelineProfiler
+from ..prediction_model.training_pipeline import fit_pipeline
+
+"""
+What will be tested?
+1. Every step of the pipeline is recorded, once per call, with its rows, under its pipeline name.
+2. Predictions are unchanged while profiling, only the profiled step objects are instrumented and 'disable' restores them.
+3. Prometheus and trace file exports.
+"""
+
+@pytest.fixture
+def profiler():
+    profiler = PipelineProfiler()
+    yield profiler
+    profiler.disable()
+
+def test_every_step_is_recorded(profiler, test_data) -> None:
+    """Test that a prediction records each transformer once and the final predictor once"""
+    expected = predict.classification_pipeline.predict_proba(X=test_data)
+    with profiler.enable(pipeline=predict.classification_pipeline, trace_memory=True):
+        result = predict.classification_pipeline.predict_proba(X=test_data)
+    assert np.array_equal(result, expected)
+
+    summary = profiler.summary()
+    step_names = [name for name, _ in pipeline.classification_pipeline.steps]
+    assert list(summary) == step_names
+    for name in step_names[:-1]:
+        assert summary[name]["transform"]["calls"] == 1
+        assert summary[name]["transform"]["rows"] == len(test_data)
+    # 'decision_function' is called by 'predict_proba' and only counted as part of it
+    assert summary["LogisticRegression"] == {"predict_proba": summary["LogisticRegression"]["predict_proba"]}
+    assert summary["MeanImputation"]["transform"]["allocated_bytes"] > 0
+
+def test_fit_is_recorded(profiler) -> None:
+    """Test that fitting a profiled clone records 'fit' and 'transform' of each step under the step names"""
+    train_data = load_dataset(filename=config.TRAIN_FILE)
+    pipeline_to_fit = clone(pipeline.classification_pipeline)
+    profiler.enable(pipeline=pipeline_to_fit)
+    fit_pipeline(train_data=train_data, pipeline_to_fit=pipeline_to_fit)
+    summary = profiler.summary()
+    assert summary["MinMaxScaling"]["fit"]["rows"] == len(train_data)
+    assert summary["LabelEncoding"]["transform"]["calls"] == 1
+    assert summary["LogisticRegression"]["fit"]["calls"] == 1
+
+def test_only_profiled_steps_are_instrumented(profiler, test_data) -> None:
+    """Test that step classes and other pipelines are untouched, and that 'disable' restores the steps"""
+    served = predict.classification_pipeline
+    mean_imputer = type(served.named_steps["MeanImputation"])
+    originals = (mean_imputer.__dict__["transform"], LogisticRegression.predict)
+    other = clone(served)
+    profiler.enable(pipeline=served)
+    assert (mean_imputer.__dict__["transform"], LogisticRegression.predict) == originals
+    assert "predict" in vars(served.named_steps["LogisticRegression"])
+    assert not any("transform" in vars(step) for _, step in other.steps)
+    with pytest.raises(TypeError):
+        pickle.dumps(served)
+
+    profiler.disable()
+    assert not any(method in vars(step) for _, step in served.steps for method in ("fit", "transform", "predict"))
+    restored = pickle.loads(pickle.dumps(served))
+    assert np.array_equal(restored.predict(X=test_data), served.predict(X=test_data))
+    assert profiler.summary() == {}
+
+def test_steps_of_each_pipeline_keep_their_names(profiler, test_data) -> None:
+    """Test that instances of one step class in different pipelines are reported under their own names"""
+    scaler = Pipeline(steps=[("Scaler", MinMaxScaler())]).fit(X=test_data[config.NUM_FEATURES].fillna(0))
+    profiler.enable(pipeline=predict.classification_pipeline).enable(pipeline=scaler)
+    scaler.transform(X=test_data[config.NUM_FEATURES].fillna(0))
+    summary = profiler.summary()
+    assert list(summary) == ["Scaler"] and summary["Scaler"]["transform"]["calls"] == 1
+    predict.classification_pipeline.predict(X=test_data)
+    assert profiler.summary()["MinMaxScaling"]["transform"]["calls"] == 1
+    assert profiler.summary()["Scaler"]["transform"]["calls"] == 1
+
+def test_loaded_models_are_profiled(profiler, test_data) -> None:
+    """Test that a load hook profiles each model swapped in by a 'ModelLoader'"""
+    loader = ModelLoader()
+    loader.load_hooks.append(lambda loaded: profiler.enable(pipeline=loaded.pipeline))
+    loader.current.pipeline.predict(X=test_data)
+    loader.swap(pipeline_to_load=config.MODEL_NAME)
+    loader.current.pipeline.predict(X=test_data)
+    # Warming the swapped model is not recorded
+    assert profiler.summary()["DropColumns"]["transform"]["calls"] == 2
+
+def test_exports(profiler, test_data, tmp_path) -> None:
+    """Test the Prometheus text format and the Chrome trace file"""
+    with profiler.enable(pipeline=predict.classification_pipeline):
+        for _ in range(3):
+            predict.classification_pipeline.predict(X=test_data)
+    text = profiler.to_prometheus()
+    assert '# TYPE pipeline_step_duration_seconds histogram' in text
+    assert 'pipeline_step_calls_total{step="DropColumns",method="transform"} 3' in text
+    assert f'pipeline_step_rows_total{{step="LogisticRegression",method="predict"}} {3 * len(test_data)}' in text
+    assert 'pipeline_step_duration_seconds_bucket{step="LogTransformation",method="transform",le="+Inf"} 3' in text
+
+    profiler.dump_trace(filepath=tmp_path / "trace.json")
+    with open(tmp_path / "trace.json") as f:
+        events = json.load(f)["traceEvents"]
+    assert len(events) == 3 * len(pipeline.classification_pipeline.steps)
+    assert events[0]["name"] == "MeanImputation.transform" and events[0]["args"]["rows"] == len(test_data)
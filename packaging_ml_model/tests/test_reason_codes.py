@@ -0,0 +1,47 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ..prediction_model.batch_predict import run_batch_prediction
+from ..prediction_model.config import config
+from ..prediction_model.predict import classification_pipeline, explain_predictions, generate_prediction
+
+"""
+What will be tested?
+1. Contributions add up, with the intercept, to the decision score, and probabilities are those of the pipeline.
+2. Reasons are the most adverse features of each application, worst first.
+3. The batch job writes the probability and reason columns.
+"""
+
+def test_contributions_add_up_to_score(test_data) -> None:
+    """Test that contributions explain the decision score and that predictions are unchanged"""
+    explained = explain_predictions(data_input=test_data)
+    final_step = classification_pipeline.steps[-1][1]
+    scores = classification_pipeline.decision_function(test_data[config.FEATURES])
+    assert np.allclose(explained["contributions"].sum(axis=1) + final_step.intercept_[0], scores)
+    assert np.allclose(explained["probability"], classification_pipeline.predict_proba(test_data[config.FEATURES])[:, 1], rtol=0, atol=1e-12)
+    assert np.array_equal(explained["prediction"], generate_prediction(data_input=test_data)["prediction"])
+    assert explained["contributions"].index.equals(test_data.index)
+
+@pytest.mark.parametrize("n_reasons", [1, 3, 20])
+def test_reasons_are_most_adverse_features(test_data, n_reasons) -> None:
+    """Test the reasons against a row-by-row reference"""
+    explained = explain_predictions(data_input=test_data, n_reasons=n_reasons)
+    assert explained["reasons"].shape == (len(test_data), min(n_reasons, len(explained["contributions"].columns)))
+    for row, reasons in zip(explained["contributions"].itertuples(index=False), explained["reasons"]):
+        adverse = sorted((value, col) for col, value in zip(explained["contributions"].columns, row) if value < 0)
+        expected = [col for _, col in adverse[:n_reasons]]
+        assert list(reasons) == expected + [None] * (len(reasons) - len(expected))
+
+def test_batch_prediction_writes_reasons(tmp_path, test_data) -> None:
+    """Test the probability and reason columns written by 'run_batch_prediction'"""
+    output_path = os.path.join(tmp_path, "scored.csv")
+    run_batch_prediction(input_path=os.path.join(config.DATA_PATH, config.TEST_FILE), output_path=output_path,
+                         chunksize=100, verbose=False, n_reasons=2)
+    scored = pd.read_csv(output_path)
+    assert list(scored.columns) == [config.ID_FEATURE, config.TARGET_FEATURE, "Probability", "Reason_1", "Reason_2"]
+    explained = explain_predictions(data_input=test_data, n_reasons=2)
+    assert np.allclose(scored["Probability"], explained["probability"])
+    assert scored["Reason_1"].fillna("").tolist() == [reason or "" for reason in explained["reasons"][:, 0]]
@@ -0,0 +1,135 @@
+import os
+import threading
+import time
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.base import clone
+
+from ..prediction_model.config import config
+from ..prediction_model.model_loader import ModelLoader
+from ..prediction_model.processing.data_handling import load_dataset
+from ..prediction_model.registry import ModelRegistry, RegistryWatcher
+from ..prediction_model.training_pipeline import fit_pipeline, pipeline
+
+"""
+What will be tested?
+1. Registered versions are numbered, described by their metadata and promoted through the "current" pointer.
+2. A watcher swaps the served model to each promoted version while requests keep succeeding.
+3. A version that cannot be loaded leaves the previous model in service and is retried with backoff.
+"""
+
+MODEL_PATH = os.path.join(config.SAVE_MODEL_PATH, config.MODEL_NAME)
+
+@pytest.fixture(scope="module")
+def other_model_path(tmp_path_factory) -> str:
+    """A model trained with a different regularization, so that its predictions differ"""
+    other = clone(pipeline.classification_pipeline).set_params(LogisticRegression__C=0.01)
+    path = os.path.join(tmp_path_factory.mktemp("models"), "Other.pkl")
+    joblib.dump(fit_pipeline(train_data=load_dataset(filename=config.TRAIN_FILE), pipeline_to_fit=other), path)
+    return path
+
+def test_register_and_promote(tmp_path) -> None:
+    """Test version numbering, metadata and the current pointer"""
+    registry = ModelRegistry(root=str(tmp_path))
+    assert registry.versions() == [] and registry.current_version() is None
+    assert registry.register(model_path=MODEL_PATH) == "v1"
+    assert registry.current_version() is None
+    assert registry.register(model_path=MODEL_PATH, promote=True) == "v2"
+    assert registry.versions() == ["v1", "v2"] and registry.current_version() == "v2"
+
+    registry.promote(version="v1")
+    assert registry.current_version() == "v1"
+    assert registry.model_path() == os.path.join(tmp_path, "versions", "v1", config.MODEL_NAME)
+    assert registry.metadata(version="v1")["fingerprint"] == registry.metadata(version="v2")["fingerprint"]
+    with pytest.raises(KeyError):
+        registry.promote(version="v3")
+
+def test_watcher_hot_swaps_under_load(tmp_path, other_model_path, test_data) -> None:
+    """Test that promoted versions are served without failing concurrent requests"""
+    registry = ModelRegistry(root=str(tmp_path))
+    first = registry.register(model_path=MODEL_PATH, promote=True)
+    second = registry.register(model_path=other_model_path)
+    expected = {registry.metadata(version=version)["fingerprint"]: joblib.load(registry.model_path(version=version)).predict_proba(test_data)
+                for version in (first, second)}
+
+    loader = ModelLoader()
+    watcher = RegistryWatcher(loader=loader, registry=registry, poll_interval=0.01).start()
+    stop, errors, n_requests = threading.Event(), [], []
+
+    def score() -> None:
+        while not stop.is_set():
+            try:
+                current = loader.current
+                assert np.allclose(current.compiled.predict_proba(data=test_data), expected[current.fingerprint])
+                n_requests.append(1)
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=score) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    try:
+        for n_swaps, version in enumerate((second, first, second), start=2):
+            registry.promote(version=version)
+            deadline = time.monotonic() + 30
+            while watcher.n_swaps < n_swaps and time.monotonic() < deadline:
+                stop.wait(0.01)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+        watcher.stop()
+    assert errors == [] and n_requests
+    assert watcher.n_swaps == 4
+    assert loader.fingerprint == registry.metadata(version=second)["fingerprint"]
+
+def test_failed_version_keeps_serving(tmp_path) -> None:
+    """Test that a broken model file does not replace the served model"""
+    broken_path = os.path.join(tmp_path, "Broken.pkl")
+    with open(broken_path, "wb") as f:
+        f.write(b"not a model")
+    registry = ModelRegistry(root=os.path.join(tmp_path, "registry"))
+    registry.register(model_path=MODEL_PATH, promote=True)
+    loader = ModelLoader()
+    watcher = RegistryWatcher(loader=loader, registry=registry)
+    assert watcher.sync()
+    served = loader.current
+
+    first = watcher.version
+    broken = registry.register(model_path=broken_path)
+    registry.promote(version=broken)
+    assert not watcher.sync()
+    assert loader.current is served
+    assert watcher.version == first and watcher.failed_version == broken
+
+def test_failed_version_is_retried(tmp_path, other_model_path, monkeypatch) -> None:
+    """Test that a version failing to load transiently is retried with backoff, then served"""
+    registry = ModelRegistry(root=os.path.join(tmp_path, "registry"))
+    first = registry.register(model_path=MODEL_PATH, promote=True)
+    loader = ModelLoader()
+    watcher = RegistryWatcher(loader=loader, registry=registry, poll_interval=0.2)
+    assert watcher.sync()
+
+    swap, attempts = loader.swap, []
+
+    def failing_swap(**kwargs):
+        attempts.append(kwargs)
+        if len(attempts) <= 2:
+            raise MemoryError("transient")
+        return swap(**kwargs)
+
+    monkeypatch.setattr(loader, "swap", failing_swap)
+    second = registry.register(model_path=other_model_path, promote=True)
+    assert not watcher.sync() and not watcher.sync()
+    assert len(attempts) == 1 and watcher.version == first and watcher.failed_version == second
+    time.sleep(0.25)
+    assert not watcher.sync()
+    # The second failure doubles the wait
+    time.sleep(0.25)
+    assert not watcher.sync() and len(attempts) == 2
+    time.sleep(0.2)
+    assert watcher.sync()
+    assert watcher.version == second and watcher.failed_version is None
+    assert loader.fingerprint == registry.metadata(version=second)["fingerprint"]
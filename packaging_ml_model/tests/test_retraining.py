@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.base import clone
+
+from ..prediction_model.config import config
+from ..prediction_model.processing.data_handling import load_dataset, load_pipeline
+from ..prediction_model.training_pipeline import (backfill_statistics, fit_pipeline, incremental_pipeline, pipeline,
+                                                  retrain_pipeline, split_features_target)
+
+"""
+What will be tested?
+1. Retraining on new data only learns the preprocessing state of a fit on history and new data together.
+2. A 'partial_fit' estimator is updated on the new data with the label codes it was trained on; others are refitted
+   on history and new data, or rejected.
+3. Drifted values are reported, and fits without sufficient statistics get them from their history or are rejected.
+"""
+
+@pytest.fixture(scope="module")
+def train_data() -> pd.DataFrame:
+    return load_dataset(filename=config.TRAIN_FILE)
+
+def test_preprocessing_matches_full_fit(train_data) -> None:
+    """Test that the stored statistics of the history are combined with those of the new data"""
+    history, new_data = train_data.iloc[:450], train_data.iloc[450:]
+    fitted = fit_pipeline(train_data=history, pipeline_to_fit=clone(pipeline.classification_pipeline))
+    retrained, _ = retrain_pipeline(fitted_pipeline=fitted, new_data=new_data, history=history)
+    full = fit_pipeline(train_data=train_data, pipeline_to_fit=clone(pipeline.classification_pipeline))
+
+    retrained_steps, full_steps = retrained.named_steps, full.named_steps
+    assert retrained_steps["MeanImputation"].mean_dict_ == pytest.approx(full_steps["MeanImputation"].mean_dict_)
+    assert retrained_steps["ModeImputation"].mode_dict_ == full_steps["ModeImputation"].mode_dict_
+    assert retrained_steps["LabelEncoding"].label_dict_ == full_steps["LabelEncoding"].label_dict_
+    for attr in ("data_min_", "data_max_", "scale_", "min_"):
+        assert np.allclose(getattr(retrained_steps["MinMaxScaling"], attr), getattr(full_steps["MinMaxScaling"], attr))
+    assert fitted.named_steps["MeanImputation"].count_dict_["LoanAmount"] < retrained_steps["MeanImputation"].count_dict_["LoanAmount"]
+
+def test_estimator_update(train_data) -> None:
+    """Test the refit of a logistic regression on history and new data, and the 'partial_fit' update of an SGD classifier"""
+    history, new_data = train_data.iloc[:450], train_data.iloc[450:]
+    fitted = fit_pipeline(train_data=history, pipeline_to_fit=clone(pipeline.classification_pipeline))
+    with pytest.raises(ValueError, match="history"):
+        retrain_pipeline(fitted_pipeline=fitted, new_data=new_data)
+    retrained, _ = retrain_pipeline(fitted_pipeline=fitted, new_data=new_data, history=history)
+    full = fit_pipeline(train_data=train_data, pipeline_to_fit=clone(pipeline.classification_pipeline))
+    assert np.allclose(retrained.steps[-1][1].coef_, full.steps[-1][1].coef_, atol=1e-4)
+    assert not np.array_equal(fitted.steps[-1][1].coef_, retrained.steps[-1][1].coef_)
+    X, _ = split_features_target(data=train_data)
+    assert np.allclose(retrained.predict_proba(X), full.predict_proba(X), atol=1e-5)
+
+    fitted_sgd = fit_pipeline(train_data=history, pipeline_to_fit=incremental_pipeline())
+    retrained_sgd, _ = retrain_pipeline(fitted_pipeline=fitted_sgd, new_data=new_data, n_epochs=2)
+    assert retrained_sgd.steps[-1][1].t_ > fitted_sgd.steps[-1][1].t_
+
+def test_updated_estimator_keeps_codes(train_data) -> None:
+    """Test that the codes an updated estimator was trained on are kept when category frequencies flip"""
+    fitted = fit_pipeline(train_data=train_data, pipeline_to_fit=incremental_pipeline())
+    label_dict = fitted.named_steps["LabelEncoding"].label_dict_["Property_Area"]
+    rarest = min(label_dict, key=label_dict.get)
+    new_data = pd.concat([train_data[train_data["Property_Area"] == rarest]] * 5)
+    retrained, drift = retrain_pipeline(fitted_pipeline=fitted, new_data=new_data)
+    assert retrained.named_steps["LabelEncoding"].label_dict_["Property_Area"] == label_dict
+    assert not drift[drift["step"] == "LabelEncoding"]["drifted"].any()
+
+    # A refitted estimator learns the codes of a fit on history and new data
+    fitted_lr = fit_pipeline(train_data=train_data, pipeline_to_fit=clone(pipeline.classification_pipeline))
+    retrained_lr, _ = retrain_pipeline(fitted_pipeline=fitted_lr, new_data=new_data, history=train_data)
+    assert retrained_lr.named_steps["LabelEncoding"].label_dict_["Property_Area"][rarest] == max(label_dict.values())
+
+def test_drift_report_and_old_fits(train_data) -> None:
+    """Test that shifted incomes are reported as drift, and that fits lacking statistics are rejected"""
+    fitted = fit_pipeline(train_data=train_data, pipeline_to_fit=clone(pipeline.classification_pipeline))
+    new_data = train_data.assign(ApplicantIncome=train_data["ApplicantIncome"] * 3)
+    _, drift = retrain_pipeline(fitted_pipeline=fitted, new_data=new_data, history=train_data)
+    drifted = drift[drift["drifted"]]
+    assert ("MeanImputation", "ApplicantIncome") in set(zip(drifted["step"], drifted["feature"]))
+    assert not drift[drift["step"] == "LabelEncoding"]["drifted"].any()
+
+    fitted_sgd = fit_pipeline(train_data=train_data, pipeline_to_fit=incremental_pipeline())
+    del fitted_sgd.named_steps["MeanImputation"].sum_dict_, fitted_sgd.named_steps["MeanImputation"].count_dict_
+    with pytest.raises(ValueError, match="sufficient statistics"):
+        retrain_pipeline(fitted_pipeline=fitted_sgd, new_data=new_data)
+    retrained, _ = retrain_pipeline(fitted_pipeline=fitted_sgd, new_data=new_data, history=train_data)
+    assert retrained.named_steps["MeanImputation"].count_dict_["LoanAmount"] == 2 * train_data["LoanAmount"].count()
+
+def test_backfill_saved_model(train_data) -> None:
+    """Test that the saved model, fitted before statistics were stored, gets them from its training data only"""
+    saved = load_pipeline(pipeline_to_load=config.MODEL_NAME)
+    with pytest.raises(ValueError, match="not the data"):
+        backfill_statistics(fitted_pipeline=saved, history=train_data.iloc[:300])
+
+    mean_dict = dict(saved.named_steps["MeanImputation"].mean_dict_)
+    backfill_statistics(fitted_pipeline=saved, history=train_data)
+    steps = saved.named_steps
+    assert steps["MeanImputation"].mean_dict_ == mean_dict
+    assert steps["MeanImputation"].count_dict_["LoanAmount"] == train_data["LoanAmount"].count()
+    assert sum(steps["ModeImputation"].counts_dict_["Gender"].values()) == train_data["Gender"].count()
+    assert steps["LabelEncoding"].counts_dict_
+
+    retrained, _ = retrain_pipeline(fitted_pipeline=load_pipeline(pipeline_to_load=config.MODEL_NAME),
+                                    new_data=train_data.iloc[:100], history=train_data)
+    assert steps["MeanImputation"].count_dict_["LoanAmount"] < retrained.named_steps["MeanImputation"].count_dict_["LoanAmount"]
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ..prediction_model import predict
+from ..prediction_model.config import config
+from ..prediction_model.processing.data_handling import load_dataset
+
+"""
+What will be tested?
+1. The approval surface matches scoring each offer through the pipeline.
+2. The maximal approvable amount per term is the largest approved amount of the grid.
+3. The surface can be read in long format, and only numerical columns have terms.
+"""
+
+AMOUNTS = np.array([9.0, 50.0, 120.0, 300.0, 700.0, np.nan])
+TERMS = np.array([12.0, 120.0, 360.0, 480.0])
+
+@pytest.fixture
+def applicants() -> pd.DataFrame:
+    return load_dataset(filename=config.TEST_FILE)[config.FEATURES].iloc[:40]
+
+def test_surface_matches_pipeline(applicants) -> None:
+    """Test every offer against a separate pipeline call"""
+    surface = predict.what_if_offers(data_input=applicants, amounts=AMOUNTS, terms=TERMS)
+    assert surface.probability.shape == (len(applicants), len(AMOUNTS), len(TERMS))
+    pipeline = predict.classification_pipeline
+    for j, amount in enumerate(AMOUNTS):
+        for k, term in enumerate(TERMS):
+            offers = applicants.assign(LoanAmount=amount, Loan_Amount_Term=term)
+            assert np.allclose(surface.probability[:, j, k], pipeline.predict_proba(offers)[:, 1])
+            assert np.array_equal(surface.approved()[:, j, k], pipeline.predict(offers) == 1)
+
+def test_max_approvable_amount(applicants) -> None:
+    """Test the largest approved amount per term, and NaN where none is approved"""
+    surface = predict.what_if_offers(data_input=applicants, amounts=AMOUNTS[:-1], terms=TERMS)
+    for threshold in (0.5, 0.8, 1.0):
+        max_amounts = surface.max_approvable_amount(threshold=threshold)
+        assert list(max_amounts.index) == list(applicants.index) and list(max_amounts.columns) == list(TERMS)
+        for i in range(len(applicants)):
+            for k in range(len(TERMS)):
+                approved = AMOUNTS[:-1][surface.probability[i, :, k] > threshold]
+                expected = approved.max() if len(approved) else np.nan
+                assert max_amounts.iat[i, k] == pytest.approx(expected, nan_ok=True)
+    assert max_amounts.isna().all().all()
+
+def test_long_format_and_categorical_columns(applicants) -> None:
+    """Test the long format, and that categorical columns are rejected"""
+    surface = predict.what_if_offers(data_input=applicants, amounts=AMOUNTS, terms=TERMS)
+    frame = surface.to_frame()
+    assert len(frame) == surface.probability.size
+    assert frame["probability"].iat[len(TERMS) + 1] == surface.probability[0, 1, 1]
+    with pytest.raises(ValueError):
+        predict.compiled_pipeline.column_terms(col="Gender", values=["Male"])
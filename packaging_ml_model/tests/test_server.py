@@ -0,0 +1,93 @@
+import asyncio
+import json
+
+import pytest
+
+from ..prediction_model.load_generator import load_records
+from ..prediction_model.predict import predict_one
+from ..prediction_model import server
+from ..prediction_model.server import MicroBatcher, ScoringServer
+
+"""
+What will be tested?
+1. Concurrent '/predict' requests are scored together and get their own results.
+2. '/predict/batch' scores a list of records in one request.
+3. Invalid requests are answered with the right status codes.
+4. A batch that fails unexpectedly fails its own requests only, and the next requests are still scored.
+"""
+
+async def _request(port: int, method: str, path: str, payload=None) -> tuple[int, object]:
+    reader, writer = await asyncio.open_connection(host="127.0.0.1", port=port)
+    body = b"" if payload is None else json.dumps(payload).encode()
+    writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+    response = await reader.read()
+    writer.close()
+    head, _, content = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(content)
+
+async def _with_server(scenario, batcher: MicroBatcher):
+    server = ScoringServer(batcher=batcher)
+    port = await server.start(host="127.0.0.1", port=0)
+    try:
+        return await scenario(port)
+    finally:
+        await server.stop()
+
+@pytest.fixture
+def records() -> list[dict]:
+    return load_records()[:40]
+
+def test_concurrent_requests_are_micro_batched(records) -> None:
+    """Test that concurrent single-record requests share scoring calls and get their own results"""
+    batcher = MicroBatcher(batch_window_ms=50, max_batch_size=16)
+
+    async def scenario(port):
+        return await asyncio.gather(*(_request(port, "POST", "/predict", record) for record in records))
+
+    responses = asyncio.run(_with_server(scenario, batcher))
+    assert batcher.n_records == len(records)
+    assert batcher.n_batches < len(records)
+    for record, (status, result) in zip(records, responses):
+        assert status == 200
+        assert result == pytest.approx(predict_one(record=record))
+
+def test_batch_endpoint(records) -> None:
+    """Test that '/predict/batch' returns one result per record, in order"""
+    status, results = asyncio.run(_with_server(lambda port: _request(port, "POST", "/predict/batch", records), MicroBatcher()))
+    assert status == 200
+    assert [result["prediction"] for result in results] == [predict_one(record=record)["prediction"] for record in records]
+
+def test_invalid_requests(records) -> None:
+    """Test unknown paths, malformed bodies and unseen categories"""
+    async def scenario(port):
+        return [
+            (await _request(port, "POST", "/unknown", {}))[0],
+            (await _request(port, "POST", "/predict", [records[0]]))[0],
+            (await _request(port, "POST", "/predict", dict(records[0], Property_Area="Downtown")))[0],
+            (await _request(port, "GET", "/health"))[0],
+        ]
+
+    assert asyncio.run(_with_server(scenario, MicroBatcher())) == [404, 400, 422, 200]
+
+def test_failing_batch_does_not_stop_batching(records, monkeypatch) -> None:
+    """Test that an unexpected scoring error is answered with 500 and does not end the batching loop"""
+    score_records = server.score_records
+    calls = []
+
+    def failing_once(batch):
+        calls.append(len(batch))
+        if len(calls) == 1:
+            raise RuntimeError("model file is unreadable")
+        return score_records(batch)
+
+    monkeypatch.setattr(server, "score_records", failing_once)
+
+    async def scenario(port):
+        # Were the batching loop ended by the failure, both requests would wait forever
+        failed = await asyncio.wait_for(_request(port, "POST", "/predict", records[0]), timeout=5)
+        return failed, await asyncio.wait_for(_request(port, "POST", "/predict", records[1]), timeout=5)
+
+    (failed_status, failed), (status, result) = asyncio.run(_with_server(scenario, MicroBatcher(batch_window_ms=1)))
+    assert failed_status == 500 and "model file is unreadable" in failed["error"]
+    assert status == 200 and result == pytest.approx(predict_one(record=records[1]))
+    assert len(calls) == 2
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.base import clone
+from sklearn.pipeline import Pipeline
+
+from ..prediction_model import predict
+from ..prediction_model.compiled_pipeline import CompiledPipeline
+from ..prediction_model.config import config
+from ..prediction_model.processing.data_handling import load_dataset
+from ..prediction_model.shadow import ShadowScorer
+from ..prediction_model.training_pipeline import fit_pipeline, pipeline, retrain_pipeline
+
+"""
+What will be tested?
+1. Every model of a shadow scorer gets the probabilities and predictions it would get on its own.
+2. Models with identical fitted preprocessing share one preprocessing pass; others get their own.
+3. Disagreement statistics compare each challenger with the champion.
+"""
+
+@pytest.fixture(scope="module")
+def train_data() -> pd.DataFrame:
+    return load_dataset(filename=config.TRAIN_FILE)
+
+@pytest.fixture(scope="module")
+def models(train_data) -> dict[str, Pipeline]:
+    """The champion, a challenger with another regularization only, and one retrained on shifted incomes"""
+    champion = fit_pipeline(train_data=train_data, pipeline_to_fit=clone(pipeline.classification_pipeline))
+    regularized = fit_pipeline(train_data=train_data,
+                               pipeline_to_fit=clone(pipeline.classification_pipeline).set_params(LogisticRegression__C=0.01))
+    shifted, _ = retrain_pipeline(fitted_pipeline=champion,
+                                  new_data=train_data.assign(ApplicantIncome=train_data["ApplicantIncome"] * 2), history=train_data)
+    return {"champion": champion, "regularized": regularized, "shifted": shifted}
+
+def test_matches_individual_scoring(models, test_data) -> None:
+    """Test per-model probabilities and predictions against each pipeline"""
+    scorer = ShadowScorer(models={name: CompiledPipeline.from_pipeline(pipeline=model) for name, model in models.items()})
+    result = scorer.score(data=test_data)
+    assert list(result.probabilities.columns) == list(models) and result.champion == "champion"
+    for name, model in models.items():
+        assert np.allclose(result.probabilities[name], model.predict_proba(test_data)[:, 1])
+        assert np.array_equal(result.predictions[name], model.predict(test_data))
+
+def test_shared_preprocessing(models, test_data) -> None:
+    """Test that the input is transformed once per distinct preprocessing"""
+    compiled = {name: CompiledPipeline.from_pipeline(pipeline=model) for name, model in models.items()}
+    assert compiled["champion"].shares_preprocessing(other=compiled["regularized"])
+    assert not compiled["champion"].shares_preprocessing(other=compiled["shifted"])
+    assert ShadowScorer(models=compiled).n_preprocessing_passes == 2
+    assert ShadowScorer(models={name: compiled[name] for name in ("champion", "regularized")}).n_preprocessing_passes == 1
+
+    calls = []
+    original = CompiledPipeline.transform_matrix
+    CompiledPipeline.transform_matrix = lambda self, matrix: calls.append(self) or original(self, matrix=matrix)
+    try:
+        ShadowScorer(models=compiled).score(data=test_data)
+    finally:
+        CompiledPipeline.transform_matrix = original
+    assert len(calls) == 2
+
+def test_disagreement(models, test_data) -> None:
+    """Test the disagreement statistics, and shadow scoring with the served model"""
+    challenger = CompiledPipeline.from_pipeline(pipeline=models["regularized"])
+    result = predict.shadow_predictions(data_input=test_data, challengers={"regularized": challenger})
+    disagreement = result.disagreement()
+    assert list(disagreement.index) == ["regularized"]
+
+    served = predict.classification_pipeline
+    disagree = served.predict(test_data) != models["regularized"].predict(test_data)
+    diff = models["regularized"].predict_proba(test_data)[:, 1] - served.predict_proba(test_data)[:, 1]
+    assert disagreement.loc["regularized", "n_disagreements"] == disagree.sum()
+    assert disagreement.loc["regularized", "disagreement_rate"] == pytest.approx(disagree.mean())
+    assert disagreement.loc["regularized", "mean_diff"] == pytest.approx(diff.mean())
+    assert disagreement.loc["regularized", "max_abs_diff"] == pytest.approx(np.abs(diff).max())
@@ -0,0 +1,79 @@
+import contextlib
+import functools
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ..prediction_model.config import config
+from ..prediction_model.predict import explain_predictions, generate_prediction
+from ..prediction_model.sql_scoring import ConnectionPool, read_batches, score_table
+
+"""
+What will be tested?
+1. Every application of a table is scored once and its prediction written back, whatever the batch size.
+2. Batches are read in key order with the input dtypes, and missing values come back as NaN.
+3. Rescoring fails on existing predictions unless upserting, and failed writes are rolled back.
+"""
+
+@pytest.fixture
+def connect(tmp_path, test_dataset):
+    """A SQLite database with the test applications, in shuffled order"""
+    connect = functools.partial(sqlite3.connect, os.path.join(tmp_path, "loans.db"))
+    with sqlite3.connect(os.path.join(tmp_path, "loans.db")) as conn:
+        test_dataset.sample(frac=1, random_state=0).to_sql(config.APPLICATIONS_TABLE, conn, index=False)
+    return connect
+
+def read_predictions(connect) -> pd.DataFrame:
+    with contextlib.closing(connect()) as conn:
+        return pd.read_sql(f"SELECT * FROM {config.PREDICTIONS_TABLE} ORDER BY {config.ID_FEATURE}", conn)
+
+@pytest.mark.parametrize("batch_size", [50, 10_000])
+def test_predictions_are_written_back(connect, test_dataset, batch_size) -> None:
+    """Test the written predictions and the stage report"""
+    report = score_table(connect=connect, batch_size=batch_size, verbose=False)
+    assert report["n_rows"] == len(test_dataset)
+    assert all(report[f"{stage}_rows_per_s"] > 0 for stage in ("read", "score", "write"))
+
+    predictions = read_predictions(connect=connect)
+    expected = test_dataset.sort_values(config.ID_FEATURE)
+    assert list(predictions.columns) == [config.ID_FEATURE, config.TARGET_FEATURE]
+    assert list(predictions[config.ID_FEATURE]) == list(expected[config.ID_FEATURE])
+    assert np.array_equal(predictions[config.TARGET_FEATURE], generate_prediction(data_input=expected)["prediction"])
+
+def test_read_batches(connect, test_dataset) -> None:
+    """Test batch order, sizes and dtypes"""
+    with ConnectionPool(connect=connect) as pool:
+        batches = list(read_batches(pool=pool, batch_size=100))
+    assert [len(batch) for batch in batches] == [100] * (len(test_dataset) // 100) + [len(test_dataset) % 100]
+    data = pd.concat(batches, ignore_index=True)
+    assert data[config.ID_FEATURE].is_monotonic_increasing and data[config.ID_FEATURE].is_unique
+    assert all(str(data[col].dtype) == config.FEATURE_DTYPES[col] for col in config.FEATURES)
+    expected = test_dataset.sort_values(config.ID_FEATURE, ignore_index=True)
+    pd.testing.assert_frame_equal(data[config.FEATURES], expected[config.FEATURES].astype(data[config.FEATURES].dtypes))
+
+def test_upsert_and_rollback(connect, test_dataset) -> None:
+    """Test that rescoring needs an upsert, and that a failed batch writes nothing"""
+    score_table(connect=connect, batch_size=100, verbose=False)
+    with pytest.raises(sqlite3.IntegrityError):
+        score_table(connect=connect, batch_size=100, verbose=False)
+    assert len(read_predictions(connect=connect)) == len(test_dataset)
+
+    with sqlite3.connect(connect.args[0]) as conn:
+        conn.execute(f"DELETE FROM {config.PREDICTIONS_TABLE} WHERE rowid % 2 = 0")
+        conn.execute(f"UPDATE {config.PREDICTIONS_TABLE} SET {config.TARGET_FEATURE} = 'stale'")
+    report = score_table(connect=connect, batch_size=100, upsert=True, verbose=False)
+    predictions = read_predictions(connect=connect)
+    assert report["n_rows"] == len(predictions) == len(test_dataset)
+    assert set(predictions[config.TARGET_FEATURE]) <= {"Y", "N"}
+
+def test_reason_codes(connect, test_dataset) -> None:
+    """Test that probabilities and reason codes are written, with NULL for missing reasons"""
+    score_table(connect=connect, n_reasons=2, compiled=True, verbose=False, output_table="explained")
+    with contextlib.closing(connect()) as conn:
+        written = pd.read_sql(f"SELECT * FROM explained ORDER BY {config.ID_FEATURE}", conn)
+    expected = explain_predictions(data_input=test_dataset.sort_values(config.ID_FEATURE), n_reasons=2)
+    assert np.allclose(written["Probability"], expected["probability"])
+    assert written["Reason_1"].tolist() == expected["reasons"][:, 0].tolist()
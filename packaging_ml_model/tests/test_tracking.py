@@ -0,0 +1,77 @@
+import os
+
+import pytest
+from sklearn.base import clone
+
+from ..prediction_model import tracking
+from ..prediction_model.config import config
+from ..prediction_model.processing.data_handling import get_file_fingerprint, load_dataset
+from ..prediction_model.tracking import ExperimentTracker, _read_yaml, log_training_run, measure_fit
+from ..prediction_model.training_pipeline import fit_pipeline, pipeline
+
+"""
+What will be tested?
+1. Runs are written in the layout of the MLflow file store, next to existing experiments.
+2. Failed runs are marked as such.
+3. A training run records its hyperparameters, dataset fingerprint and performance metrics, unless the scoring is turned off.
+"""
+
+@pytest.fixture
+def tracker(tmp_path) -> ExperimentTracker:
+    # A store created by MLflow, with its "Default" experiment
+    os.makedirs(os.path.join(tmp_path, "0"))
+    with open(os.path.join(tmp_path, "0", "meta.yaml"), "w") as f:
+        f.write("artifact_location: mlflow-artifacts:/0\nexperiment_id: '0'\nlifecycle_stage: active\nname: Default\n")
+    return ExperimentTracker(root=str(tmp_path))
+
+def test_run_layout(tracker) -> None:
+    """Test the experiment and run files"""
+    with tracker.start_run(run_name="first") as run:
+        run.log_params(params={"alpha": 0.01})
+        run.log_metrics(metrics={"loss": 0.5})
+        run.log_metrics(metrics={"loss": 0.25}, step=1)
+    assert tracker.experiment_id == "1"
+    assert _read_yaml(path=os.path.join(tracker.root, "1", "meta.yaml"))["name"] == config.EXPERIMENT_NAME
+    assert ExperimentTracker(root=tracker.root).experiment_id == "1"
+
+    meta = _read_yaml(path=os.path.join(run.path, "meta.yaml"))
+    assert meta["status"] == "3" and meta["run_id"] == run.run_id and int(meta["end_time"]) >= int(meta["start_time"])
+    with open(os.path.join(run.path, "metrics", "loss")) as f:
+        assert [line.split()[1:] for line in f.read().splitlines()] == [["0.5", "0"], ["0.25", "1"]]
+    (recorded,) = tracker.runs()
+    assert recorded["params"] == {"alpha": "0.01"} and recorded["metrics"] == {"loss": 0.25}
+    assert recorded["tags"]["mlflow.runName"] == "first"
+
+def test_failed_run(tracker) -> None:
+    """Test that an exception marks the run as failed"""
+    with pytest.raises(RuntimeError):
+        with tracker.start_run() as run:
+            raise RuntimeError("fit diverged")
+    assert _read_yaml(path=os.path.join(run.path, "meta.yaml"))["status"] == "4"
+
+def test_training_run_is_recorded(tracker) -> None:
+    """Test the parameters, metrics and artifacts of a training run"""
+    train_data = load_dataset(filename=config.TRAIN_FILE)
+    fitted_pipeline, fit_metrics = measure_fit(fit=lambda: fit_pipeline(train_data=train_data, pipeline_to_fit=clone(pipeline.classification_pipeline)))
+    assert fit_metrics["fit_seconds"] > 0 and fit_metrics["fit_peak_memory_mb"] > 0
+
+    run_id = log_training_run(fitted_pipeline=fitted_pipeline, mode="batch", dataset_path=config.TRAIN_FILE,
+                              fit_metrics=fit_metrics, tracker=tracker)
+    (run,) = tracker.runs()
+    assert run["run_id"] == run_id
+    assert run["params"]["dataset_fingerprint"] == get_file_fingerprint(filepath=os.path.join(config.DATA_PATH, config.TRAIN_FILE))
+    assert run["params"]["LogisticRegression__C"] == "1.0" and run["params"]["mode"] == "batch"
+    expected = {"fit_seconds", "fit_peak_memory_mb", "inference_rows_per_s.pipeline", "inference_rows_per_s.compiled",
+                "predict_seconds.LogisticRegression", f"model_size_bytes.{config.MODEL_NAME}", f"model_size_bytes.{config.ARTIFACT_NAME}"}
+    expected |= {f"transform_seconds.{name}" for name, _ in fitted_pipeline.steps[:-1]}
+    assert set(run["metrics"]) == expected
+    assert sorted(os.listdir(os.path.join(tracker.root, "1", run_id, "artifacts"))) == sorted([config.ARTIFACT_NAME, config.MODEL_NAME])
+
+def test_scoring_can_be_skipped(tracker, monkeypatch) -> None:
+    """Test that a 'config.TRACKING_REPEAT' of 0 records the fit without scoring the test set"""
+    monkeypatch.setattr(tracking.config, "TRACKING_REPEAT", 0)
+    fitted_pipeline = fit_pipeline(train_data=load_dataset(filename=config.TRAIN_FILE), pipeline_to_fit=clone(pipeline.classification_pipeline))
+    log_training_run(fitted_pipeline=fitted_pipeline, mode="batch", dataset_path=config.TRAIN_FILE,
+                     fit_metrics={"fit_seconds": 1.0}, tracker=tracker)
+    (run,) = tracker.runs()
+    assert set(run["metrics"]) == {"fit_seconds", f"model_size_bytes.{config.MODEL_NAME}", f"model_size_bytes.{config.ARTIFACT_NAME}"}
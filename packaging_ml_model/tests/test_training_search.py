@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.base import clone
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.model_selection import GridSearchCV
+
+from ..prediction_model.compiled_pipeline import CompiledPipeline
+from ..prediction_model.config import config
+from ..prediction_model.processing.data_handling import load_dataset
+from ..prediction_model.training_pipeline import pipeline, search_pipeline, split_features_target
+
+"""
+What will be tested?
+1. Scores and the selected model are those of 'GridSearchCV' over the full pipeline.
+2. The report has one row per candidate, best first, and alternative estimators can be compiled.
+3. Grids over the preprocessing steps are rejected.
+"""
+
+@pytest.fixture
+def train_data() -> pd.DataFrame:
+    return load_dataset(filename=config.TRAIN_FILE)
+
+def test_search_matches_grid_search(train_data) -> None:
+    """Test that sharing the preprocessing across candidates gives the scores of 'GridSearchCV'"""
+    param_grid = {"LogisticRegression__C": [0.01, 1.0, 100.0], "LogisticRegression__solver": ["lbfgs", "liblinear"]}
+    best_pipeline, report = search_pipeline(train_data=train_data, param_grid=param_grid, cv=3, n_jobs=1)
+
+    train_X, train_y = split_features_target(data=train_data)
+    grid_search = GridSearchCV(estimator=clone(pipeline.classification_pipeline), param_grid=param_grid,
+                               scoring=config.SEARCH_SCORING, cv=3).fit(X=train_X, y=train_y)
+    assert len(report) == 6 and report["rank"].is_monotonic_increasing
+    assert np.allclose(np.sort(report["mean_test_score"]), np.sort(grid_search.cv_results_["mean_test_score"]))
+    assert report["params"][0] == {key.split("__")[1]: value for key, value in grid_search.best_params_.items()}
+    assert np.array_equal(best_pipeline.predict_proba(X=train_X), grid_search.best_estimator_.predict_proba(X=train_X))
+    assert (report["mean_fit_time"] > 0).all()
+
+def test_alternative_estimator_can_be_compiled(train_data) -> None:
+    """Test that a logistic SGD classifier selected by the search compiles to the same probabilities"""
+    param_grid = {"LogisticRegression": [SGDClassifier(loss="log_loss", random_state=0)],
+                  "LogisticRegression__alpha": [1e-3, 1e-2]}
+    best_pipeline, report = search_pipeline(train_data=train_data, param_grid=param_grid, cv=3, n_jobs=1)
+    assert set(report["estimator"]) == {"SGDClassifier"}
+    assert isinstance(best_pipeline.steps[-1][1], SGDClassifier)
+
+    train_X = train_data[config.FEATURES]
+    compiled = CompiledPipeline.from_pipeline(pipeline=best_pipeline)
+    assert np.allclose(compiled.predict_proba(data=train_X), best_pipeline.predict_proba(X=train_X), rtol=0, atol=1e-12)
+
+def test_preprocessing_grid_is_rejected(train_data) -> None:
+    """Test that only the final estimator can be searched"""
+    with pytest.raises(ValueError, match="Only the final step"):
+        search_pipeline(train_data=train_data, param_grid={"MinMaxScaling__clip": [True, False],
+                                                           "LogisticRegression": [LogisticRegression()]})
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ..prediction_model.config import config
+from ..prediction_model.predict import classification_pipeline
+from ..prediction_model.processing.validation import validate_batch
+from ..prediction_model.server import ScoringError, score_records
+
+"""
+What will be tested?
+1. Valid data passes unchanged, and the schema matches the categories known to the model.
+2. Numeric strings, numbers for numeric-looking categories and differently cased categories are coerced.
+3. Invalid values are flagged per row, and the other rows are still scored in bulk.
+"""
+
+def test_valid_data_passes(test_data) -> None:
+    """Test that the test set is valid and scores as before validation"""
+    validation = validate_batch(data_input=test_data)
+    assert not validation.errors.any() and validation.messages() == {}
+    assert list(validation.data.columns) == config.FEATURES
+    assert np.array_equal(classification_pipeline.predict_proba(validation.data),
+                          classification_pipeline.predict_proba(test_data[config.FEATURES]))
+
+def test_schema_matches_model() -> None:
+    """Test that the allowed categories are those learned by the label encoder"""
+    label_dict = classification_pipeline.named_steps["LabelEncoding"].label_dict_
+    assert {col: set(mapping) for col, mapping in label_dict.items()} == \
+           {col: set(categories) for col, categories in config.ALLOWED_CATEGORIES.items()}
+
+def test_values_are_coerced() -> None:
+    """Test the coercion of loosely typed values to the schema"""
+    records = [
+        {"ApplicantIncome": "5000", "LoanAmount": " 120.5 ", "Dependents": 1, "Credit_History": "1", "Gender": "male", "Property_Area": " Urban "},
+        {"ApplicantIncome": 5000, "LoanAmount": 120.5, "Dependents": "1", "Credit_History": 1.0, "Gender": "Male", "Property_Area": "Urban"},
+        {"Dependents": "3+", "Married": None},
+    ]
+    validation = validate_batch(data_input=records)
+    assert not validation.errors.any()
+    pd.testing.assert_series_equal(validation.data.iloc[0], validation.data.iloc[1], check_names=False)
+    assert validation.data["Dependents"].iloc[2] == "3+" and pd.isna(validation.data["Married"].iloc[2])
+    assert validation.data.dtypes.astype(str).to_dict() == {col: config.FEATURE_DTYPES[col] for col in config.FEATURES}
+
+def test_invalid_rows_are_flagged(test_data) -> None:
+    """Test the per-row error mask, the messages and the bulk scoring of the valid rows"""
+    records = test_data[config.FEATURES].head(6).to_dict("records")
+    records[1]["ApplicantIncome"] = "a lot"
+    records[2]["LoanAmount"] = -10
+    records[3].update(Dependents="4", Property_Area="Downtown")
+    records[4]["Loan_Amount_Term"] = float("inf")
+
+    validation = validate_batch(data_input=records)
+    assert validation.errors.tolist() == [False, True, True, True, True, False]
+    assert validation.messages()[3] == "Invalid values: Dependents='4', Property_Area='Downtown'"
+
+    results = score_records(records=records)
+    assert all(isinstance(results[row], ScoringError) for row in (1, 2, 3, 4))
+    expected = classification_pipeline.predict_proba(test_data[config.FEATURES].iloc[[0, 5]])[:, 1]
+    assert [results[0]["probability"], results[5]["probability"]] == pytest.approx(expected.tolist())